@@ -0,0 +1,120 @@
+# Standard Library Imports
+import time
+import traceback
+# 3rd Party Imports
+import gevent
+from gevent.queue import Queue, Full
+# Local Imports
+
+
+class AlarmDispatcher(object):
+    """ Sends the notifications of one alarm in the background.
+
+    Notifications are put in a bounded queue and sent by a small pool of
+    worker greenlets, so the Manager can keep filtering while an alarm is
+    slow or retrying. When the queue is full, `dispatch` blocks until
+    there is room again, which slows the Manager down instead of letting
+    the backlog grow without limit. With a single worker, notifications
+    are sent in the order they were dispatched.
+    """
+
+    def __init__(self, name, alarm, log, workers=1, queue_size=100):
+        self._name = name
+        self._alarm = alarm
+        self._log = log
+        self._queue = Queue(maxsize=queue_size)
+        self._worker_ct = workers
+        self._workers = []
+        self._delayed = {}  # Timer -> (func_name, dts)
+        alarm.set_dispatcher(self)
+        # Metrics
+        self._sent, self._failed = 0, 0
+        self._max_depth = 0
+        self._send_time, self._wait_time = 0.0, 0.0
+        self._blocked, self._blocked_time = 0, 0.0
+
+    def start(self):
+        self._workers = [gevent.spawn(self._work)
+                         for _ in range(self._worker_ct)]
+
+    def dispatch(self, func_name, dts):
+        """ Queues a call to the alarm's `func_name` with the dts. """
+        item = (func_name, dts, time.time())
+        try:
+            self._queue.put_nowait(item)
+        except Full:
+            self._log.debug("Queue of alarm %s is full, waiting for room.",
+                            self._name)
+            start = time.time()
+            self._queue.put(item)
+            self._blocked += 1
+            self._blocked_time += time.time() - start
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    def dispatch_later(self, delay, func_name, dts):
+        """ Queues a call to the alarm's `func_name` after `delay` seconds.
+        Returns the timer, which can be killed to cancel the call. Calls
+        still waiting when the dispatcher stops are queued right away. """
+        timer = gevent.spawn_later(delay, self._dispatch_delayed)
+        self._delayed[timer] = (func_name, dts)
+        timer.link(lambda t: self._delayed.pop(t, None))  # Killed
+        return timer
+
+    def _dispatch_delayed(self):
+        func_name, dts = self._delayed.pop(gevent.getcurrent())
+        self.dispatch(func_name, dts)
+
+    def stop(self, timeout=10):
+        """ Sends the queued notifications, then stops the workers and
+        flushes the alarm. Gives up after about `timeout` seconds. """
+        deadline = time.time() + timeout
+        self._log.debug("Sending %s queued notification(s) of alarm %s.",
+                        self._queue.qsize(), self._name)
+        for timer, (func_name, dts) in self._delayed.items():
+            if not timer.ready():
+                timer.kill()
+                self.dispatch(func_name, dts)
+        self._delayed.clear()
+        for _ in self._workers:
+            self._queue.put(None)
+        gevent.joinall(self._workers, timeout=timeout)
+        unfinished = [w for w in self._workers if not w.ready()]
+        if unfinished:
+            self._log.warning("Alarm %s could not send its notifications in "
+                              "time, %s left in queue.", self._name,
+                              self._queue.qsize())
+            gevent.killall(unfinished, timeout=1)
+        self._alarm.flush(max(0, deadline - time.time()))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:  # Stop was requested
+                return
+            func_name, dts, queued = item
+            start = time.time()
+            try:
+                getattr(self._alarm, func_name)(dts)
+                self._sent += 1
+            except Exception as e:
+                self._failed += 1
+                self._log.error("Alarm %s failed to send a notification: "
+                                "%s: %s", self._name, type(e).__name__, e)
+                self._log.debug("Stack trace: \n {}"
+                                "".format(traceback.format_exc()))
+            self._wait_time += start - queued
+            self._send_time += time.time() - start
+
+    def get_stats(self):
+        """ Returns a dict with the metrics of this dispatcher. """
+        done = self._sent + self._failed
+        return {
+            'sent': self._sent,
+            'failed': self._failed,
+            'queued': self._queue.qsize(),
+            'max_queued': self._max_depth,
+            'avg_wait': self._wait_time / done if done else 0.0,
+            'avg_send': self._send_time / done if done else 0.0,
+            'blocked': self._blocked,
+            'blocked_time': self._blocked_time
+        }
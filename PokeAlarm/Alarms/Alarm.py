@@ -2,7 +2,9 @@
 import time
 import traceback
 # 3rd Party Imports
+import gevent
 # Local Imports
+from Template import Template
 
 # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!! ATTENTION! !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 #             ONLY EDIT THIS FILE IF YOU KNOW WHAT YOU ARE DOING!
@@ -20,6 +22,8 @@ class Alarm(object):
         "gyms": {}
     }
 
+    _dispatcher = None  # The AlarmDispatcher sending the notifications
+
     # Gather settings and create alarm
     def __init__(self):
         raise NotImplementedError("This is an abstract method.")
@@ -64,16 +68,48 @@ class Alarm(object):
     def weather_alert(self, pokeweather_info):
         raise NotImplementedError('Weather Alert is not implemented.')
 
+    # Called by the AlarmDispatcher that sends the notifications
+    def set_dispatcher(self, dispatcher):
+        self._dispatcher = dispatcher
+
+    # Calls `func_name` with `arg` after `delay` seconds, through the queue
+    # of the dispatcher if there is one. Kill the returned greenlet to
+    # cancel the call.
+    def call_later(self, delay, func_name, arg):
+        if self._dispatcher is not None:
+            return self._dispatcher.dispatch_later(delay, func_name, arg)
+        return gevent.spawn_later(delay, getattr(self, func_name), arg)
+
+    # Sends any notifications the alarm is still holding back, giving up
+    # after `timeout` seconds
+    def flush(self, timeout=10):
+        pass
+
+    # Returns a dict of metrics about the connection to the service
+    def get_stats(self):
+        return {}
+
+    # Compiles the templates in the settings of this alarm, and returns the
+    # set of DTS keys they use
+    def get_dts_keys(self):
+        keys = set(['lat', 'lng'])  # Read directly by some alarms
+        values = list(vars(self).values())
+        while values:
+            value = values.pop()
+            if isinstance(value, basestring):
+                keys.update(Template.compile(value).get_keys())
+            elif isinstance(value, dict):
+                values.extend(value.itervalues())
+            elif isinstance(value, (list, tuple, set)):
+                values.extend(value)
+        return keys
+
     # Return a version of the string with the correct substitutions made
     @staticmethod
     def replace(string, pkinfo):
         if string is None:
             return None
-
-        s = string.encode('utf-8')
-        for key in pkinfo:
-            s = s.replace("<{}>".format(key), str(pkinfo[key]))
-        return s
+        return Template.get(string).render(pkinfo)
 
     @staticmethod
     def pop_type(data, param_name, kind, default=None):
@@ -2,9 +2,12 @@
 import requests
 
 # 3rd Party Imports
+import gevent
 
 # Local Imports
 from PokeAlarm.Alarms import Alarm
+from PokeAlarm.Alarms.Discord.RateLimits import WebhookRateLimiter
+from PokeAlarm.Utilities.NetUtils import create_session
 from PokeAlarm.Utils import parse_boolean, get_static_map_url, \
     reject_leftover_parameters, require_and_remove_key, get_image_url
 
@@ -20,6 +23,9 @@ replace = Alarm.replace
 
 class DiscordAlarm(Alarm):
 
+    # Maximum number of embeds Discord accepts in one message
+    _max_embeds = 10
+
     _defaults = {
         'monsters': {
             'username': "<mon_name>",
@@ -99,6 +105,15 @@ class DiscordAlarm(Alarm):
         self.__avatar_url = settings.pop('avatar_url', "")
         self.__map = settings.pop('map', {})
         self.__static_map_key = static_map_key
+        self.__pool_size = self.pop_type(settings, 'pool_size', int, 3)
+        self.__retry_count = self.pop_type(settings, 'retry_count', int, 3)
+        self.__session = None  # Created on connect
+        self.__rate_limiter = WebhookRateLimiter()
+        # Seconds to wait for more alerts to the same webhook (0 = off)
+        self.__coalesce_window = self.pop_type(
+            settings, 'coalesce_window', float, 0)
+        self.__pending = {}  # Messages waiting for more embeds
+        self.__coalesced, self.__requests = 0, 0
 
         # Set Alert Parameters
         self.__monsters = self.create_alert_settings(
@@ -121,7 +136,11 @@ class DiscordAlarm(Alarm):
 
     # (Re)connect with Discord
     def connect(self):
-        pass
+        # The session is shared by all senders, so it is kept for the life
+        # of the alarm. Its pool replaces broken connections by itself.
+        if self.__session is None:
+            self.__session = create_session(
+                retry_count=self.__retry_count, pool_size=self.__pool_size)
 
     # Send a message letting the channel know that this alarm has started
     def startup_message(self):
@@ -181,13 +200,56 @@ class DiscordAlarm(Alarm):
                 payload['embeds'][0]['image'] = {
                     'url': replace(alert['map'], coords)
                 }
+        url = replace(alert['webhook_url'], info)
+        if self.__coalesce_window > 0 and 'embeds' in payload:
+            self.coalesce(url, payload)
+        else:
+            self.post(url, payload)
+
+    # Send a payload, retrying if needed
+    def post(self, url, payload):
+        self.__requests += 1
         args = {
-            'url': replace(alert['webhook_url'], info),
+            'url': url,
             'payload': payload
         }
         try_sending(self._log, self.connect,
                     "Discord", self.send_webhook, args, self.__max_attempts)
 
+    # Add the embeds of a payload to the next message to the same webhook
+    def coalesce(self, url, payload):
+        self.__coalesced += 1
+        # Alerts can only share a message if they look the same outside it
+        key = (url, payload['username'], payload['avatar_url'],
+               payload['content'])
+        pending = self.__pending.get(key)
+        if pending is None:
+            pending = self.__pending[key] = {
+                'payload': payload,
+                'timer': self.call_later(
+                    self.__coalesce_window, 'send_pending', key)
+            }
+        else:
+            pending['payload']['embeds'].extend(payload['embeds'])
+        if len(pending['payload']['embeds']) >= self._max_embeds:
+            pending['timer'].kill(block=False)
+            self.send_pending(key)
+
+    # Send the message waiting for more embeds, if it is still there
+    def send_pending(self, key):
+        pending = self.__pending.pop(key, None)
+        if pending is not None:
+            self.post(key[0], pending['payload'])
+
+    # Send all messages waiting for more embeds
+    def flush(self, timeout=10):
+        senders = []
+        for key in list(self.__pending):
+            self.__pending[key]['timer'].kill(block=False)
+            senders.append(gevent.spawn(self.send_pending, key))
+        gevent.joinall(senders, timeout=timeout)
+        gevent.killall([s for s in senders if not s.ready()], timeout=1)
+
     # Trigger an alert based on Pokemon info
     def pokemon_alert(self, pokemon_info):
         self._log.debug("Pokemon notification triggered.")
@@ -214,10 +276,24 @@ class DiscordAlarm(Alarm):
     def weather_alert(self, weather_info):
         self.send_alert(self.__weather, weather_info)
 
+    # Returns the rate limit metrics of each webhook
+    def get_stats(self):
+        stats = self.__rate_limiter.get_stats()
+        if self.__coalesce_window > 0:
+            stats['coalescing'] = {
+                'alerts': self.__coalesced, 'requests': self.__requests}
+        return stats
+
     # Send a payload to the webhook url
     def send_webhook(self, url, payload):
         self._log.debug(payload)
-        resp = requests.post(url, json=payload, timeout=5)
+        for _ in range(5):  # Rate limited sends are not failed attempts
+            self.__rate_limiter.acquire(url)
+            resp = self.__session.post(url, json=payload, timeout=5)
+            if not self.__rate_limiter.update(url, resp):
+                break
+            self._log.debug("Discord rate limited the webhook, sending "
+                            "again once it resets.")
         if resp.ok is True:
             self._log.debug("Notification successful (returned {})".format(
                 resp.status_code))
@@ -0,0 +1,109 @@
+# Standard Library Imports
+import time
+# 3rd Party Imports
+import gevent
+from gevent.lock import Semaphore
+# Local Imports
+
+
+class Bucket(object):
+    """ Rate limit state and metrics of a single webhook. """
+
+    def __init__(self):
+        self.lock = Semaphore()  # Sends wait their turn in order
+        self.limit = None  # Unknown until Discord tells us
+        self.remaining = None
+        self.reset_at = 0.0
+        self.window = 0.0  # Longest time to reset seen so far
+        self.first_send = None
+        self.sent, self.limited, self.wait_time = 0, 0, 0.0
+
+
+class WebhookRateLimiter(object):
+    """ Spaces out the requests to Discord webhooks to avoid 429s.
+
+    Every webhook URL has its own bucket, fed by the `X-RateLimit-*`
+    headers of its responses. Once a bucket has no requests remaining,
+    the next send waits until the bucket resets instead of being rejected.
+    A 429, per webhook or global, holds back sends for `Retry-After`.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._global_reset_at = 0.0
+
+    def _get_bucket(self, url):
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            bucket = self._buckets[url] = Bucket()
+        return bucket
+
+    def acquire(self, url):
+        """ Waits until a request to the url is allowed. """
+        bucket = self._get_bucket(url)
+        with bucket.lock:
+            while True:
+                now = time.time()
+                reset_at = self._global_reset_at
+                if bucket.remaining is not None and bucket.remaining <= 0:
+                    reset_at = max(reset_at, bucket.reset_at)
+                if reset_at <= now:
+                    break
+                bucket.wait_time += reset_at - now
+                gevent.sleep(reset_at - now)
+            if bucket.reset_at <= now:  # Bucket was reset
+                bucket.remaining = bucket.limit
+                bucket.reset_at = now + bucket.window
+            if bucket.remaining is not None:
+                bucket.remaining -= 1
+            if bucket.first_send is None:
+                bucket.first_send = now
+
+    def update(self, url, resp):
+        """ Updates the bucket of the url from a response. Returns True if
+        the request was rate limited and should be sent again. """
+        bucket = self._get_bucket(url)
+        headers = resp.headers
+        now = time.time()
+        if resp.status_code == 429:
+            retry_after = _parse_float(headers.get('Retry-After'), 1.0)
+            bucket.limited += 1
+            if headers.get('X-RateLimit-Global'):
+                self._global_reset_at = now + retry_after
+            else:
+                bucket.remaining = 0
+                bucket.reset_at = now + retry_after
+            return True
+        bucket.sent += 1
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None and reset_after is not None:
+            reset_after = _parse_float(reset_after, 0.0)
+            bucket.remaining = int(_parse_float(remaining, 1))
+            bucket.reset_at = now + reset_after
+            bucket.window = max(bucket.window, reset_after)
+            limit = headers.get('X-RateLimit-Limit')
+            bucket.limit = int(_parse_float(limit, 1)) if limit else None
+        return False
+
+    def get_stats(self):
+        """ Returns a dict of webhooks (without their token) with the
+        number of sends, sends per second, seconds waited and 429s. """
+        stats = {}
+        now = time.time()
+        for url, bucket in self._buckets.iteritems():
+            elapsed = now - bucket.first_send if bucket.first_send else 0
+            stats[url.rsplit('/', 1)[0]] = {
+                'sent': bucket.sent,
+                'rate': bucket.sent / elapsed if elapsed > 0 else 0.0,
+                'wait_time': bucket.wait_time,
+                'limited': bucket.limited
+            }
+        return stats
+
+
+def _parse_float(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,121 @@
+# Standard Library Imports
+import time
+import traceback
+# 3rd Party Imports
+import gevent
+from gevent.lock import Semaphore
+from gevent.queue import Queue, Full
+# Local Imports
+
+
+class TokenBucket(object):
+    """ Allows `rate` acquisitions per second, with bursts of up to
+    `capacity`. Callers wait their turn in the order they arrived. """
+
+    def __init__(self, rate, capacity=1):
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._tokens = self._capacity
+        self._last = time.time()
+        self._lock = Semaphore()
+
+    def _refill(self):
+        now = time.time()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def acquire(self):
+        """ Waits for a token and returns the number of seconds waited. """
+        waited = 0.0
+        with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                delay = (1 - self._tokens) / self._rate
+                gevent.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= 1
+        return waited
+
+
+class ChatScheduler(object):
+    """ Sends Telegram messages within the limits of the Bot API.
+
+    Each chat has its own queue and worker, so an alert's messages are
+    sent in order, and one chat waiting on its limit does not hold up the
+    others. Every message takes a token from its chat's bucket (about one
+    message per second) and from its bot's bucket (about 30 per second).
+    """
+
+    def __init__(self, log, bot_rate=30, chat_rate=1, queue_size=100):
+        self._log = log
+        self._bot_rate, self._chat_rate = bot_rate, chat_rate
+        self._queue_size = queue_size
+        self._bots = {}  # bot token -> TokenBucket
+        self._chats = {}  # (bot token, chat id) -> chat state
+
+    def submit(self, bot_token, chat_id, sends):
+        """ Queues a list of functions, each sending one message, to be
+        called in order. Waits if the chat's queue is full. """
+        key = (bot_token, chat_id)
+        chat = self._chats.get(key)
+        if chat is None:
+            chat = self._chats[key] = {
+                'queue': Queue(maxsize=self._queue_size),
+                'bucket': TokenBucket(self._chat_rate),
+                'sent': 0, 'failed': 0, 'wait_time': 0.0
+            }
+            if bot_token not in self._bots:
+                self._bots[bot_token] = TokenBucket(
+                    self._bot_rate, self._bot_rate)
+        if chat.get('worker') is None or chat['worker'].ready():
+            chat['worker'] = gevent.spawn(self._work, bot_token, chat)
+        chat['queue'].put(sends)
+
+    def _work(self, bot_token, chat):
+        bot = self._bots[bot_token]
+        while True:
+            sends = chat['queue'].get()
+            if sends is None:  # Stop was requested
+                return
+            for send in sends:
+                chat['wait_time'] += chat['bucket'].acquire() + bot.acquire()
+                try:
+                    send()
+                    chat['sent'] += 1
+                except Exception as e:
+                    chat['failed'] += 1
+                    self._log.error("Unable to send Telegram message: "
+                                    "%s: %s", type(e).__name__, e)
+                    self._log.debug("Stack trace: \n {}"
+                                    "".format(traceback.format_exc()))
+
+    def flush(self, timeout=10):
+        """ Sends the queued messages and stops the workers. Messages
+        still queued after `timeout` seconds are dropped. """
+        workers = []
+        for chat in self._chats.itervalues():
+            if chat['worker'].ready():
+                continue
+            try:
+                chat['queue'].put_nowait(None)
+            except Full:  # Sends until the timeout, then is stopped
+                pass
+            workers.append(chat['worker'])
+        gevent.joinall(workers, timeout=timeout)
+        gevent.killall([w for w in workers if not w.ready()], timeout=1)
+        dropped = sum(chat['queue'].qsize() for chat in self._chats.values())
+        if dropped:
+            self._log.warning("%s Telegram alert(s) were not sent in time.",
+                              dropped)
+
+    def get_stats(self):
+        """ Returns a dict of chat ids with the number of messages sent,
+        failed and queued, and the seconds spent waiting on limits. """
+        return dict(
+            ("chat {}".format(chat_id), {
+                'sent': chat['sent'], 'failed': chat['failed'],
+                'queued': chat['queue'].qsize(),
+                'wait_time': chat['wait_time']})
+            for (_, chat_id), chat in self._chats.iteritems())
@@ -1,12 +1,15 @@
 # Standard Library Imports
 import requests
 from collections import namedtuple
+from functools import partial
 
 # 3rd Party Imports
 
 # Local Imports
 from PokeAlarm.Alarms import Alarm
+from PokeAlarm.Alarms.Telegram.Scheduler import ChatScheduler
 from PokeAlarm.Utilities import GenUtils as utils
+from PokeAlarm.Utilities.NetUtils import create_session
 from PokeAlarm.Utils import require_and_remove_key, get_image_url
 
 # 2 lazy 2 type
@@ -78,6 +81,14 @@ class TelegramAlarm(Alarm):
 
         self._startup_message = self.pop_type(
             settings, 'startup_message', utils.parse_bool, True)
+        self._pool_size = self.pop_type(settings, 'pool_size', int, 3)
+        self._retry_count = self.pop_type(settings, 'retry_count', int, 3)
+        self._session = None  # Created on connect
+        # Messages are queued per chat and sent within the API limits
+        self._scheduler = ChatScheduler(
+            self._log,
+            bot_rate=self.pop_type(settings, 'bot_rate', float, 30),
+            chat_rate=self.pop_type(settings, 'chat_rate', float, 1))
 
         # Optional Alert Parameters
         alert_defaults = {
@@ -126,7 +137,11 @@ class TelegramAlarm(Alarm):
 
     # (Re)establishes Telegram connection
     def connect(self):
-        pass
+        # The session is shared by the chat workers, so it is kept for the
+        # life of the alarm. Its pool replaces broken connections by itself.
+        if self._session is None:
+            self._session = create_session(
+                retry_count=self._retry_count, pool_size=self._pool_size)
 
     # Set the appropriate settings for each alert
     def create_alert_settings(self, kind, settings, alert_defaults):
@@ -192,23 +207,34 @@ class TelegramAlarm(Alarm):
         max_attempts = alert.max_attempts
         sticker_url = replace(alert.sticker_url, dts)
         self._log.debug(sticker_url)
+        sends = []  # Sent in order by the scheduler
         # Send Sticker
         if alert.sticker and sticker_url is not None:
-            self.send_sticker(bot_token, chat_id, sticker_url, max_attempts)
+            sends.append(partial(self.send_sticker, bot_token, chat_id,
+                                 sticker_url, max_attempts))
 
         # Send Venue
         if alert.venue:
-            self.send_venue(
-                bot_token, chat_id, lat, lng, message, max_attempts)
-            return  # Don't send message or map
-
-        # Send Message
-        self.send_message(bot_token, chat_id, replace(message, dts),
-                          web_preview=alert.web_preview)
-
-        # Send Map
-        if alert.map:
-            self.send_location(bot_token, chat_id, lat, lng, max_attempts)
+            sends.append(partial(self.send_venue, bot_token, chat_id,
+                                 lat, lng, message, max_attempts))
+        else:  # Send message and map instead
+            sends.append(partial(
+                self.send_message, bot_token, chat_id, replace(message, dts),
+                web_preview=alert.web_preview))
+            if alert.map:
+                sends.append(partial(self.send_location, bot_token, chat_id,
+                                     lat, lng, max_attempts))
+
+        self._scheduler.submit(bot_token, chat_id, sends)
+
+    # Sends the queued messages of every chat
+    def flush(self, timeout=10):
+        self._scheduler.flush(timeout)
+
+    # Returns the number of messages sent and queued per chat. Alerts are
+    # handed to the scheduler, so the dispatcher only counts those hand-offs
+    def get_stats(self):
+        return self._scheduler.get_stats()
 
     # Trigger an alert based on Pokemon info
     def pokemon_alert(self, mon_dts):
@@ -301,7 +327,7 @@ class TelegramAlarm(Alarm):
     def send_webhook(self, url, payload):
         self._log.debug(url)
         self._log.debug(payload)
-        resp = requests.post(url, json=payload, timeout=30)
+        resp = self._session.post(url, json=payload, timeout=30)
         if resp.ok is True:
             self._log.debug("Notification successful (returned {})".format(
                 resp.status_code))
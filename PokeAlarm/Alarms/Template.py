@@ -0,0 +1,84 @@
+# Standard Library Imports
+import re
+# 3rd Party Imports
+# Local Imports
+
+
+class Template(object):
+    """ A text with `<key>` placeholders, parsed once and then rendered
+    with any number of DTS dicts.
+
+    Rendering only looks up the keys the text uses, instead of trying
+    every key of the DTS. Placeholders for keys missing from the DTS are
+    left as they are.
+    """
+
+    _pattern = re.compile(r'<([^<>]+)>')
+
+    # Compiled templates of the texts in alarm settings, by text
+    _templates = {}
+
+    def __init__(self, text):
+        # Alternates literal text and key names: [text, key, text, ...]
+        parts = self._pattern.split(text.encode('utf-8'))
+        self._literals = parts[0::2]
+        self._keys = parts[1::2]
+        self._compiled = False
+
+    @classmethod
+    def compile(cls, text):
+        """ Parses a text and keeps the template for `get`. Only meant for
+        texts that are rendered again and again, like alarm settings. """
+        template = cls._templates.get(text)
+        if template is None:
+            template = cls._templates[text] = Template(text)
+            template._compiled = True
+        return template
+
+    @classmethod
+    def get(cls, text):
+        """ Returns the compiled template of a text, or parses the text
+        without keeping it if it was never compiled. """
+        template = cls._templates.get(text)
+        if template is None:
+            template = Template(text)
+        return template
+
+    def get_keys(self):
+        """ Returns the keys used by this template. """
+        return set(self._keys)
+
+    def render(self, dts):
+        """ Returns the text with the placeholders filled in from dts. """
+        renders = getattr(dts, 'renders', None)
+        if renders is None or not self._compiled:
+            return self._render(dts)
+        text = renders.get(self)
+        if text is None:
+            text = renders[self] = self._render(dts)
+        return text
+
+    def _render(self, dts):
+        literals = self._literals
+        out = [literals[0]]
+        for i, key in enumerate(self._keys):
+            value = dts.get(key, self)
+            out.append("<{}>".format(key) if value is self else str(value))
+            out.append(literals[i + 1])
+        return "".join(out)
+
+
+class DtsDict(dict):
+    """ A dict of DTS that remembers the compiled templates rendered with
+    it.
+
+    The Manager hands the same DtsDict to every alarm and rule notified
+    about an event, so a template used by several of them is only
+    rendered once. It must not be changed once it has been handed out.
+    """
+
+    __slots__ = ('renders',)
+
+    def __init__(self, *args, **kwargs):
+        super(DtsDict, self).__init__(*args, **kwargs)
+        self.renders = {}  # Template -> rendered text
@@ -1,5 +1,6 @@
 from PokeAlarm.Utils import require_and_remove_key
 from Alarm import Alarm  # noqa F401
+from Template import DtsDict, Template  # noqa F401
 
 
 def alarm_factory(mgr, settings, max_attempts, api_key):
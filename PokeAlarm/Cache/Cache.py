@@ -1,9 +1,10 @@
 # Standard Library Imports
-from datetime import datetime
+import time
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
 from PokeAlarm.Utils import get_image_url
+from PokeAlarm.Utilities.CacheUtils import ExpiryDict, LRUCache
 
 
 class Cache(object):
@@ -11,111 +12,171 @@ class Cache(object):
 
     This object caches and manages information in Memory. Information will
     be lost between run times if save has not been implemented correctly.
+
+    The details of gyms and weather cells are kept in LRU caches bounded
+    by `max_size` entries, dropping entries not updated for `ttl` seconds.
+    Each gym or cell is a single tuple of its fields.
     """
 
     default_image_url = get_image_url("regular/gyms/0.png"),
 
-    def __init__(self, mgr):
+    # Fields of the gym and cell entries
+    _gym_fields = ('gym_team', 'gym_name', 'gym_desc', 'gym_image')
+    _cell_fields = ('cell_weather_id', 'severity_id', 'day_or_night_id')
+
+    def __init__(self, mgr, max_size=100000, ttl=7 * 24 * 60 * 60):
         """ Initializes a new cache object for storing data between events. """
         self._log = mgr.get_child_logger("cache")
 
-        self._mon_hist = {}
-        self._stop_hist = {}
-        self._egg_hist = {}
-        self._raid_hist = {}
-        self._gym_team = {}
-        self._gym_name = {}
-        self._gym_desc = {}
-        self._gym_image = {}
-        self._cell_weather_id = {}
-        self._severity_id = {}
-        self._day_or_night_id = {}
+        self._mon_hist = ExpiryDict()
+        self._stop_hist = ExpiryDict()
+        self._egg_hist = ExpiryDict()
+        self._raid_hist = ExpiryDict()
+        self._gyms = LRUCache(max_size, ttl)
+        self._cells = LRUCache(max_size, ttl)
+
+    @staticmethod
+    def _update(cache, key, index, value, default, size):
+        """ Sets field `index` of the entry of key if value is known, and
+        returns the field or default if it isn't set. """
+        entry = cache.get(key)
+        if Unknown.is_not(value):
+            if entry is None:
+                entry = (None,) * size
+            cache.put(key, entry[:index] + (value,) + entry[index + 1:])
+            return value
+        if entry is None or entry[index] is None:
+            return default
+        return entry[index]
 
     def monster_expiration(self, mon_id, expiration=None):
-        """ Update and return the datetime that a monster expires."""
+        """ Update and return the time (in epoch seconds) that a monster
+        expires. """
         if expiration is not None:
-            self._mon_hist[mon_id] = expiration
+            self._mon_hist.set(mon_id, expiration)
         return self._mon_hist.get(mon_id)
 
     def stop_expiration(self, stop_id, expiration=None):
-        """ Update and return the datetime that a stop expires."""
+        """ Update and return the time (in epoch seconds) that a stop
+        expires. """
         if expiration is not None:
-            self._stop_hist[stop_id] = expiration
+            self._stop_hist.set(stop_id, expiration)
         return self._stop_hist.get(stop_id)
 
     def egg_expiration(self, egg_id, expiration=None):
-        """ Update and return the datetime that an egg expires."""
+        """ Update and return the time (in epoch seconds) that an egg
+        expires. """
         if expiration is not None:
-            self._egg_hist[egg_id] = expiration
+            self._egg_hist.set(egg_id, expiration)
         return self._egg_hist.get(egg_id)
 
     def raid_expiration(self, raid_id, expiration=None):
-        """ Update and return the datetime that a raid expires."""
+        """ Update and return the time (in epoch seconds) that a raid
+        expires. """
         if expiration is not None:
-            self._raid_hist[raid_id] = expiration
+            self._raid_hist.set(raid_id, expiration)
         return self._raid_hist.get(raid_id)
 
     def gym_team(self, gym_id, team_id=Unknown.TINY):
         """ Update and return the team_id of a gym. """
-        if Unknown.is_not(team_id):
-            self._gym_team[gym_id] = team_id
-        return self._gym_team.get(gym_id, Unknown.TINY)
+        return self._update(self._gyms, gym_id, 0, team_id, Unknown.TINY, 4)
 
     def gym_name(self, gym_id, gym_name=Unknown.REGULAR):
         """ Update and return the gym_name for a gym. """
-        if Unknown.is_not(gym_name):
-            self._gym_name[gym_id] = gym_name
-        return self._gym_name.get(gym_id, Unknown.REGULAR)
+        return self._update(
+            self._gyms, gym_id, 1, gym_name, Unknown.REGULAR, 4)
 
     def gym_desc(self, gym_id, gym_desc=Unknown.REGULAR):
         """ Update and return the gym_desc for a gym. """
-        if Unknown.is_not(gym_desc):
-            self._gym_desc[gym_id] = gym_desc
-        return self._gym_desc.get(gym_id, Unknown.REGULAR)
+        return self._update(
+            self._gyms, gym_id, 2, gym_desc, Unknown.REGULAR, 4)
 
     def gym_image(self, gym_id, gym_image=Unknown.REGULAR):
         """ Update and return the gym_image for a gym. """
-        if Unknown.is_not(gym_image):
-            self._gym_image[gym_id] = gym_image
-        return self._gym_image.get(gym_id, get_image_url('icons/gym_0.png'))
+        return self._update(self._gyms, gym_id, 3, gym_image,
+                            get_image_url('icons/gym_0.png'), 4)
 
     def cell_weather_id(self, s2_cell_id, cell_weather_id=Unknown.REGULAR):
         """ Update and return weather_id for a cell """
-        if Unknown.is_not(cell_weather_id):
-            self._cell_weather_id[s2_cell_id] = cell_weather_id
-        return self._cell_weather_id.get(s2_cell_id, Unknown.REGULAR)
+        return self._update(self._cells, s2_cell_id, 0, cell_weather_id,
+                            Unknown.REGULAR, 3)
 
     def severity_id(self, s2_cell_id, severity_id=Unknown.REGULAR):
         """ Update and return severity_id for a cell """
-        if Unknown.is_not(severity_id):
-            self._severity_id[s2_cell_id] = severity_id
-        return self._severity_id.get(s2_cell_id, Unknown.REGULAR)
+        return self._update(
+            self._cells, s2_cell_id, 1, severity_id, Unknown.REGULAR, 3)
 
     def day_or_night_id(self, s2_cell_id, day_or_night_id=Unknown.REGULAR):
         """ Update and return day_or_night_id for a cell """
-        if Unknown.is_not(day_or_night_id):
-            self._day_or_night_id[s2_cell_id] = day_or_night_id
-        return self._day_or_night_id.get(s2_cell_id, Unknown.REGULAR)
+        return self._update(self._cells, s2_cell_id, 2, day_or_night_id,
+                            Unknown.REGULAR, 3)
+
+    def get_stats(self):
+        """ Returns a dict with the hits, misses, entries, evictions and
+        estimated bytes used of the gym and cell caches. """
+        stats = {}
+        for name, cache in (('gyms', self._gyms), ('cells', self._cells)):
+            hits, misses, entries = cache.get_stats()
+            evicted, expired = cache.get_evictions()
+            stats[name] = {
+                'hits': hits, 'misses': misses, 'entries': entries,
+                'evicted': evicted, 'expired': expired,
+                'memory': cache.get_memory()
+            }
+        return stats
+
+    def _export_entries(self, cache, fields):
+        """ Returns a dict for each of the fields, with the keys of the
+        entries that have it set. This is the format of older caches. """
+        data = dict((field, {}) for field in fields)
+        for key, entry in cache.items():
+            for field, value in zip(fields, entry):
+                if value is not None:
+                    data[field][key] = value
+        return data
+
+    def _import_entries(self, cache, fields, data):
+        """ Adds the entries from dicts made by `_export_entries`. """
+        for index, field in enumerate(fields):
+            for key, value in data.get(field, {}).iteritems():
+                self._update(cache, key, index, value, None, len(fields))
 
     def clean_and_save(self):
         """ Cleans the cache and saves the contents if capable. """
         self._clean_hist()
+        self._gyms.clean()
+        self._cells.clean()
+        for name, stats in self.get_stats().iteritems():
+            self._log.debug(
+                "Cached %s: %s entries, about %s KB, %s hits, %s misses, "
+                "%s evicted, %s expired.", name, stats['entries'],
+                stats['memory'] // 1024, stats['hits'], stats['misses'],
+                stats['evicted'], stats['expired'])
         self._save()
 
     def _save(self):
         """ Export the data to a more permanent location. """
         pass  # Mem cache isn't backed up.
 
+    def clean_expired(self, limit=100):
+        """ Removes up to limit expired items, so that the cache can be
+        cleaned a little at a time between events. """
+        now = time.time()
+        removed = 0
+        for hist in (
+                self._mon_hist, self._stop_hist, self._egg_hist,
+                self._raid_hist):
+            removed += hist.remove_expired(now, limit - removed)
+            if removed >= limit:
+                break
+        return removed
+
     def _clean_hist(self):
         """ Clean expired objects to free up memory. """
+        now = time.time()
+        removed = 0
         for hist in (
                 self._mon_hist, self._stop_hist, self._egg_hist,
                 self._raid_hist):
-            old = []
-            now = datetime.utcnow()
-            for key, expiration in hist.iteritems():
-                if expiration < now:  # Track expired items
-                    old.append(key)
-            for key in old:  # Remove expired events
-                del hist[key]
-        self._log.debug("Cleared %s items from cache.", len(old))
+            removed += hist.remove_expired(now)
+        self._log.debug("Cleared %s items from cache.", removed)
@@ -1,4 +1,6 @@
 # Standard Library Imports
+import calendar
+from datetime import datetime
 import os
 # 3rd Party Imports
 import pickle
@@ -6,14 +8,15 @@ import portalocker
 import traceback
 # Local Imports
 from ..Utils import get_path
+from ..Utilities.CacheUtils import ExpiryDict
 from . import Cache
 
 
 class FileCache(Cache):
 
-    def __init__(self, mgr):
+    def __init__(self, mgr, max_size=100000, ttl=7 * 24 * 60 * 60):
         """ Initializes a new cache object for storing data between events. """
-        super(FileCache, self).__init__(mgr)
+        super(FileCache, self).__init__(mgr, max_size, ttl)
         self._name = mgr.get_name()
         self._file = get_path(
             os.path.join("cache", "{}.cache".format(self._name)))
@@ -31,17 +34,12 @@ class FileCache(Cache):
         try:
             with portalocker.Lock(self._file, mode="rb") as f:
                 data = pickle.load(f)
-                self._mon_hist = data.get('mon_hist', {})
-                self._stop_hist = data.get('stop_hist', {})
-                self._egg_hist = data.get('egg_hist', {})
-                self._raid_hist = data.get('raid_hist', {})
-                self._gym_team = data.get('gym_team', {})
-                self._gym_name = data.get('gym_name', {})
-                self._gym_desc = data.get('gym_desc', {})
-                self._gym_image = data.get('gym_image', {})
-                self._cell_weather_id = data.get('cell_weather_id', {})
-                self._severity_id = data.get('severity_id', {})
-                self._day_or_night_id = data.get('day_or_night_id', {})
+                self._mon_hist = _load_hist(data.get('mon_hist'))
+                self._stop_hist = _load_hist(data.get('stop_hist'))
+                self._egg_hist = _load_hist(data.get('egg_hist'))
+                self._raid_hist = _load_hist(data.get('raid_hist'))
+                self._import_entries(self._gyms, self._gym_fields, data)
+                self._import_entries(self._cells, self._cell_fields, data)
 
                 self._log.debug("Cache loaded successfully.")
         except Exception as e:
@@ -54,18 +52,15 @@ class FileCache(Cache):
         """ Export the data to a more permanent location. """
         self._log.debug("Writing cache to file...")
         data = {
-            'mon_hist': self._mon_hist,
-            'stop_hist': self._stop_hist,
-            'egg_hist': self._egg_hist,
-            'raid_hist': self._raid_hist,
-            'gym_team': self._gym_team,
-            'gym_name': self._gym_name,
-            'gym_desc': self._gym_desc,
-            'gym_image': self._gym_image,
-            'cell_weather_id': self._cell_weather_id,
-            'severity_id': self._severity_id,
-            'day_or_night_id': self._day_or_night_id
+            'mon_hist': self._mon_hist.as_dict(),
+            'stop_hist': self._stop_hist.as_dict(),
+            'egg_hist': self._egg_hist.as_dict(),
+            'raid_hist': self._raid_hist.as_dict()
         }
+        # Histories hold epoch seconds, which older versions cannot read.
+        # Gyms and cells keep the per-field layout that older caches used.
+        data.update(self._export_entries(self._gyms, self._gym_fields))
+        data.update(self._export_entries(self._cells, self._cell_fields))
         try:
             # Write to temporary file and then rename
             temp = self._file + ".new"
@@ -81,3 +76,13 @@ class FileCache(Cache):
                             "{}: {}".format(type(e).__name__, e))
             self._log.error(
                 "Stack trace: \n {}".format(traceback.format_exc()))
+
+
+def _load_hist(hist):
+    """ Returns an ExpiryDict of a saved history, converting the datetimes
+    saved by older versions to epoch seconds. """
+    hist = hist or {}
+    for key, expiration in hist.iteritems():
+        if isinstance(expiration, datetime):
+            hist[key] = calendar.timegm(expiration.utctimetuple())
+    return ExpiryDict(hist)
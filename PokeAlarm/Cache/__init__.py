@@ -4,10 +4,10 @@ from FileCache import FileCache
 cache_options = ["mem", "file"]
 
 
-def cache_factory(mgr, kind):
+def cache_factory(mgr, kind, max_size=100000, ttl=7 * 24 * 60 * 60):
     if kind == cache_options[0]:
-        return Cache(mgr)
+        return Cache(mgr, max_size, ttl)
     elif kind == cache_options[1]:
-        return FileCache(mgr)
+        return FileCache(mgr, max_size, ttl)
     else:
         raise ValueError("%s is not a valid cache type!".format(kind))
@@ -3,6 +3,42 @@ import logging
 import time
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm import Unknown
+from PokeAlarm.Utils import (
+    get_applemaps_link, get_dist_as_str, get_gmaps_link, get_waze_link)
+
+
+def dts_group(*keys):
+    """ Decorator for the event methods that build a group of DTS.
+
+    The method is called as `method(locale, timezone, units)` and must
+    return a dict with exactly the given keys. `generate_dts` only calls
+    the groups that have at least one of the keys that were asked for.
+    """
+    def decorator(func):
+        func.dts_keys = frozenset(keys)
+        return func
+    return decorator
+
+
+class lazy_attribute(object):
+    """ Decorator for event attributes that are computed on first access.
+
+    The value is stored on the instance, so the method only runs once and
+    later reads are plain attribute lookups. Only use it for values that
+    are derived from the webhook data, as they are shared by all managers.
+    """
+
+    def __init__(self, func):
+        self._func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.__name__] = self._func(obj)
+        return value
 
 
 class BaseEvent(object):
@@ -18,9 +54,73 @@ class BaseEvent(object):
         # Create an id for this event to be recognized as
         self.id = time.time()
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        raise NotImplementedError("This is an abstract method.")
+    def __getstate__(self):
+        """ Returns a picklable state, used to send events to processes. """
+        state = self.__dict__.copy()
+        state['_log'] = self._log.name  # Loggers can't be pickled
+        return state
+
+    def __setstate__(self, state):
+        """ Restores an event created by __getstate__. """
+        self.__dict__.update(state)
+        self._log = logging.getLogger(state['_log'])
+
+    # (class, keys) -> names of the DTS groups needed for those keys
+    _dts_groups = {}
+
+    @classmethod
+    def get_dts_groups(cls, keys=None):
+        """ Returns the names of the DTS group methods of this event that
+        provide at least one of the keys, or all of them if keys is None.
+        """
+        groups = BaseEvent._dts_groups.get((cls, keys))
+        if groups is None:
+            groups = []
+            for name in dir(cls):
+                group_keys = getattr(getattr(cls, name), 'dts_keys', None)
+                if group_keys is not None and (
+                        keys is None or not group_keys.isdisjoint(keys)):
+                    groups.append(name)
+            BaseEvent._dts_groups[(cls, keys)] = groups
+        return groups
+
+    def generate_dts(self, locale, timezone, units, keys=None):
+        """ Return a dict with the DTS for this event.
+
+        If `keys` (a frozenset) is given, only the groups of DTS that have
+        one of those keys are computed, so the dict may miss other keys.
+        """
+        dts = self.custom_dts.copy()
+        for name in self.get_dts_groups(keys):
+            dts.update(getattr(self, name)(locale, timezone, units))
+        return dts
+
+    @dts_group('lat', 'lng', 'lat_5', 'lng_5')
+    def _coords_dts(self, locale, timezone, units):
+        return {
+            'lat': self.lat,
+            'lng': self.lng,
+            'lat_5': "{:.5f}".format(self.lat),
+            'lng_5': "{:.5f}".format(self.lng)
+        }
+
+    @dts_group('distance', 'direction', 'geofence')
+    def _location_dts(self, locale, timezone, units):
+        return {
+            'distance': (
+                get_dist_as_str(self.distance, units)
+                if Unknown.is_not(self.distance) else Unknown.SMALL),
+            'direction': self.direction,
+            'geofence': self.geofence
+        }
+
+    @dts_group('gmaps', 'applemaps', 'waze')
+    def _map_links_dts(self, locale, timezone, units):
+        return {
+            'gmaps': get_gmaps_link(self.lat, self.lng),
+            'applemaps': get_applemaps_link(self.lat, self.lng),
+            'waze': get_waze_link(self.lat, self.lng)
+        }
 
     @classmethod
     def check_for_none(cls, cast, val, default):
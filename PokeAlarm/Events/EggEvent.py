@@ -1,11 +1,9 @@
 # Standard Library Imports
-from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm.Utils import get_time_as_str, get_seconds_remaining, \
-    get_gmaps_link, get_applemaps_link, get_waze_link, get_dist_as_str, \
     get_weather_emoji
-from . import BaseEvent
+from . import BaseEvent, dts_group
 from PokeAlarm import Unknown
 
 
@@ -21,11 +19,10 @@ class EggEvent(BaseEvent):
         self.gym_id = data.get('gym_id')
 
         # Time Remaining
-        self.hatch_time = datetime.utcfromtimestamp(
-            data.get('start') or data.get('raid_begin'))  # RM or Monocle
+        self.hatch_time = int(  # Epoch seconds, RM or Monocle
+            data.get('start') or data.get('raid_begin'))
         self.time_left = get_seconds_remaining(self.hatch_time)
-        self.raid_end = datetime.utcfromtimestamp(
-            data.get('end') or data.get('raid_end'))  # RM or Monocle
+        self.raid_end = int(data.get('end') or data.get('raid_end'))
 
         # Location
         self.lat = float(data['latitude'])
@@ -58,46 +55,41 @@ class EggEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        hatch_time = get_time_as_str(self.hatch_time, timezone)
-        raid_end_time = get_time_as_str(self.raid_end, timezone)
-        weather_name = locale.get_weather_name(self.weather_id)
-        dts = self.custom_dts.copy()
-        dts.update({
-            # Identification
+    @dts_group('gym_id', 'egg_lvl')
+    def _identification_dts(self, locale, timezone, units):
+        return {
             'gym_id': self.gym_id,
+            'egg_lvl': self.egg_lvl
+        }
 
-            # Time Remaining
+    @dts_group('hatch_time_left', '12h_hatch_time', '24h_hatch_time',
+               'raid_time_left', '12h_raid_end', '24h_raid_end')
+    def _time_dts(self, locale, timezone, units):
+        hatch_time = get_time_as_str(self.hatch_time, timezone)
+        raid_end_time = get_time_as_str(self.raid_end, timezone)
+        return {
             'hatch_time_left': hatch_time[0],
             '12h_hatch_time': hatch_time[1],
             '24h_hatch_time': hatch_time[2],
             'raid_time_left': raid_end_time[0],
             '12h_raid_end': raid_end_time[1],
-            '24h_raid_end': raid_end_time[2],
+            '24h_raid_end': raid_end_time[2]
+        }
 
-            # Location
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lng),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'waze': get_waze_link(self.lat, self.lng),
-            'geofence': self.geofence,
+    @dts_group('weather_id', 'weather', 'weather_or_empty', 'weather_emoji')
+    def _weather_dts(self, locale, timezone, units):
+        weather_name = locale.get_weather_name(self.weather_id)
+        return {
             'weather_id': self.weather_id,
             'weather': weather_name,
             'weather_or_empty': Unknown.or_empty(weather_name),
-            'weather_emoji': get_weather_emoji(self.weather_id),
-
-            # Egg info
-            'egg_lvl': self.egg_lvl,
+            'weather_emoji': get_weather_emoji(self.weather_id)
+        }
 
-            # Gym Details
+    @dts_group('gym_name', 'gym_description', 'gym_image', 'sponsor_id',
+               'sponsored', 'park', 'team_id', 'team_name', 'team_leader')
+    def _gym_dts(self, locale, timezone, units):
+        return {
             'gym_name': self.gym_name,
             'gym_description': self.gym_description,
             'gym_image': self.gym_image,
@@ -109,5 +101,4 @@ class EggEvent(BaseEvent):
             'team_id': self.current_team_id,
             'team_name': locale.get_team_name(self.current_team_id),
             'team_leader': locale.get_leader_name(self.current_team_id)
-        })
-        return dts
+        }
@@ -0,0 +1,49 @@
+# Standard Library Imports
+import types
+# 3rd Party Imports
+# Local Imports
+
+
+class EventOverlay(object):
+    """ A manager's private view of a shared event.
+
+    Events are parsed once and the same object is handed to every manager,
+    so managers must never change them. The one exception is a
+    `lazy_attribute`: it is computed from the webhook data alone, on the
+    event itself, and stored there for every manager to reuse. Managers
+    wrap the event in an overlay instead: attributes set on the overlay
+    (name, distance, geofence, custom_dts, ...) are stored in the overlay
+    only, while reads fall through to the event. Methods of the event are
+    bound to the overlay so that `generate_dts` sees the manager's values.
+    """
+
+    __slots__ = ('_event', '_overlay')
+
+    def __init__(self, event):
+        object.__setattr__(self, '_event', event)
+        object.__setattr__(self, '_overlay', {})
+
+    def __getattr__(self, name):
+        overlay = self._overlay
+        if name in overlay:
+            return overlay[name]
+        event = self._event
+        try:  # Fast path for plain attributes of the event
+            return event.__dict__[name]
+        except KeyError:
+            pass
+        attr = getattr(event, name)
+        if isinstance(attr, types.MethodType) and attr.__self__ is event:
+            # Rebind so the method reads values from the overlay
+            return types.MethodType(attr.__func__, self)
+        return attr
+
+    def __setattr__(self, name, value):
+        self._overlay[name] = value
+
+    def __delattr__(self, name):
+        del self._overlay[name]
+
+    def get_event(self):
+        """ Returns the shared event behind this overlay. """
+        return self._event
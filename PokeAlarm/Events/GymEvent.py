@@ -1,9 +1,7 @@
 # Standard Library Imports
 # 3rd Party Imports
 # Local Imports
-from PokeAlarm.Utils import get_gmaps_link, get_applemaps_link, \
-    get_waze_link, get_dist_as_str
-from . import BaseEvent
+from . import BaseEvent, dts_group
 from PokeAlarm import Unknown
 
 
@@ -48,42 +46,30 @@ class GymEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        dts = self.custom_dts.copy()
-        dts.update({
-            # Identification
+    @dts_group('gym_id', 'gym_name', 'gym_description', 'gym_image')
+    def _identification_dts(self, locale, timezone, units):
+        return {
             'gym_id': self.gym_id,
+            'gym_name': self.gym_name,
+            'gym_description': self.gym_description,
+            'gym_image': self.gym_image
+        }
 
-            # Location
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lng),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'waze': get_waze_link(self.lat, self.lng),
-            'geofence': self.geofence,
-
-            # Team Info
+    @dts_group('old_team', 'old_team_id', 'old_team_leader', 'new_team',
+               'new_team_id', 'new_team_leader')
+    def _team_dts(self, locale, timezone, units):
+        return {
             'old_team': locale.get_team_name(self.old_team_id),
             'old_team_id': self.old_team_id,
             'old_team_leader': locale.get_leader_name(self.old_team_id),
             'new_team': locale.get_team_name(self.new_team_id),
             'new_team_id': self.new_team_id,
-            'new_team_leader': locale.get_leader_name(self.new_team_id),
-
-            # Details
-            'gym_name': self.gym_name,
-            'gym_description': self.gym_description,
-            'gym_image': self.gym_image,
+            'new_team_leader': locale.get_leader_name(self.new_team_id)
+        }
 
-            # Guards
+    @dts_group('slots_available', 'guard_count')
+    def _guards_dts(self, locale, timezone, units):
+        return {
             'slots_available': self.slots_available,
-            'guard_count': self.guard_count,
-        })
-        return dts
+            'guard_count': self.guard_count
+        }
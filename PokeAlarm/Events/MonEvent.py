@@ -1,16 +1,14 @@
 # Standard Library Imports
-from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
 from PokeAlarm.Utilities import MonUtils
 from PokeAlarm.Utils import (
-    get_gmaps_link, get_move_type, get_move_damage, get_move_dps,
-    get_move_duration, get_move_energy, get_pokemon_size,
-    get_applemaps_link, get_time_as_str, get_seconds_remaining,
-    get_base_types, get_dist_as_str, get_weather_emoji,
-    get_type_emoji, get_waze_link)
-from . import BaseEvent
+    get_move_type, get_move_damage, get_move_dps, get_move_duration,
+    get_move_energy, get_pokemon_size, get_time_as_str,
+    get_seconds_remaining, get_base_types, get_weather_emoji,
+    get_type_emoji)
+from . import BaseEvent, dts_group, lazy_attribute
 
 
 class MonEvent(BaseEvent):
@@ -26,8 +24,7 @@ class MonEvent(BaseEvent):
         self.monster_id = int(data['pokemon_id'])
 
         # Time Left
-        self.disappear_time = datetime.utcfromtimestamp(data['disappear_time'])
-        self.time_left = get_seconds_remaining(self.disappear_time)
+        self.disappear_time = int(data['disappear_time'])  # Epoch seconds
 
         # Spawn Data
         self.spawn_start = check_for_none(
@@ -68,20 +65,10 @@ class MonEvent(BaseEvent):
         # Quick Move
         self.quick_id = check_for_none(
             int, data.get('move_1'), Unknown.TINY)
-        self.quick_type = get_move_type(self.quick_id)
-        self.quick_damage = get_move_damage(self.quick_id)
-        self.quick_dps = get_move_dps(self.quick_id)
-        self.quick_duration = get_move_duration(self.quick_id)
-        self.quick_energy = get_move_energy(self.quick_id)
 
         # Charge Move
         self.charge_id = check_for_none(
             int, data.get('move_2'), Unknown.TINY)
-        self.charge_type = get_move_type(self.charge_id)
-        self.charge_damage = get_move_damage(self.charge_id)
-        self.charge_dps = get_move_dps(self.charge_id)
-        self.charge_duration = get_move_duration(self.charge_id)
-        self.charge_energy = get_move_energy(self.charge_id)
 
         # Catch Probs
         self.base_catch = check_for_none(
@@ -102,12 +89,6 @@ class MonEvent(BaseEvent):
             check_for_none(int, data.get('gender'), Unknown.TINY))
         self.height = check_for_none(float, data.get('height'), Unknown.SMALL)
         self.weight = check_for_none(float, data.get('weight'), Unknown.SMALL)
-        if Unknown.is_not(self.height, self.weight):
-            self.size_id = get_pokemon_size(
-                self.monster_id, self.height, self.weight)
-        else:
-            self.size_id = Unknown.SMALL
-        self.types = get_base_types(self.monster_id)
 
         # Form
         self.form_id = check_for_none(int, data.get('form'), 0)
@@ -123,57 +104,104 @@ class MonEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        time = get_time_as_str(self.disappear_time, timezone)
+    # Derived attributes are only computed when a filter or DTS needs them
 
-        form_name = locale.get_form_name(self.monster_id, self.form_id)
-        costume_name = locale.get_costume_name(
-            self.monster_id, self.costume_id)
+    @lazy_attribute
+    def time_left(self):
+        return get_seconds_remaining(self.disappear_time)
 
-        weather_name = locale.get_weather_name(self.weather_id)
-        boosted_weather_name = locale.get_weather_name(self.boosted_weather_id)
+    @lazy_attribute
+    def quick_type(self):
+        return get_move_type(self.quick_id)
 
-        type1 = locale.get_type_name(self.types[0])
-        type2 = locale.get_type_name(self.types[1])
+    @lazy_attribute
+    def quick_damage(self):
+        return get_move_damage(self.quick_id)
+
+    @lazy_attribute
+    def quick_dps(self):
+        return get_move_dps(self.quick_id)
+
+    @lazy_attribute
+    def quick_duration(self):
+        return get_move_duration(self.quick_id)
+
+    @lazy_attribute
+    def quick_energy(self):
+        return get_move_energy(self.quick_id)
+
+    @lazy_attribute
+    def charge_type(self):
+        return get_move_type(self.charge_id)
 
-        dts = self.custom_dts.copy()
-        dts.update({
-            # Identification
+    @lazy_attribute
+    def charge_damage(self):
+        return get_move_damage(self.charge_id)
+
+    @lazy_attribute
+    def charge_dps(self):
+        return get_move_dps(self.charge_id)
+
+    @lazy_attribute
+    def charge_duration(self):
+        return get_move_duration(self.charge_id)
+
+    @lazy_attribute
+    def charge_energy(self):
+        return get_move_energy(self.charge_id)
+
+    @lazy_attribute
+    def size_id(self):
+        if Unknown.is_not(self.height, self.weight):
+            return get_pokemon_size(self.monster_id, self.height, self.weight)
+        return Unknown.SMALL
+
+    @lazy_attribute
+    def types(self):
+        return get_base_types(self.monster_id)
+
+    @dts_group('encounter_id', 'mon_name', 'mon_id', 'mon_id_3')
+    def _identification_dts(self, locale, timezone, units):
+        return {
             'encounter_id': self.enc_id,
             'mon_name': locale.get_pokemon_name(self.monster_id),
             'mon_id': self.monster_id,
-            'mon_id_3': "{:03}".format(self.monster_id),
+            'mon_id_3': "{:03}".format(self.monster_id)
+        }
 
-            # Time Remaining
+    @dts_group('time_left', '12h_time', '24h_time')
+    def _time_dts(self, locale, timezone, units):
+        time = get_time_as_str(self.disappear_time, timezone)
+        return {
             'time_left': time[0],
             '12h_time': time[1],
-            '24h_time': time[2],
+            '24h_time': time[2]
+        }
 
-            # Spawn Data
+    @dts_group('spawn_start', 'spawn_end', 'spawn_verified')
+    def _spawn_dts(self, locale, timezone, units):
+        return {
             'spawn_start': self.spawn_start,
             'spawn_end': self.spawn_end,
-            'spawn_verified': self.spawn_verified,
-
-            # Location
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lng),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'waze': get_waze_link(self.lat, self.lng),
-            'geofence': self.geofence,
-
-            # Weather
+            'spawn_verified': self.spawn_verified
+        }
+
+    @dts_group('weather_id', 'weather', 'weather_or_empty', 'weather_emoji')
+    def _weather_dts(self, locale, timezone, units):
+        weather_name = locale.get_weather_name(self.weather_id)
+        return {
             'weather_id': self.weather_id,
             'weather': weather_name,
             'weather_or_empty': Unknown.or_empty(weather_name),
-            'weather_emoji': get_weather_emoji(self.weather_id),
+            'weather_emoji': get_weather_emoji(self.weather_id)
+        }
+
+    @dts_group('boosted_weather_id', 'boosted_weather',
+               'boosted_weather_or_empty', 'boosted_weather_emoji',
+               'boosted_or_empty')
+    def _boosted_weather_dts(self, locale, timezone, units):
+        boosted_weather_name = locale.get_weather_name(self.boosted_weather_id)
+        return {
             'boosted_weather_id': self.boosted_weather_id,
             'boosted_weather': boosted_weather_name,
             'boosted_weather_or_empty': (
@@ -181,10 +209,14 @@ class MonEvent(BaseEvent):
                 else Unknown.or_empty(boosted_weather_name)),
             'boosted_weather_emoji':
                 get_weather_emoji(self.boosted_weather_id),
-            'boosted_or_empty': locale.get_boosted_text() if \
+            'boosted_or_empty': locale.get_boosted_text() if
                 Unknown.is_not(self.boosted_weather_id) and
-                self.boosted_weather_id != 0 else '',
+                self.boosted_weather_id != 0 else ''
+        }
 
+    @dts_group('mon_lvl', 'cp', 'iv_0', 'iv', 'iv_2', 'atk', 'def', 'sta')
+    def _stats_dts(self, locale, timezone, units):
+        return {
             # Encounter Stats
             'mon_lvl': self.mon_lvl,
             'cp': self.cp,
@@ -201,9 +233,15 @@ class MonEvent(BaseEvent):
                 else Unknown.SMALL),
             'atk': self.atk_iv,
             'def': self.def_iv,
-            'sta': self.sta_iv,
+            'sta': self.sta_iv
+        }
 
-            # Type
+    @dts_group('type1', 'type1_or_empty', 'type1_emoji', 'type2',
+               'type2_or_empty', 'type2_emoji', 'types', 'types_emoji')
+    def _type_dts(self, locale, timezone, units):
+        type1 = locale.get_type_name(self.types[0])
+        type2 = locale.get_type_name(self.types[1])
+        return {
             'type1': type1,
             'type1_or_empty': Unknown.or_empty(type1),
             'type1_emoji': Unknown.or_empty(get_type_emoji(self.types[0])),
@@ -217,21 +255,35 @@ class MonEvent(BaseEvent):
                 "{}{}".format(
                     get_type_emoji(self.types[0]),
                     get_type_emoji(self.types[1]))
-                if Unknown.is_not(type2) else get_type_emoji(self.types[0])),
+                if Unknown.is_not(type2) else get_type_emoji(self.types[0]))
+        }
 
-            # Form
+    @dts_group('form', 'form_or_empty', 'form_id', 'form_id_3')
+    def _form_dts(self, locale, timezone, units):
+        form_name = locale.get_form_name(self.monster_id, self.form_id)
+        return {
             'form': form_name,
             'form_or_empty': Unknown.or_empty(form_name),
             'form_id': self.form_id,
-            'form_id_3': "{:03d}".format(self.form_id),
+            'form_id_3': "{:03d}".format(self.form_id)
+        }
 
-            # Costume
+    @dts_group('costume', 'costume_or_empty', 'costume_id', 'costume_id_3')
+    def _costume_dts(self, locale, timezone, units):
+        costume_name = locale.get_costume_name(
+            self.monster_id, self.costume_id)
+        return {
             'costume': costume_name,
             'costume_or_empty': Unknown.or_empty(costume_name),
             'costume_id': self.costume_id,
-            'costume_id_3': "{:03d}".format(self.costume_id),
-
-            # Quick Move
+            'costume_id_3': "{:03d}".format(self.costume_id)
+        }
+
+    @dts_group('quick_move', 'quick_id', 'quick_type_id', 'quick_type',
+               'quick_type_emoji', 'quick_damage', 'quick_dps',
+               'quick_duration', 'quick_energy')
+    def _quick_move_dts(self, locale, timezone, units):
+        return {
             'quick_move': locale.get_move_name(self.quick_id),
             'quick_id': self.quick_id,
             'quick_type_id': self.quick_type,
@@ -240,9 +292,14 @@ class MonEvent(BaseEvent):
             'quick_damage': self.quick_damage,
             'quick_dps': self.quick_dps,
             'quick_duration': self.quick_duration,
-            'quick_energy': self.quick_energy,
-
-            # Charge Move
+            'quick_energy': self.quick_energy
+        }
+
+    @dts_group('charge_move', 'charge_id', 'charge_type_id', 'charge_type',
+               'charge_type_emoji', 'charge_damage', 'charge_dps',
+               'charge_duration', 'charge_energy')
+    def _charge_move_dts(self, locale, timezone, units):
+        return {
             'charge_move': locale.get_move_name(self.charge_id),
             'charge_id': self.charge_id,
             'charge_type_id': self.charge_type,
@@ -251,9 +308,13 @@ class MonEvent(BaseEvent):
             'charge_damage': self.charge_damage,
             'charge_dps': self.charge_dps,
             'charge_duration': self.charge_duration,
-            'charge_energy': self.charge_energy,
+            'charge_energy': self.charge_energy
+        }
 
-            # Cosmetic
+    @dts_group('gender', 'height_0', 'height', 'height_2', 'weight_0',
+               'weight', 'weight_2', 'size', 'big_karp', 'tiny_rat')
+    def _cosmetic_dts(self, locale, timezone, units):
+        return {
             'gender': self.gender,
             'height_0': (
                 "{:.0f}".format(self.height) if Unknown.is_not(self.height)
@@ -274,59 +335,42 @@ class MonEvent(BaseEvent):
                 "{:.2f}".format(self.weight) if Unknown.is_not(self.weight)
                 else Unknown.SMALL),
             'size': locale.get_size_name(self.size_id),
-
-            # Misc
-            'atk_grade': (
-                Unknown.or_empty(self.atk_grade, Unknown.TINY)),
-            'def_grade': (
-                Unknown.or_empty(self.def_grade, Unknown.TINY)),
-            'rarity_id': self.rarity_id,
-            'rarity': locale.get_rarity_name(self.rarity_id),
-
-            # Catch Prob
-            'base_catch_0': (
-                "{:.0f}".format(self.base_catch * 100)
-                if Unknown.is_not(self.base_catch)
-                else Unknown.TINY),
-            'base_catch': (
-                "{:.1f}".format(self.base_catch * 100)
-                if Unknown.is_not(self.base_catch)
-                else Unknown.SMALL),
-            'base_catch_2': (
-                "{:.2f}".format(self.base_catch * 100)
-                if Unknown.is_not(self.base_catch)
-                else Unknown.SMALL),
-            'great_catch_0': (
-                "{:.0f}".format(self.great_catch * 100)
-                if Unknown.is_not(self.great_catch)
-                else Unknown.TINY),
-            'great_catch': (
-                "{:.1f}".format(self.great_catch * 100)
-                if Unknown.is_not(self.great_catch)
-                else Unknown.SMALL),
-            'great_catch_2': (
-                "{:.2f}".format(self.great_catch * 100)
-                if Unknown.is_not(self.great_catch)
-                else Unknown.SMALL),
-            'ultra_catch_0': (
-                "{:.0f}".format(self.ultra_catch * 100)
-                if Unknown.is_not(self.ultra_catch)
-                else Unknown.TINY),
-            'ultra_catch': (
-                "{:.1f}".format(self.ultra_catch * 100)
-                if Unknown.is_not(self.ultra_catch)
-                else Unknown.SMALL),
-            'ultra_catch_2': (
-                "{:.2f}".format(self.ultra_catch * 100)
-                if Unknown.is_not(self.ultra_catch)
-                else Unknown.SMALL),
-
-            # Misc
             'big_karp': (
                 'big' if self.monster_id == 129 and Unknown.is_not(self.weight)
                 and self.weight >= 13.13 else ''),
             'tiny_rat': (
                 'tiny' if self.monster_id == 19 and Unknown.is_not(self.weight)
                 and self.weight <= 2.41 else '')
-        })
+        }
+
+    @dts_group('atk_grade', 'def_grade', 'rarity_id', 'rarity')
+    def _misc_dts(self, locale, timezone, units):
+        return {
+            'atk_grade': (
+                Unknown.or_empty(self.atk_grade, Unknown.TINY)),
+            'def_grade': (
+                Unknown.or_empty(self.def_grade, Unknown.TINY)),
+            'rarity_id': self.rarity_id,
+            'rarity': locale.get_rarity_name(self.rarity_id)
+        }
+
+    @dts_group('base_catch_0', 'base_catch', 'base_catch_2',
+               'great_catch_0', 'great_catch', 'great_catch_2',
+               'ultra_catch_0', 'ultra_catch', 'ultra_catch_2')
+    def _catch_dts(self, locale, timezone, units):
+        dts = {}
+        for name in ('base', 'great', 'ultra'):
+            prob = getattr(self, name + '_catch')
+            if Unknown.is_not(prob):
+                dts.update({
+                    name + '_catch_0': "{:.0f}".format(prob * 100),
+                    name + '_catch': "{:.1f}".format(prob * 100),
+                    name + '_catch_2': "{:.2f}".format(prob * 100)
+                })
+            else:
+                dts.update({
+                    name + '_catch_0': Unknown.TINY,
+                    name + '_catch': Unknown.SMALL,
+                    name + '_catch_2': Unknown.SMALL
+                })
         return dts
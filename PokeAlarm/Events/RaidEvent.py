@@ -1,14 +1,12 @@
 # Standard Library Imports
-from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
-from PokeAlarm.Utils import get_gmaps_link, get_applemaps_link, \
-    get_time_as_str, get_move_type, get_move_damage, get_move_dps, \
-    get_move_duration, get_move_energy, get_seconds_remaining, \
-    get_dist_as_str, get_pokemon_cp_range, is_weather_boosted, \
-    get_base_types, get_weather_emoji, get_type_emoji, get_waze_link
+from . import BaseEvent, dts_group, lazy_attribute
+from PokeAlarm.Utils import get_time_as_str, get_move_type, \
+    get_move_damage, get_move_dps, get_move_duration, get_move_energy, \
+    get_seconds_remaining, get_pokemon_cp_range, is_weather_boosted, \
+    get_base_types, get_weather_emoji, get_type_emoji
 
 
 class RaidEvent(BaseEvent):
@@ -23,9 +21,8 @@ class RaidEvent(BaseEvent):
         self.gym_id = data.get('gym_id')
 
         # Time Remaining
-        self.raid_end = datetime.utcfromtimestamp(
-            data.get('end') or data.get('raid_end'))  # RM or Monocle
-        self.time_left = get_seconds_remaining(self.raid_end)
+        self.raid_end = int(  # Epoch seconds, RM or Monocle
+            data.get('end') or data.get('raid_end'))
 
         # Location
         self.lat = float(data['latitude'])
@@ -37,8 +34,6 @@ class RaidEvent(BaseEvent):
         self.raid_lvl = int(data['level'])
         self.mon_id = int(data['pokemon_id'])
         self.cp = int(data['cp'])
-        self.types = get_base_types(self.mon_id)
-        self.boss_level = 20
 
         # Form
         self.form_id = check_for_none(int, data.get('form'), 0)
@@ -49,29 +44,14 @@ class RaidEvent(BaseEvent):
         # Weather Info
         self.weather_id = check_for_none(
             int, data.get('weather'), Unknown.TINY)
-        self.boosted_weather_id = \
-            0 if Unknown.is_not(self.weather_id) else Unknown.TINY
-        if is_weather_boosted(self.mon_id, self.weather_id):
-            self.boosted_weather_id = self.weather_id
-            self.boss_level = 25
 
         # Quick Move
         self.quick_id = check_for_none(
             int, data.get('move_1'), Unknown.TINY)
-        self.quick_type = get_move_type(self.quick_id)
-        self.quick_damage = get_move_damage(self.quick_id)
-        self.quick_dps = get_move_dps(self.quick_id)
-        self.quick_duration = get_move_duration(self.quick_id)
-        self.quick_energy = get_move_energy(self.quick_id)
 
         # Charge Move
         self.charge_id = check_for_none(
             int, data.get('move_2'), Unknown.TINY)
-        self.charge_type = get_move_type(self.charge_id)
-        self.charge_damage = get_move_damage(self.charge_id)
-        self.charge_dps = get_move_dps(self.charge_id)
-        self.charge_duration = get_move_duration(self.charge_id)
-        self.charge_energy = get_move_energy(self.charge_id)
 
         # Gym Details (currently only sent from Monocle)
         self.gym_name = check_for_none(
@@ -93,32 +73,95 @@ class RaidEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        raid_end_time = get_time_as_str(self.raid_end, timezone)
-        dts = self.custom_dts.copy()
+    # Derived attributes are only computed when a filter or DTS needs them
 
-        form_name = locale.get_form_name(self.mon_id, self.form_id)
-        costume_name = locale.get_costume_name(
-            self.mon_id, self.costume_id)
+    @lazy_attribute
+    def time_left(self):
+        return get_seconds_remaining(self.raid_end)
 
-        boosted_weather_name = locale.get_weather_name(self.boosted_weather_id)
-        weather_name = locale.get_weather_name(self.weather_id)
+    @lazy_attribute
+    def types(self):
+        return get_base_types(self.mon_id)
 
-        type1 = locale.get_type_name(self.types[0])
-        type2 = locale.get_type_name(self.types[1])
+    @lazy_attribute
+    def is_boosted(self):
+        return is_weather_boosted(self.mon_id, self.weather_id)
 
-        cp_range = get_pokemon_cp_range(self.mon_id, self.boss_level)
-        dts.update({
-            # Identification
+    @lazy_attribute
+    def boosted_weather_id(self):
+        if self.is_boosted:
+            return self.weather_id
+        return 0 if Unknown.is_not(self.weather_id) else Unknown.TINY
+
+    @lazy_attribute
+    def boss_level(self):
+        return 25 if self.is_boosted else 20
+
+    @lazy_attribute
+    def quick_type(self):
+        return get_move_type(self.quick_id)
+
+    @lazy_attribute
+    def quick_damage(self):
+        return get_move_damage(self.quick_id)
+
+    @lazy_attribute
+    def quick_dps(self):
+        return get_move_dps(self.quick_id)
+
+    @lazy_attribute
+    def quick_duration(self):
+        return get_move_duration(self.quick_id)
+
+    @lazy_attribute
+    def quick_energy(self):
+        return get_move_energy(self.quick_id)
+
+    @lazy_attribute
+    def charge_type(self):
+        return get_move_type(self.charge_id)
+
+    @lazy_attribute
+    def charge_damage(self):
+        return get_move_damage(self.charge_id)
+
+    @lazy_attribute
+    def charge_dps(self):
+        return get_move_dps(self.charge_id)
+
+    @lazy_attribute
+    def charge_duration(self):
+        return get_move_duration(self.charge_id)
+
+    @lazy_attribute
+    def charge_energy(self):
+        return get_move_energy(self.charge_id)
+
+    @dts_group('gym_id', 'raid_lvl', 'mon_name', 'mon_id', 'mon_id_3')
+    def _identification_dts(self, locale, timezone, units):
+        return {
             'gym_id': self.gym_id,
+            'raid_lvl': self.raid_lvl,
+            'mon_name': locale.get_pokemon_name(self.mon_id),
+            'mon_id': self.mon_id,
+            'mon_id_3': "{:03}".format(self.mon_id)
+        }
 
-            # Time Remaining
+    @dts_group('raid_time_left', '12h_raid_end', '24h_raid_end')
+    def _time_dts(self, locale, timezone, units):
+        raid_end_time = get_time_as_str(self.raid_end, timezone)
+        return {
             'raid_time_left': raid_end_time[0],
             '12h_raid_end': raid_end_time[1],
-            '24h_raid_end': raid_end_time[2],
+            '24h_raid_end': raid_end_time[2]
+        }
 
-            # Type
+    @dts_group('type1', 'type1_or_empty', 'type1_emoji', 'type2',
+               'type2_or_empty', 'type2_emoji', 'types', 'types_emoji')
+    def _type_dts(self, locale, timezone, units):
+        type1 = locale.get_type_name(self.types[0])
+        type2 = locale.get_type_name(self.types[1])
+        return {
             'type1': type1,
             'type1_or_empty': Unknown.or_empty(type1),
             'type1_emoji': Unknown.or_empty(get_type_emoji(self.types[0])),
@@ -132,39 +175,46 @@ class RaidEvent(BaseEvent):
                 "{}{}".format(
                     get_type_emoji(self.types[0]),
                     get_type_emoji(self.types[1]))
-                if Unknown.is_not(type2) else get_type_emoji(self.types[0])),
+                if Unknown.is_not(type2) else get_type_emoji(self.types[0]))
+        }
 
-            # Form
+    @dts_group('form', 'form_or_empty', 'form_id', 'form_id_3')
+    def _form_dts(self, locale, timezone, units):
+        form_name = locale.get_form_name(self.mon_id, self.form_id)
+        return {
             'form': form_name,
             'form_or_empty': Unknown.or_empty(form_name),
             'form_id': self.form_id,
-            'form_id_3': "{:03d}".format(self.form_id),
+            'form_id_3': "{:03d}".format(self.form_id)
+        }
 
-            # Costume
+    @dts_group('costume', 'costume_or_empty', 'costume_id', 'costume_id_3')
+    def _costume_dts(self, locale, timezone, units):
+        costume_name = locale.get_costume_name(
+            self.mon_id, self.costume_id)
+        return {
             'costume': costume_name,
             'costume_or_empty': Unknown.or_empty(costume_name),
             'costume_id': self.costume_id,
-            'costume_id_3': "{:03d}".format(self.costume_id),
-
-            # Location
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lng),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'waze': get_waze_link(self.lat, self.lng),
-            'geofence': self.geofence,
-
-            # Weather
+            'costume_id_3': "{:03d}".format(self.costume_id)
+        }
+
+    @dts_group('weather_id', 'weather', 'weather_or_empty', 'weather_emoji')
+    def _weather_dts(self, locale, timezone, units):
+        weather_name = locale.get_weather_name(self.weather_id)
+        return {
             'weather_id': self.weather_id,
             'weather': weather_name,
             'weather_or_empty': Unknown.or_empty(weather_name),
-            'weather_emoji': get_weather_emoji(self.weather_id),
+            'weather_emoji': get_weather_emoji(self.weather_id)
+        }
+
+    @dts_group('boosted_weather_id', 'boosted_weather',
+               'boosted_weather_or_empty', 'boosted_weather_emoji',
+               'boosted_or_empty')
+    def _boosted_weather_dts(self, locale, timezone, units):
+        boosted_weather_name = locale.get_weather_name(self.boosted_weather_id)
+        return {
             'boosted_weather_id': self.boosted_weather_id,
             'boosted_weather': boosted_weather_name,
             'boosted_weather_or_empty': (
@@ -173,16 +223,14 @@ class RaidEvent(BaseEvent):
             'boosted_weather_emoji': get_weather_emoji(
                 self.boosted_weather_id),
             'boosted_or_empty':
-                locale.get_boosted_text() if self.boss_level == 25 else '',
+                locale.get_boosted_text() if self.boss_level == 25 else ''
+        }
 
-            # Raid Info
-            'raid_lvl': self.raid_lvl,
-            'mon_name': locale.get_pokemon_name(self.mon_id),
-            'mon_id': self.mon_id,
-            'mon_id_3': "{:03}".format(self.mon_id),
-            # TODO: Form?
-
-            # Quick Move
+    @dts_group('quick_move', 'quick_id', 'quick_type_id', 'quick_type',
+               'quick_type_emoji', 'quick_damage', 'quick_dps',
+               'quick_duration', 'quick_energy')
+    def _quick_move_dts(self, locale, timezone, units):
+        return {
             'quick_move': locale.get_move_name(self.quick_id),
             'quick_id': self.quick_id,
             'quick_type_id': self.quick_type,
@@ -191,9 +239,14 @@ class RaidEvent(BaseEvent):
             'quick_damage': self.quick_damage,
             'quick_dps': self.quick_dps,
             'quick_duration': self.quick_duration,
-            'quick_energy': self.quick_energy,
+            'quick_energy': self.quick_energy
+        }
 
-            # Charge Move
+    @dts_group('charge_move', 'charge_id', 'charge_type_id', 'charge_type',
+               'charge_type_emoji', 'charge_damage', 'charge_dps',
+               'charge_duration', 'charge_energy')
+    def _charge_move_dts(self, locale, timezone, units):
+        return {
             'charge_move': locale.get_move_name(self.charge_id),
             'charge_id': self.charge_id,
             'charge_type_id': self.charge_type,
@@ -202,14 +255,22 @@ class RaidEvent(BaseEvent):
             'charge_damage': self.charge_damage,
             'charge_dps': self.charge_dps,
             'charge_duration': self.charge_duration,
-            'charge_energy': self.charge_energy,
+            'charge_energy': self.charge_energy
+        }
 
-            # CP info
+    @dts_group('cp', 'min_cp', 'max_cp')
+    def _cp_dts(self, locale, timezone, units):
+        cp_range = get_pokemon_cp_range(self.mon_id, self.boss_level)
+        return {
             'cp': self.cp,
             'min_cp': cp_range[0],
-            'max_cp': cp_range[1],
+            'max_cp': cp_range[1]
+        }
 
-            # Gym Details
+    @dts_group('gym_name', 'gym_description', 'gym_image', 'sponsor_id',
+               'sponsored', 'park', 'team_id', 'team_name', 'team_leader')
+    def _gym_dts(self, locale, timezone, units):
+        return {
             'gym_name': self.gym_name,
             'gym_description': self.gym_description,
             'gym_image': self.gym_image,
@@ -221,5 +282,4 @@ class RaidEvent(BaseEvent):
             'team_id': self.current_team_id,
             'team_name': locale.get_team_name(self.current_team_id),
             'team_leader': locale.get_leader_name(self.current_team_id)
-        })
-        return dts
+        }
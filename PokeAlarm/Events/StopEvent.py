@@ -1,11 +1,9 @@
 # Standard Library Imports
-from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
-from PokeAlarm.Utils import get_gmaps_link, get_applemaps_link, \
-    get_waze_link, get_time_as_str, get_seconds_remaining, get_dist_as_str
+from . import BaseEvent, dts_group
+from PokeAlarm.Utils import get_time_as_str, get_seconds_remaining
 
 
 class StopEvent(BaseEvent):
@@ -22,7 +20,7 @@ class StopEvent(BaseEvent):
         self.expiration = data['lure_expiration']
         self.time_left = None
         if self.expiration is not None:
-            self.expiration = datetime.utcfromtimestamp(self.expiration)
+            self.expiration = int(self.expiration)  # Epoch seconds
             self.time_left = get_seconds_remaining(self.expiration)
 
         # Location
@@ -38,31 +36,12 @@ class StopEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
+    @dts_group('stop_id', 'time_left', '12h_time', '24h_time')
+    def _identification_dts(self, locale, timezone, units):
         time = get_time_as_str(self.expiration, timezone)
-        dts = self.custom_dts.copy()
-        dts.update({
-            # Identification
+        return {
             'stop_id': self.stop_id,
-
-            # Time left
             'time_left': time[0],
             '12h_time': time[1],
-            '24h_time': time[2],
-
-            # Location
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lat),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'waze': get_waze_link(self.lat, self.lng),
-            'geofence': self.geofence
-        })
-        return dts
+            '24h_time': time[2]
+        }
@@ -1,9 +1,8 @@
 # Standard Library Imports
 # 3rd Party Imports
 # Local Imports
-from PokeAlarm.Utils import get_gmaps_link, get_applemaps_link, \
-    get_dist_as_str, get_weather_emoji, get_waze_link
-from . import BaseEvent
+from PokeAlarm.Utils import get_weather_emoji
+from . import BaseEvent, dts_group
 from PokeAlarm import Unknown
 
 
@@ -32,41 +31,33 @@ class WeatherEvent(BaseEvent):
         self.geofence = Unknown.REGULAR
         self.custom_dts = {}
 
-    def generate_dts(self, locale, timezone, units):
-        """ Return a dict with all the DTS for this event. """
-        weather_name = locale.get_weather_name(self.weather_id)
-        severity_locale = locale.get_severity_name(self.severity_id)
-        dts = self.custom_dts.copy()
-        dts.update({
-            # Identification
+    @dts_group('s2_cell_id', 'weather_id', 'weather_id_3', 'weather',
+               'weather_emoji')
+    def _weather_dts(self, locale, timezone, units):
+        return {
             's2_cell_id': self.s2_cell_id,
-
-            # Location - center of the s2 cell
-            'lat': self.lat,
-            'lng': self.lng,
-            'lat_5': "{:.5f}".format(self.lat),
-            'lng_5': "{:.5f}".format(self.lng),
-            'distance': (
-                get_dist_as_str(self.distance, units)
-                if Unknown.is_not(self.distance) else Unknown.SMALL),
-            'direction': self.direction,
-            'gmaps': get_gmaps_link(self.lat, self.lng),
-            'applemaps': get_applemaps_link(self.lat, self.lng),
-            'geofence': self.geofence,
-            'waze': get_waze_link(self.lat, self.lng),
-
-            # Weather Info
             'weather_id': self.weather_id,
             'weather_id_3': "{:03}".format(self.weather_id),
-            'weather': weather_name,
-            'weather_emoji': get_weather_emoji(self.weather_id),
+            'weather': locale.get_weather_name(self.weather_id),
+            'weather_emoji': get_weather_emoji(self.weather_id)
+        }
+
+    @dts_group('severity_id', 'severity_id_3', 'severity',
+               'severity_or_empty')
+    def _severity_dts(self, locale, timezone, units):
+        severity_locale = locale.get_severity_name(self.severity_id)
+        return {
             'severity_id': self.severity_id,
             'severity_id_3': "{:03}".format(self.severity_id),
             'severity': severity_locale,
             'severity_or_empty':
-                '' if self.severity_id is 0 else severity_locale,
+                '' if self.severity_id is 0 else severity_locale
+        }
+
+    @dts_group('day_or_night_id', 'day_or_night_id_3', 'day_or_night')
+    def _day_or_night_dts(self, locale, timezone, units):
+        return {
             'day_or_night_id': self.day_or_night_id,
             'day_or_night_id_3': "{:03}".format(self.day_or_night_id),
             'day_or_night': locale.get_day_or_night(self.day_or_night_id)
-        })
-        return dts
+        }
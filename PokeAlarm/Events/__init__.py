@@ -1,13 +1,14 @@
 import logging
 import traceback
 
-from BaseEvent import BaseEvent  # noqa F401
+from BaseEvent import BaseEvent, dts_group, lazy_attribute  # noqa F401
 from MonEvent import MonEvent
 from StopEvent import StopEvent
 from GymEvent import GymEvent
 from EggEvent import EggEvent
 from RaidEvent import RaidEvent
 from WeatherEvent import WeatherEvent
+from EventOverlay import EventOverlay  # noqa F401
 
 log = logging.getLogger('Events')
 
@@ -1,5 +1,7 @@
 # Standard Library Imports
 import logging
+import operator
+import re
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
@@ -7,9 +9,33 @@ from PokeAlarm import Unknown
 log = logging.getLogger('Filter')
 
 
+def not_contains(container, value):
+    """ Returns True if the value is not in the container. """
+    return value not in container
+
+
+# Comparisons that are written straight into compiled filters
+_INLINE_CHECKS = {
+    operator.le: '{limit} <= value',
+    operator.ge: '{limit} >= value',
+    operator.contains: 'value in {limit}',
+    not_contains: 'value not in {limit}'
+}
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Relative cost of an inlined check versus a function call
+_INLINE_COST, _CALL_COST = 1.0, 4.0
+# Weight of the old check statistics each time the checks are reordered
+_STATS_DECAY = 0.5
+
+
 class BaseFilter(object):
     """ Abstract class representing details related to different events. """
 
+    # Event attribute that filters of this kind can be indexed by
+    index_attribute = None
+
     def __init__(self, mgr, kind, name):
         """ Initializes base parameters for a filter. """
 
@@ -24,6 +50,15 @@ class BaseFilter(object):
 
         # Functions for checking set parameters
         self._check_list = []
+        # Single function doing all the checks, created by `compile`
+        self._compiled_check = None
+        self._compiled_source = None
+        # Order to run the checks in, as indexes into the check list
+        self._check_order = []
+        # Events checked, followed by rejects per check, since last reorder
+        self._check_counts = [0]
+        # Decayed [evaluated, rejected] totals per check
+        self._check_stats = []
 
         # Missing Info
         self.is_missing_info = None
@@ -36,19 +71,130 @@ class BaseFilter(object):
         raise NotImplementedError("This is an abstract method.")
 
     def check_event(self, event):
-        missing = False  # Event is missing no info to start
-        for check in self._check_list:
-            result = check(self, event)
-            if result is False:
-                return False
-            elif Unknown.is_(result):
-                missing = True  # Mark Event as missing info
-        # Do a special check for is missing_info is set
-        if self.is_missing_info is not None \
-                and missing != self.is_missing_info:
-            self.reject(event, "missing_info", missing, self.is_missing_info)
+        """ Returns True if the event passes all checks of this filter. """
+        if self._compiled_check is None:
+            self.compile()
+        return self._compiled_check(event)
+
+    def compile(self):
+        """ Turns the check list into one function with inlined checks.
+
+        Checks run in the current check order and stop at the first
+        rejection. A check of an unknown value marks the event as missing
+        info instead. The missing info setting is checked last.
+        """
+        namespace = {
+            'counts': self._check_counts,
+            'unknown': frozenset([Unknown.TINY, Unknown.SMALL,
+                                  Unknown.REGULAR]),
+            'reject': self.reject,
+            'accept': self.accept,
+            'is_missing_info': self.is_missing_info
+        }
+        lines = ["def check_event(event):",
+                 "    counts[0] += 1",
+                 "    missing = False"]
+        last_attr = None
+        for i in self._check_order:
+            check = self._check_list[i]
+            limit, attr = "limit_{}".format(i), check._attr_name
+            namespace[limit] = check._limit
+            namespace["attr_{}".format(i)] = attr
+            if attr != last_attr:  # Reuse the value for min/max checks
+                if _IDENTIFIER.match(attr):
+                    lines.append("    value = event.{}".format(attr))
+                else:
+                    lines.append("    value = getattr(event, attr_{})"
+                                 "".format(i))
+                last_attr = attr
+            lines += ["    if value in unknown:",
+                      "        missing = True"]
+            reject = ["        counts[{}] += 1".format(i + 1),
+                      "        reject(event, attr_{0}, value, limit_{0})"
+                      "".format(i),
+                      "        return False"]
+            inline = _INLINE_CHECKS.get(check._eval_func)
+            if inline is not None:
+                lines.append("    elif not ({}):".format(
+                    inline.format(limit=limit)))
+                lines += reject
+            else:  # Call the function and check the result like before
+                namespace["func_{}".format(i)] = check._eval_func
+                lines += ["    else:",
+                          "        result = func_{0}(limit_{0}, value)"
+                          "".format(i),
+                          "        if result is False:"]
+                lines += ["    " + line for line in reject]
+                lines += ["        elif result in unknown:",
+                          "            missing = True"]
+        if self.is_missing_info is not None:
+            lines += ["    if missing != is_missing_info:",
+                      "        reject(event, 'missing_info', missing, "
+                      "is_missing_info)",
+                      "        return False"]
+        lines += ["    accept(event)",
+                  "    return True"]
+
+        source = "\n".join(lines) + "\n"
+        code = compile(source, "<{} filter '{}'>".format(
+            self._type, self._name), 'exec')
+        exec code in namespace
+        self._compiled_check = namespace['check_event']
+        self._compiled_source = source
+        return self._compiled_check
+
+    def reorder_checks(self, min_events=100):
+        """ Reorders the checks so that the cheapest checks with the most
+        rejections run first. Returns True if the order was changed.
+
+        Rejections are counted by the compiled function. Since the order is
+        fixed between two calls, the number of events each check evaluated
+        can be worked out from the rejections of the checks before it.
+        """
+        counts = self._check_counts
+        if counts[0] < min_events:
+            return False  # Not enough events to go by yet
+
+        reached = counts[0]
+        for i in self._check_order:
+            stats = self._check_stats[i]
+            stats[0] = stats[0] * _STATS_DECAY + reached
+            stats[1] = stats[1] * _STATS_DECAY + counts[i + 1]
+            reached -= counts[i + 1]
+        counts[:] = [0] * len(counts)  # Keep the list used by the function
+
+        def rank(i):  # Expected cost of the check per rejected event
+            evaluated, rejected = self._check_stats[i]
+            if rejected == 0:
+                return float('inf')
+            cost = _CALL_COST
+            if self._check_list[i]._eval_func in _INLINE_CHECKS:
+                cost = _INLINE_COST
+            return cost * evaluated / rejected
+
+        order = sorted(self._check_order, key=rank)
+        if order == self._check_order:
             return False
-        self.accept(event)
+        self._check_order = order
+        self._compiled_check = None
+        self._log.debug("Filter '%s' will now check %s", self._name,
+                        ", ".join(self.get_check_order()))
+        return True
+
+    def get_check_order(self):
+        """ Returns the event attributes in the order they are checked. """
+        return [self._check_list[i]._attr_name for i in self._check_order]
+
+    def get_check_stats(self):
+        """ Returns (attribute, limit, evaluated, rejected) for each check,
+        in the order they are checked. Totals decay at each reorder. """
+        return [(self._check_list[i]._attr_name, self._check_list[i]._limit,
+                 self._check_stats[i][0], self._check_stats[i][1])
+                for i in self._check_order]
+
+    def could_match(self, value):
+        """ Returns False if an event with the given (known) value for the
+        index attribute would always be rejected by this filter. """
         return True
 
     def reject(self, event, attr_name, value, required):
@@ -72,6 +218,10 @@ class BaseFilter(object):
 
         # Add check function to our list
         self._check_list.append(check)
+        self._check_order.append(len(self._check_list) - 1)
+        self._check_counts.append(0)
+        self._check_stats.append([0.0, 0.0])
+        self._compiled_check = None  # Needs to be compiled again
         return limit
 
     @staticmethod
@@ -0,0 +1,85 @@
+# Standard Library Imports
+import operator
+# 3rd Party Imports
+try:
+    import numpy
+except ImportError:
+    numpy = None
+# Local Imports
+from PokeAlarm import Unknown
+
+
+class BatchFilter(object):
+    """ Runs the numeric range checks of many filters on many events.
+
+    The min/max limits of each filter are packed into arrays, as are the
+    values of a batch of events, and all range checks are evaluated as
+    NumPy masks at once. This is only a pre-check: an event still has to
+    pass `check_event` of every filter it is not ruled out for, which
+    also takes care of set and regex checks and logging. Unknown values
+    never rule a filter out, as they count as missing info.
+
+    Requires NumPy, which is optional for PokeAlarm.
+    """
+
+    # Numeric event attributes that can be checked in batches
+    attributes = ('iv', 'cp', 'mon_lvl', 'distance', 'time_left', 'atk_iv',
+                  'def_iv', 'sta_iv', 'weight', 'height')
+
+    def __init__(self, filter_set):
+        if numpy is None:
+            raise ImportError("NumPy is required to filter in batches.")
+        self._names = list(filter_set.keys())
+        size = len(self._names)
+        mins, maxs = {}, {}
+        for row, name in enumerate(self._names):
+            for check in filter_set[name]._check_list:
+                attr, limit = check._attr_name, check._limit
+                if attr not in self.attributes:
+                    continue
+                if check._eval_func is operator.le:  # limit <= value
+                    bound = mins.setdefault(attr, numpy.full(size, -numpy.inf))
+                    bound[row] = max(bound[row], limit)
+                elif check._eval_func is operator.ge:  # limit >= value
+                    bound = maxs.setdefault(attr, numpy.full(size, numpy.inf))
+                    bound[row] = min(bound[row], limit)
+        # Bounds as columns, to be broadcast against a row of values
+        self._bounds = [
+            (name, mins[name][:, None] if name in mins else None,
+             maxs[name][:, None] if name in maxs else None)
+            for name in self.attributes if name in mins or name in maxs]
+
+    @staticmethod
+    def is_available():
+        """ Returns True if NumPy is installed. """
+        return numpy is not None
+
+    @staticmethod
+    def _as_float(value):
+        """ Returns the value as a float, or NaN if it is not a number. """
+        if Unknown.is_(value):
+            return numpy.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return numpy.nan
+
+    def check(self, events):
+        """ Returns a set per event with the names of the filters that were
+        not ruled out by their range checks. """
+        mask = numpy.ones((len(self._names), len(events)), dtype=bool)
+        with numpy.errstate(invalid='ignore'):
+            for attr, lower, upper in self._bounds:
+                values = numpy.array(
+                    [self._as_float(getattr(e, attr)) for e in events])
+                passed = numpy.isnan(values)
+                if lower is None:
+                    passed = passed | (upper >= values)
+                elif upper is None:
+                    passed = passed | (lower <= values)
+                else:
+                    passed = passed | ((lower <= values) & (upper >= values))
+                mask &= passed
+        names = self._names
+        return [frozenset(names[i] for i in numpy.flatnonzero(column))
+                for column in mask.T]
@@ -9,6 +9,8 @@ from PokeAlarm.Utilities import GymUtils as GymUtils
 class EggFilter(BaseFilter):
     """ Filter class for limiting which egg trigger a notification. """
 
+    index_attribute = 'egg_lvl'
+
     def __init__(self, mgr, name, data):
         """ Initializes base parameters for a filter. """
         super(EggFilter, self).__init__(mgr, 'egg', name)
@@ -84,6 +86,12 @@ class EggFilter(BaseFilter):
             raise ValueError("'{}' is not a recognized parameter for"
                              " Egg filters".format(key))
 
+    def could_match(self, value):
+        """ Returns False if the egg level is never accepted. """
+        if self.min_lvl is not None and value < self.min_lvl:
+            return False
+        return self.max_lvl is None or value <= self.max_lvl
+
     def to_dict(self):
         """ Create a dict representation of this Filter. """
         settings = {}
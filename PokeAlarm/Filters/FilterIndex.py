@@ -0,0 +1,44 @@
+# Standard Library Imports
+# 3rd Party Imports
+# Local Imports
+from PokeAlarm import Unknown
+
+
+class FilterIndex(object):
+    """ Finds the filters of a rule that could accept an event.
+
+    Filters are indexed by their kind's `index_attribute` (such as the
+    monster id), and only filters that could match the event's value are
+    returned, in the order of the rule. Filters without a restriction on
+    the attribute are always returned. Candidates are worked out the first
+    time a value is seen and remembered afterwards.
+    """
+
+    def __init__(self, filter_set, filter_names):
+        self._filter_set = filter_set
+        self._names = list(filter_names)
+        attrs = set(filter_set[name].index_attribute
+                    for name in self._names if name in filter_set)
+        # Only index when all filters agree on the attribute
+        self._attr = attrs.pop() if len(attrs) == 1 else None
+        self._candidates = {}
+
+    def get_candidates(self, event):
+        """ Returns the names of the filters the event must be checked
+        against, in the original order. """
+        if self._attr is None:
+            return self._names
+        value = getattr(event, self._attr)
+        try:
+            return self._candidates[value]
+        except KeyError:
+            pass
+        if Unknown.is_(value):  # Every filter has to decide on these
+            return self._names
+        candidates = [
+            name for name in self._names
+            # Unknown names are kept, so that they are still reported
+            if name not in self._filter_set
+            or self._filter_set[name].could_match(value)]
+        self._candidates[value] = candidates
+        return candidates
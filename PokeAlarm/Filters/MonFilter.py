@@ -3,6 +3,7 @@ import operator
 # 3rd Party Imports
 # Local Imports
 from . import BaseFilter
+from .BaseFilter import not_contains
 from PokeAlarm.Utilities import MonUtils as MonUtils
 from PokeAlarm.Utils import get_weather_id
 
@@ -10,6 +11,8 @@ from PokeAlarm.Utils import get_weather_id
 class MonFilter(BaseFilter):
     """ Filter class for limiting which monsters trigger a notification. """
 
+    index_attribute = 'monster_id'
+
     def __init__(self, mgr, name, data):
         """ Initializes base parameters for a filter. """
         super(MonFilter, self).__init__(mgr, 'monster', name)
@@ -23,7 +26,7 @@ class MonFilter(BaseFilter):
         # Exclude Monsters - f.monster_ids not contains m.ex_mon_id
         self.exclude_monster_ids = self.evaluate_attribute(  #
             event_attribute='monster_id',
-            eval_func=lambda d, v: not operator.contains(d, v),
+            eval_func=not_contains,
             limit=BaseFilter.parse_as_set(
                 MonUtils.get_monster_id, 'monsters_exclude', data))
 
@@ -162,6 +165,13 @@ class MonFilter(BaseFilter):
             raise ValueError("'{}' is not a recognized parameter for"
                              " Monster filters".format(key))
 
+    def could_match(self, value):
+        """ Returns False if the monster id is never accepted. """
+        if self.monster_ids is not None and value not in self.monster_ids:
+            return False
+        return self.exclude_monster_ids is None \
+            or value not in self.exclude_monster_ids
+
     def to_dict(self):
         """ Create a dict representation of this Filter. """
         settings = {}
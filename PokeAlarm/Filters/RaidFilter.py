@@ -3,6 +3,7 @@ import operator
 # 3rd Party Imports
 # Local Imports
 from . import BaseFilter
+from .BaseFilter import not_contains
 from PokeAlarm.Utilities import MonUtils as MonUtils
 from PokeAlarm.Utilities import GymUtils as GymUtils
 from PokeAlarm.Utils import get_weather_id
@@ -11,6 +12,8 @@ from PokeAlarm.Utils import get_weather_id
 class RaidFilter(BaseFilter):
     """ Filter class for limiting which egg trigger a notification. """
 
+    index_attribute = 'mon_id'
+
     def __init__(self, mgr, name, data):
         """ Initializes base parameters for a filter. """
         super(RaidFilter, self).__init__(mgr, 'egg', name)
@@ -24,7 +27,7 @@ class RaidFilter(BaseFilter):
         # Exclude Monster ID - f.monster_ids not contains r.ex_mon_id
         self.exclude_mon_ids = self.evaluate_attribute(  #
             event_attribute='mon_id',
-            eval_func=lambda d, v: not operator.contains(d, v),
+            eval_func=not_contains,
             limit=BaseFilter.parse_as_set(
                 MonUtils.get_monster_id, 'monsters_exclude', data))
 
@@ -123,6 +126,13 @@ class RaidFilter(BaseFilter):
             raise ValueError("'{}' is not a recognized parameter for"
                              " Raid filters".format(key))
 
+    def could_match(self, value):
+        """ Returns False if the raid boss is never accepted. """
+        if self.mon_ids is not None and value not in self.mon_ids:
+            return False
+        return self.exclude_mon_ids is None \
+            or value not in self.exclude_mon_ids
+
     def to_dict(self):
         """ Create a dict representation of this Filter. """
         settings = {}
@@ -5,3 +5,5 @@ from GymFilter import GymFilter  # noqa F401
 from EggFilter import EggFilter  # noqa F401
 from RaidFilter import RaidFilter  # noqa F401
 from WeatherFilter import WeatherFilter # noqa F401
+from FilterIndex import FilterIndex  # noqa F401
+from BatchFilter import BatchFilter  # noqa F401
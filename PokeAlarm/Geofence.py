@@ -1,4 +1,6 @@
 # Standard Library Imports
+from bisect import bisect_left
+import math
 import re
 import logging
 import sys
@@ -55,10 +57,17 @@ def load_geofence_file(file_path):
 # Geofence object used to determine if points are in a defined range
 class Geofence(object):
 
+    # States of the cells of a rasterized geofence
+    OUTSIDE, INSIDE, BOUNDARY = 0, 1, 2
+
+    # Upper limit of cells of a rasterized geofence (one byte each)
+    max_raster_cells = 2 ** 20
+
     # Initialize the Geofence from a given name and a list of points.
     def __init__(self, name, points):
         self.__name = name
         self.__points = points
+        self.__raster = None
 
         self.__min_x = points[0][0]
         self.__max_x = points[0][0]
@@ -79,6 +88,14 @@ class Geofence(object):
                 or self.__max_y < y or y < self.__min_y:
             return False
 
+        # Cells that no edge passes through are entirely in or out
+        if self.__raster is not None:
+            cells, height, cell_x, cell_y = self.__raster
+            state = cells[int((x - self.__min_x) // cell_x) * height
+                          + int((y - self.__min_y) // cell_y)]
+            if state != Geofence.BOUNDARY:
+                return state == Geofence.INSIDE
+
         # If it is inside the boundary box, use a raycast
         # from the line and toggle for every edge it hits
         inside = False
@@ -97,3 +114,162 @@ class Geofence(object):
     # Returns the name of this geofence
     def get_name(self):
         return self.__name
+
+    # Returns the boundary box as (min_x, min_y, max_x, max_y)
+    def get_bounds(self):
+        return self.__min_x, self.__min_y, self.__max_x, self.__max_y
+
+    def rasterize(self, size):
+        """ Splits the boundary box into cells of about `size` meters.
+
+        Every cell is marked as inside or outside the polygon, or as a
+        boundary cell if an edge passes through it. `contains` answers
+        points in inside or outside cells with a lookup, and only uses the
+        raycast for boundary cells. Smaller cells mean fewer raycasts but
+        take more memory, which is limited to `max_raster_cells` bytes.
+        """
+        # Convert meters to degrees of latitude (x) and longitude (y)
+        cell_x = size / 111320.0
+        cell_y = cell_x / max(math.cos(math.radians(
+            (self.__min_x + self.__max_x) / 2)), 0.01)
+        width = (self.__max_x - self.__min_x) / cell_x
+        height = (self.__max_y - self.__min_y) / cell_y
+        scale = math.sqrt(
+            (width + 1) * (height + 1) / self.max_raster_cells)
+        if scale > 1:  # Too many cells, so make them bigger
+            cell_x, cell_y = cell_x * scale, cell_y * scale
+        width = int((self.__max_x - self.__min_x) // cell_x) + 1
+        height = int((self.__max_y - self.__min_y) // cell_y) + 1
+        cells = bytearray(width * height)
+        self.__mark_edges(cells, width, height, cell_x, cell_y)
+        self.__fill_cells(cells, width, height, cell_x, cell_y)
+        self.__raster = (cells, height, cell_x, cell_y)
+        log.debug("Geofence %s rasterized into %s cells, %s of them on the "
+                  "boundary.", self.__name, len(cells),
+                  cells.count(chr(Geofence.BOUNDARY)))
+
+    def __mark_edges(self, cells, width, height, cell_x, cell_y):
+        """ Marks every cell an edge passes through as a boundary cell. """
+        # Cells touching an edge are included, to be safe from rounding
+        eps_x, eps_y = cell_x * 1e-6, cell_y * 1e-6
+        n = len(self.__points)
+        for k in range(n):
+            (x1, y1), (x2, y2) = self.__points[k - 1], self.__points[k]
+            if x1 > x2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            first = max(int((x1 - eps_x - self.__min_x) // cell_x), 0)
+            last = min(int((x2 + eps_x - self.__min_x) // cell_x), width - 1)
+            for i in range(first, last + 1):
+                # The part of the edge within this row of cells
+                if x1 == x2:
+                    low, high = min(y1, y2), max(y1, y2)
+                else:
+                    start = max(x1, self.__min_x + i * cell_x)
+                    end = min(x2, self.__min_x + (i + 1) * cell_x)
+                    slope = (y2 - y1) / (x2 - x1)
+                    low = y1 + (start - x1) * slope
+                    high = y1 + (end - x1) * slope
+                    low, high = min(low, high), max(low, high)
+                j1 = max(int((low - eps_y - self.__min_y) // cell_y), 0)
+                j2 = min(
+                    int((high + eps_y - self.__min_y) // cell_y), height - 1)
+                for j in range(j1, j2 + 1):
+                    cells[i * height + j] = Geofence.BOUNDARY
+
+    def __fill_cells(self, cells, width, height, cell_x, cell_y):
+        """ Marks the cells that are not on the boundary as inside or
+        outside, by casting a ray through the centers of each column. """
+        for j in range(height):
+            y = self.__min_y + (j + 0.5) * cell_y
+            # Same edges as the raycast in `contains` would hit
+            crossings = []
+            p1x, p1y = self.__points[-1]
+            for p2x, p2y in self.__points:
+                if min(p1y, p2y) < y <= max(p1y, p2y):
+                    crossings.append(
+                        (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x)
+                p1x, p1y = p2x, p2y
+            crossings.sort()
+            for i in range(width):
+                if cells[i * height + j] == Geofence.BOUNDARY:
+                    continue
+                x = self.__min_x + (i + 0.5) * cell_x
+                hits = len(crossings) - bisect_left(crossings, x)
+                cells[i * height + j] = hits % 2  # INSIDE if odd
+
+    # Returns the number of (outside, inside, boundary) cells
+    def get_raster_stats(self):
+        if self.__raster is None:
+            return 0, 0, 0
+        cells = self.__raster[0]
+        return tuple(cells.count(chr(state)) for state in (
+            Geofence.OUTSIDE, Geofence.INSIDE, Geofence.BOUNDARY))
+
+
+# Grid over the boundary boxes of geofences used to find candidates quickly
+class GeofenceIndex(object):
+    """ Finds the geofences whose boundary box covers a point.
+
+    The area covered by all geofences is split into a uniform grid of
+    square cells, and every cell remembers the geofences whose boundary box
+    overlaps it. A lookup only has to find the cell of the point, so only
+    those geofences have to run their raycast. Candidates are always
+    returned in the configured order of the geofences. Geofences that
+    would cover too many cells are not put in the grid, but are returned
+    as a candidate for every point instead.
+    """
+
+    # Upper limit of cells a single geofence is added to
+    max_cells = 4096
+
+    def __init__(self, geofences, cell_size=None):
+        self._order = dict(
+            (name, i) for i, name in enumerate(geofences.iterkeys()))
+        bounds = dict(
+            (name, gf.get_bounds()) for name, gf in geofences.iteritems())
+        self._cell_size = cell_size or self._default_cell_size(bounds)
+        self._origin = (
+            min([b[0] for b in bounds.itervalues()] or [0.0]),
+            min([b[1] for b in bounds.itervalues()] or [0.0]))
+        self._large = []  # Geofences that are always candidates
+        cells = {}
+        for name in geofences.iterkeys():
+            min_x, min_y, max_x, max_y = bounds[name]
+            x1, y1 = self._get_cell(min_x, min_y)
+            x2, y2 = self._get_cell(max_x, max_y)
+            if (x2 - x1 + 1) * (y2 - y1 + 1) > self.max_cells:
+                self._large.append(name)
+                continue
+            for i in range(x1, x2 + 1):
+                for j in range(y1, y2 + 1):
+                    cells.setdefault((i, j), []).append(name)
+        self._cells = dict((k, tuple(v)) for k, v in cells.iteritems())
+        self._large = tuple(self._large)
+
+    @staticmethod
+    def _default_cell_size(bounds):
+        """ Returns a cell size about half the size of a typical geofence. """
+        sizes = sorted(
+            max(b[2] - b[0], b[3] - b[1]) for b in bounds.itervalues())
+        size = sizes[len(sizes) // 2] / 2 if sizes else 0.0
+        return size if size > 0 else 0.01
+
+    def _get_cell(self, x, y):
+        """ Returns the key of the cell that contains the given point. """
+        return (int((x - self._origin[0]) // self._cell_size),
+                int((y - self._origin[1]) // self._cell_size))
+
+    def get_candidates(self, x, y):
+        """ Returns the names of the geofences whose boundary box could
+        contain the point, in the configured order. """
+        names = self._cells.get(self._get_cell(x, y), ())
+        if not self._large:
+            return names
+        if not names:
+            return self._large
+        return tuple(sorted(names + self._large, key=self._order.get))
+
+    def get_stats(self):
+        """ Returns the cell size, the number of cells and the number of
+        geofences that are not in the grid. """
+        return self._cell_size, len(self._cells), len(self._large)
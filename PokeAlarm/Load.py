@@ -1,6 +1,5 @@
 # Standard Library Imports
 import logging
-import json
 import traceback
 import sys
 from collections import OrderedDict
@@ -8,6 +7,7 @@ from collections import OrderedDict
 # Local Import
 import Utils as utils
 from Utils import require_and_remove_key, parse_boolean
+from PokeAlarm.Utilities import JsonUtils
 
 log = logging.getLogger('pokealarm.setup')
 
@@ -17,7 +17,7 @@ def parse_filters_file(mgr, filename):
         filepath = utils.get_path(filename)
         log.info("Loading Filters from file at {}".format(filepath))
         with open(filepath, 'r') as f:
-            filters_file = json.load(f, object_pairs_hook=OrderedDict)
+            filters_file = JsonUtils.load(f, object_pairs_hook=OrderedDict)
         if type(filters_file) is not OrderedDict:
             log.critical("Filters files must be a JSON object:"
                          " { \"monsters\":{...},... }")
@@ -114,7 +114,7 @@ def parse_alarms_file(manager, filename):
         filepath = utils.get_path(filename)
         log.info("Loading Alarms from file at {}".format(filepath))
         with open(filepath, 'r') as f:
-            alarm_settings = json.load(f, object_pairs_hook=OrderedDict)
+            alarm_settings = JsonUtils.load(f, object_pairs_hook=OrderedDict)
         if type(alarm_settings) is not OrderedDict:
             log.critical("Alarms file must be an object of Alarms objects "
                          + "- { 'alarm1': {...}, ... 'alarm5': {...} }")
@@ -153,7 +153,7 @@ def parse_rules_file(manager, filename):
     try:
         log.info("Loading Rules from file at {}".format(filepath))
         with open(filepath, 'r') as f:
-            rules = json.load(f, object_pairs_hook=OrderedDict)
+            rules = JsonUtils.load(f, object_pairs_hook=OrderedDict)
         if type(rules) is not OrderedDict:
             log.critical("Rules files must be a JSON object:"
                          " { \"monsters\":[...],... }")
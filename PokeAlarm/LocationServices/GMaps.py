@@ -7,11 +7,11 @@ import json
 import traceback
 # 3rd Party Imports
 import requests
-from requests.packages.urllib3.util.retry import Retry
 from gevent.lock import Semaphore
 # Local Imports
 from PokeAlarm import Unknown
 from PokeAlarm.Utilities.GenUtils import synchronize_with
+from PokeAlarm.Utilities.NetUtils import create_session
 
 log = logging.getLogger('Gmaps')
 
@@ -31,7 +31,7 @@ class GMaps(object):
         self._lock = Semaphore
 
         # Create a session to handle connections
-        self._session = self._create_session()
+        self._session = create_session()
 
         # Sliding window for rate limiting
         self._window = collections.deque(maxlen=self._queries_per_second)
@@ -42,36 +42,6 @@ class GMaps(object):
         self._reverse_geocode_hist = {}
         self._dm_hist = {key: dict() for key in self.TRAVEL_MODES}
 
-    # TODO: Move into utilities
-    @staticmethod
-    def _create_session(retry_count=3, pool_size=3, backoff=.25):
-        """ Create a session to use connection pooling. """
-
-        # Create a session for connection pooling and
-        session = requests.Session()
-
-        # Reattempt connection on these statuses
-        status_forcelist = [500, 502, 503, 504]
-
-        # Define a Retry object to handle failures
-        retry_policy = Retry(
-            total=retry_count,
-            backoff_factor=backoff,
-            status_forcelist=status_forcelist
-        )
-
-        # Define an Adapter, to limit pool and implement retry policy
-        adapter = requests.adapters.HTTPAdapter(
-            max_retries=retry_policy,
-            pool_connections=pool_size,
-            pool_maxsize=pool_size
-        )
-
-        # Apply Adapter for all HTTPS (no HTTP for you!)
-        session.mount('https://', adapter)
-
-        return session
-
     def _make_request(self, service, params=None):
         """ Make a request to the GMAPs API. """
         # Rate Limit - All APIs use the same quota
@@ -3,6 +3,7 @@ import logging
 import logging.handlers
 import os
 import re
+import time
 import traceback
 from collections import OrderedDict, namedtuple
 from datetime import datetime, timedelta
@@ -16,11 +17,13 @@ from gevent.event import Event
 import Alarms
 import Filters
 import Events
+from AlarmDispatcher import AlarmDispatcher
 from Cache import cache_factory
-from Geofence import load_geofence_file
+from Geofence import load_geofence_file, GeofenceIndex
 from Locale import Locale
 from LocationServices import GMaps
 from PokeAlarm import Unknown
+from PokeAlarm.Utilities.CacheUtils import LRUCache
 from PokeAlarm.Utilities.Logging import ContextFilter, setup_file_handler
 from PokeAlarm.Utilities.GenUtils import parse_bool
 from Utils import (get_earth_dist, get_path, get_cardinal_dir)
@@ -30,7 +33,8 @@ Rule = namedtuple('Rule', ['filter_names', 'alarm_names'])
 
 class Manager(object):
     def __init__(self, name, google_key, locale, units, timezone, time_limit,
-                 max_attempts, location, cache_type, geofence_file, debug):
+                 max_attempts, location, cache_type, geofence_file, debug,
+                 cache_max_size=100000, cache_ttl=7 * 24 * 60 * 60):
         # Set the name of the Manager
         self.name = str(name).lower()
         self._log = self._create_logger(self.name)
@@ -63,7 +67,8 @@ class Manager(object):
                 "with distance related DTS.")
 
         # Create cache
-        self.__cache = cache_factory(self, cache_type)
+        self.__cache = cache_factory(
+            self, cache_type, cache_max_size, cache_ttl)
 
         # Load and Setup the Pokemon Filters
         self._mons_enabled, self._mon_filters = False, OrderedDict()
@@ -76,10 +81,19 @@ class Manager(object):
 
         # Create the Geofences to filter with from given file
         self.geofences = None
+        self.__geofence_index = None
+        # Geofence results of recent locations, as spawns and gyms recur
+        self.__geofence_cache = LRUCache(max_size=50000, ttl=3600)
+        # Geofence checks that were run, and that were answered from memo
+        self.__geofence_checks, self.__geofence_saved = 0, 0
         if str(geofence_file).lower() != 'none':
-            self.geofences = load_geofence_file(get_path(geofence_file))
+            self.load_geofences(geofence_file)
         # Create the alarms to send notifications out with
         self._alarms = {}
+        # Each alarm sends its notifications in the background
+        self.__dispatchers = {}
+        self.__dts_keys = None  # DTS used by the alarms, None for all
+        self.__alarm_workers, self.__alarm_queue_size = 1, 100
         self._max_attempts = int(max_attempts)  # TODO: Move to alarm level
 
         # Initialize Rules
@@ -89,6 +103,12 @@ class Manager(object):
         self.__egg_rules = {}
         self.__raid_rules = {}
         self.__weather_rules = {}
+        # Filter indexes per kind and rule, built when first needed
+        self.__filter_indexes = {}
+        # Check monsters in batches with NumPy (disabled if 0)
+        self.__batch_size = 0
+        self.__batch_min = 16  # Smaller batches are checked one by one
+        self.__batch_filter = None
 
         # Initialize the queue and start the process
         self.__queue = Queue()
@@ -223,8 +243,35 @@ class Manager(object):
                              "name {} already exists!".format(name))
         f = Filters.MonFilter(self, name, settings)
         self._mon_filters[name] = f
+        self.__filter_indexes.clear()
+        self.__batch_filter = None
         self._log.debug("Monster filter '%s' set: %s", name, f)
 
+    # Check queued monsters in batches (0 to disable)
+    def set_monster_batch_size(self, size):
+        if size > 1 and not Filters.BatchFilter.is_available():
+            raise ValueError("NumPy must be installed to check monsters in "
+                             "batches.")
+        self.__batch_size = size
+        self._log.debug("Monster batch size set to %s", size)
+
+    # Load the Geofences to filter with from the given file
+    def load_geofences(self, geofence_file):
+        self.geofences = load_geofence_file(get_path(geofence_file))
+        self.__geofence_index = GeofenceIndex(self.geofences)
+        self.__geofence_cache.clear()  # Results may have changed
+        self._log.debug(
+            "Geofence grid has cell size %s, %s cells and %s geofences "
+            "outside of the grid.", *self.__geofence_index.get_stats())
+
+    # Rasterize the geofences into cells of the given size in meters
+    def set_geofence_raster(self, size):
+        if self.geofences is None or size <= 0:
+            return
+        for gf in self.geofences.itervalues():
+            gf.rasterize(size)
+        self._log.debug("Geofences rasterized with a cell size of %sm", size)
+
     # Enable/Disable Stops notifications
     def set_stops_enabled(self, boolean):
         self._stops_enabled = parse_bool(boolean)
@@ -273,6 +320,7 @@ class Manager(object):
                              "name {} already exists!".format(name))
         f = Filters.EggFilter(self, name, settings)
         self._egg_filters[name] = f
+        self.__filter_indexes.clear()
         self._log.debug("Egg filter '%s' set: %s", name, f)
 
     # Enable/Disable Stops notifications
@@ -288,6 +336,7 @@ class Manager(object):
                              "name {} already exists!".format(name))
         f = Filters.RaidFilter(self, name, settings)
         self._raid_filters[name] = f
+        self.__filter_indexes.clear()
         self._log.debug("Raid filter '%s' set: %s", name, f)
 
     # Enable/Disable Weather notifications
@@ -317,6 +366,29 @@ class Manager(object):
             self, settings, self._max_attempts, self._google_key)
         self._alarms[name] = alarm
 
+    # Set the number of workers and the queue size of each alarm
+    def set_alarm_dispatch(self, workers, queue_size):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("Alarms need at least one worker and room for "
+                             "one notification in their queue.")
+        self.__alarm_workers = workers
+        self.__alarm_queue_size = queue_size
+        self._log.debug("Alarms use %s worker(s) and queue up to %s "
+                        "notification(s).", workers, queue_size)
+
+    def log_alarm_stats(self):
+        """ Logs the queue and latency metrics of every alarm. """
+        for name, dispatcher in self.__dispatchers.iteritems():
+            stats = dispatcher.get_stats()
+            self._log.debug(
+                "Alarm %s: %s sent, %s failed, %s queued (max %s), "
+                "%.2fs avg wait, %.2fs avg send, blocked %s time(s) for "
+                "%.2fs.", name, stats['sent'], stats['failed'],
+                stats['queued'], stats['max_queued'], stats['avg_wait'],
+                stats['avg_send'], stats['blocked'], stats['blocked_time'])
+            for target, stats in self._alarms[name].get_stats().iteritems():
+                self._log.debug("Alarm %s to %s: %s", name, target, stats)
+
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ RULES API ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -338,6 +410,7 @@ class Manager(object):
                                  "named {}!".format(alarm))
 
         self.__mon_rules[name] = Rule(filters, alarms)
+        self.__filter_indexes.clear()
 
     # Add new Stop Rule
     def add_stop_rule(self, name, filters, alarms):
@@ -392,6 +465,7 @@ class Manager(object):
                                  "named {}!".format(alarm))
 
         self.__egg_rules[name] = Rule(filters, alarms)
+        self.__filter_indexes.clear()
 
     # Add new Raid Rule
     def add_raid_rule(self, name, filters, alarms):
@@ -410,6 +484,7 @@ class Manager(object):
                                  "named {}!".format(alarm))
 
         self.__raid_rules[name] = Rule(filters, alarms)
+        self.__filter_indexes.clear()
 
     # Add new Weather Rule
     def add_weather_rule(self, name, filters, alarms):
@@ -456,14 +531,26 @@ class Manager(object):
             logging.getLogger().setLevel(logging.DEBUG)
 
         # Conect the alarms and send the start up message
-        for alarm in self._alarms.values():
+        for name, alarm in self._alarms.iteritems():
             alarm.connect()
             alarm.startup_message()
+            dispatcher = AlarmDispatcher(
+                name, alarm, self.get_child_logger('alarms'),
+                self.__alarm_workers, self.__alarm_queue_size)
+            dispatcher.start()
+            self.__dispatchers[name] = dispatcher
+
+        # Only generate the DTS that the alarms use
+        self.__dts_keys = frozenset().union(
+            *[alarm.get_dts_keys() for alarm in self._alarms.itervalues()])
+        self._log.debug("Alarms use %s DTS: %s", len(self.__dts_keys),
+                        ", ".join(sorted(self.__dts_keys)))
 
     # Main event handler loop
     def run(self):
         self.setup_in_process()
         last_clean = datetime.utcnow()
+        last_reorder = datetime.utcnow()
         while True:  # Run forever and ever
 
             # Clean out visited every 5 minutes
@@ -472,6 +559,13 @@ class Manager(object):
                 self.__cache.clean_and_save()
                 last_clean = datetime.utcnow()
 
+            # Tune the order of filter checks every minute
+            if datetime.utcnow() - last_reorder > timedelta(minutes=1):
+                self.reorder_filter_checks()
+                self.log_geofence_stats()
+                self.log_alarm_stats()
+                last_reorder = datetime.utcnow()
+
             try:  # Get next object to process
                 event = self.__queue.get(block=True, timeout=5)
             except gevent.queue.Empty:
@@ -482,9 +576,18 @@ class Manager(object):
                 gevent.sleep(0)
                 continue
 
+            # Remove a few expired items from the cache between events
+            self.__cache.clean_expired()
+
             try:
                 kind = type(event)
+                if kind == Events.MonEvent and self.__batch_size > 1:
+                    self.process_monsters(self._get_monster_batch(event))
+                    gevent.sleep(0)
+                    continue
                 self._log.debug("Processing event: %s", event.id)
+                # Events are shared between managers, so never modify them
+                event = Events.EventOverlay(event)
                 if kind == Events.MonEvent:
                     self.process_monster(event)
                 elif kind == Events.StopEvent:
@@ -508,10 +611,40 @@ class Manager(object):
                                 "".format(traceback.format_exc()))
             # Explict context yield
             gevent.sleep(0)
-        # Save cache and exit
+        # Save cache first, in case sending takes longer than join allows
         self.__cache.clean_and_save()
+        # Send the remaining notifications of all alarms at once, so
+        # the whole drain takes about as long as the slowest alarm
+        gevent.joinall([gevent.spawn(dispatcher.stop, timeout=10)
+                        for dispatcher in self.__dispatchers.itervalues()])
+        self.log_alarm_stats()
         raise gevent.GreenletExit()
 
+    def reorder_filter_checks(self):
+        """ Lets every filter run its most selective checks first. """
+        count = 0
+        for filters in (self._mon_filters, self._stop_filters,
+                        self._gym_filters, self._egg_filters,
+                        self._raid_filters, self._weather_filters):
+            for f in filters.itervalues():
+                if f.reorder_checks():
+                    count += 1
+        if count > 0:
+            self._log.debug("Reordered the checks of %s filter(s).", count)
+
+    def log_geofence_stats(self):
+        """ Logs how many geofence checks were saved by memoization. """
+        checks, saved = self.__geofence_checks, self.__geofence_saved
+        if checks + saved > 0:
+            self._log.debug(
+                "Geofences: %s check(s) run, %s check(s) saved (%.1f%%).",
+                checks, saved, 100.0 * saved / (checks + saved))
+            cache = self.__geofence_cache
+            self._log.debug(
+                "Geofence location cache: %s location(s), %.1f%% hit rate, "
+                "about %s KB.", len(cache), 100 * cache.get_hit_rate(),
+                cache.get_memory() // 1024)
+
     # Set the location of the Manager
     def set_location(self, location):
         # Regex for Lat,Lng coordinate
@@ -534,10 +667,20 @@ class Manager(object):
             self._log.info("Location successfully set to '{},{}'.".format(
                 location[0], location[1]))
 
-    def _check_filters(self, event, filter_set, filter_names):
+    def _check_filters(self, event, filter_set, filter_names, index_key=None,
+                       allowed=None):
         """ Function for checking if an event passes any filters. """
+        if index_key is not None:  # Skip filters that can't match
+            index = self.__filter_indexes.get(index_key)
+            if index is None:
+                index = Filters.FilterIndex(filter_set, filter_names)
+                self.__filter_indexes[index_key] = index
+            filter_names = index.get_candidates(event)
         for name in filter_names:
             f = filter_set.get(name)
+            # Skip filters already ruled out by a batch check
+            if f and allowed is not None and name not in allowed:
+                continue
             # Filter should always exist, but sanity check anyway
             if f:
                 # If the Event passes, return True
@@ -550,8 +693,32 @@ class Manager(object):
 
     def _notify_alarms(self, event, alarm_names, func_name):
         """ Function for triggering notifications to alarms. """
+        dts = self._get_dts(event)
+
+        # Hand notifications to the alarms, which send them in the background
+        for name in alarm_names:
+            dispatcher = self.__dispatchers.get(name)
+            if not dispatcher:
+                self._log.critical("ERROR: No alarm named %s found!", name)
+                continue
+            dispatcher.dispatch(func_name, dts)
+
+    def _get_dts(self, event):
+        """ Returns the DTS for the event. Only the geofence and custom DTS
+        can differ between the rules an event passes, so the DTS are kept
+        on the event and reused by rules where those are the same. """
+        try:
+            memo = event.dts_memo
+        except AttributeError:
+            memo = event.dts_memo = {}
+        key = (event.geofence, id(event.custom_dts))
+        dts = memo.get(key)
+        if dts is not None:
+            return dts
+
         # Generate the DTS for the event
-        dts = event.generate_dts(self.__locale, self.__timezone, self.__units)
+        dts = Alarms.DtsDict(event.generate_dts(
+            self.__locale, self.__timezone, self.__units, self.__dts_keys))
 
         # Get GMaps Triggers
         if self._gmaps_reverse_geocode:
@@ -561,30 +728,60 @@ class Manager(object):
             dts.update(self._gmaps_service.distance_matrix(
                 mode, (event.lat, event.lng), self.__location,
                 self._language, self.__units))
-
-        # Spawn notifications in threads so they can work asynchronously
-        threads = []
-        for name in alarm_names:
-            alarm = self._alarms.get(name)
-            if not alarm:
-                self._log.critical("ERROR: No alarm named %s found!", name)
-                continue
-            func = getattr(alarm, func_name)
-            threads.append(gevent.spawn(func, dts))
-
-        for thread in threads:  # Wait for all alarms to finish
-            thread.join()
+        memo[key] = dts
+        return dts
 
     # Process new Monster data and decide if a notification needs to be sent
     def process_monster(self, mon):
         # type: (Events.MonEvent) -> None
         """ Process a monster event and notify alarms if it passes. """
+        if self._prepare_monster(mon):
+            self._match_monster(mon)
+
+    def process_monsters(self, mons):
+        # type: (list) -> None
+        """ Process a batch of monster events. The range checks of all
+        monster filters are done for the whole batch at once. """
+        ready = []
+        for mon in mons:
+            self._log.debug("Processing event: %s", mon.id)
+            # Events are shared between managers, so never modify them
+            mon = Events.EventOverlay(mon)
+            if self._prepare_monster(mon):
+                ready.append(mon)
+        if len(ready) < self.__batch_min:  # Not worth the overhead
+            allowed = [None] * len(ready)
+        else:
+            if self.__batch_filter is None:
+                self.__batch_filter = Filters.BatchFilter(self._mon_filters)
+                self._log.debug("Created batch filter for %s monster "
+                                "filters.", len(self._mon_filters))
+            allowed = self.__batch_filter.check(ready)
+        for mon, names in zip(ready, allowed):
+            self._match_monster(mon, names)
+            self._log.debug("Finished event: %s", mon.id)
+
+    def _get_monster_batch(self, mon):
+        """ Returns the monster and any monsters queued right after it. """
+        batch = [mon]
+        while len(batch) < self.__batch_size:
+            try:
+                if type(self.__queue.peek(block=False)) != Events.MonEvent:
+                    break
+            except gevent.queue.Empty:
+                break
+            batch.append(self.__queue.get_nowait())
+        return batch
+
+    def _prepare_monster(self, mon):
+        """ Updates a monster for this manager and returns True if it
+        should be checked against the filters. """
 
         # Make sure that monsters are enabled
         if self._mons_enabled is False:
             self._log.debug("Monster ignored: monster notifications "
                             "are disabled.")
-            return
+            return False
 
         # Set the name for this event so we can log rejects better
         mon.name = self.__locale.get_pokemon_name(mon.monster_id)
@@ -593,16 +790,15 @@ class Manager(object):
         if self.__cache.monster_expiration(mon.enc_id) is not None:
             self._log.debug("{} monster was skipped because it was "
                             "previously processed.".format(mon.name))
-            return
+            return False
         self.__cache.monster_expiration(mon.enc_id, mon.disappear_time)
 
         # Check the time remaining
-        seconds_left = (mon.disappear_time
-                        - datetime.utcnow()).total_seconds()
+        seconds_left = mon.disappear_time - time.time()
         if seconds_left < self.__time_limit:
             self._log.debug("{} monster was skipped because only {} seconds "
                             "remained".format(mon.name, seconds_left))
-            return
+            return False
 
         # Calculate distance and direction
         if self.__location is not None:
@@ -610,6 +806,11 @@ class Manager(object):
                 [mon.lat, mon.lng], self.__location, self.__units)
             mon.direction = get_cardinal_dir(
                 [mon.lat, mon.lng], self.__location)
+        return True
+
+    def _match_monster(self, mon, allowed=None):
+        """ Checks a monster against the rules and notifies the alarms.
+        If given, only filters named in `allowed` are checked. """
 
         # Check for Rules
         rules = self.__mon_rules
@@ -620,7 +821,8 @@ class Manager(object):
         rule_ct, alarm_ct = 0, 0
         for r_name, rule in rules.iteritems():  # For all rules
             passed = self._check_filters(
-                mon, self._mon_filters, rule.filter_names)
+                mon, self._mon_filters, rule.filter_names, ('mon', r_name),
+                allowed)
             if passed:
                 rule_ct += 1
                 alarm_ct += len(rule.alarm_names)
@@ -656,7 +858,7 @@ class Manager(object):
         self.__cache.stop_expiration(stop.stop_id, stop.expiration)
 
         # Check the time remaining
-        seconds_left = (stop.expiration - datetime.utcnow()).total_seconds()
+        seconds_left = stop.expiration - time.time()
         if seconds_left < self.__time_limit:
             self._log.debug("Stop {} was skipped because only {} seconds "
                             "remained".format(stop.name, seconds_left))
@@ -779,7 +981,7 @@ class Manager(object):
         self.__cache.egg_expiration(egg.gym_id, egg.hatch_time)
 
         # Check the time remaining
-        seconds_left = (egg.hatch_time - datetime.utcnow()).total_seconds()
+        seconds_left = egg.hatch_time - time.time()
         if seconds_left < self.__time_limit:
             self._log.debug("Egg {} was skipped because only {} seconds "
                             "remained".format(egg.name, seconds_left))
@@ -801,7 +1003,7 @@ class Manager(object):
         rule_ct, alarm_ct = 0, 0
         for r_name, rule in rules.iteritems():  # For all rules
             passed = self._check_filters(
-                egg, self._egg_filters, rule.filter_names)
+                egg, self._egg_filters, rule.filter_names, ('egg', r_name))
             if passed:
                 rule_ct += 1
                 alarm_ct += len(rule.alarm_names)
@@ -842,7 +1044,7 @@ class Manager(object):
         self.__cache.raid_expiration(raid.gym_id, raid.raid_end)
 
         # Check the time remaining
-        seconds_left = (raid.raid_end - datetime.utcnow()).total_seconds()
+        seconds_left = raid.raid_end - time.time()
         if seconds_left < self.__time_limit:
             self._log.debug("Raid {} was skipped because only {} seconds "
                             "remained".format(raid.name, seconds_left))
@@ -864,7 +1066,7 @@ class Manager(object):
         rule_ct, alarm_ct = 0, 0
         for r_name, rule in rules.iteritems():  # For all rules
             passed = self._check_filters(
-                raid, self._raid_filters, rule.filter_names)
+                raid, self._raid_filters, rule.filter_names, ('raid', r_name))
             if passed:
                 rule_ct += 1
                 alarm_ct += len(rule.alarm_names)
@@ -952,15 +1154,28 @@ class Manager(object):
         """ Returns true if the event passes the filter's geofences. """
         if self.geofences is None or f.geofences is None:  # No geofences set
             return True
+        # Only geofences with a boundary box around e need a raycast
+        candidates = self.__geofence_index.get_candidates(e.lat, e.lng)
+        # Results are kept on the event, for the other filters and rules,
+        # and shared with later events at the same location
+        try:
+            memo = e.geofence_memo
+        except AttributeError:
+            key = (round(e.lat, 6), round(e.lng, 6))
+            memo = self.__geofence_cache.get(key)
+            if memo is None:
+                memo = {}
+                self.__geofence_cache.put(key, memo)
+            e.geofence_memo = memo
         targets = f.geofences
         if len(targets) == 1 and "all" in targets:
-            targets = self.geofences.iterkeys()
+            targets = candidates
         for name in targets:
             gf = self.geofences.get(name)
             if not gf:  # gf doesn't exist
                 self._log.error("Cannot check geofence %s: "
                                 "does not exist!", name)
-            elif gf.contains(e.lat, e.lng):  # e in gf
+            elif name in candidates and self._in_geofence(gf, e, memo):
                 self._log.debug("{} is in geofence {}!".format(
                     e.name, gf.get_name()))
                 e.geofence = name  # Set the geofence for dts
@@ -970,4 +1185,15 @@ class Manager(object):
         self._log.debug("%s rejected from filter by geofences.", e.name)
         return False
 
+    def _in_geofence(self, gf, e, memo):
+        """ Returns true if e is in gf, remembering the result in memo. """
+        name = gf.get_name()
+        inside = memo.get(name)
+        if inside is None:
+            inside = memo[name] = gf.contains(e.lat, e.lng)
+            self.__geofence_checks += 1
+        else:
+            self.__geofence_saved += 1
+        return inside
+
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,156 @@
+# Standard Library Imports
+import logging
+import multiprocessing
+import os
+import signal
+import time
+# 3rd Party Imports
+import gevent
+from gevent.queue import Queue
+# Local Imports
+from PokeAlarm.Utilities.Logging import PipeHandler
+from PokeAlarm.Utilities.PipeUtils import send_object, recv_object
+
+
+class ManagerProcess(object):
+    """ Runs a Manager in a separate OS process.
+
+    The main process keeps this object in place of the Manager. Events
+    passed to `update` are batched and sent to the child process over a
+    pipe, where they are handed to the Manager's own queue. Log records of
+    the child are sent back over a second pipe and handled by the loggers
+    of the main process, so that only one process writes to each log file.
+    """
+
+    # Maximum number of events sent to the child at once
+    _max_batch = 500
+    # Managers started from this process, in the order they were started
+    _started = []
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._log = mgr.get_child_logger('process')
+
+        self._queue = Queue()
+        self._conn = None  # Write end of the pipe to the child
+        self._log_conn = None  # Read end of the pipe from the child
+        self._process = None
+        self._sender = None
+        self._log_receiver = None
+
+    def get_name(self):
+        return self._mgr.get_name()
+
+    def update(self, obj):
+        self._queue.put(obj)
+
+    def start(self):
+        reader, self._conn = multiprocessing.Pipe(duplex=False)
+        self._log_conn, log_writer = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=self._run, args=(reader, log_writer),
+            name="PokeAlarm-{}".format(self.get_name()))
+        self._process.start()
+        # Only the child reads events and writes log records
+        reader.close()
+        log_writer.close()
+        ManagerProcess._started.append(self)
+        self._sender = gevent.spawn(self._send_events)
+        self._log_receiver = gevent.spawn(self._receive_logs)
+        self._log.info("Manager %s started in process %s.",
+                       self.get_name(), self._process.pid)
+
+    def stop(self):
+        self._log.debug("Sending %s queued items to manager %s before "
+                        "stopping.", self._queue.qsize(), self.get_name())
+        self._queue.put(None)  # Tell the sender to finish up
+
+    def join(self):
+        self._sender.join(timeout=20)
+        # Wait without blocking, as the child may be waiting for its log
+        # records to be read
+        deadline = time.time() + 30
+        while self._process.is_alive() and time.time() < deadline:
+            gevent.sleep(0.1)
+        if self._process.is_alive():
+            self._log.warning("Manager {} could not be stopped in time! "
+                              "Forcing process to stop."
+                              "".format(self.get_name()))
+            os.kill(self._process.pid, signal.SIGKILL)  # Ignores SIGTERM
+            self._process.join(timeout=5)
+        else:
+            self._log_receiver.join(timeout=5)  # Last records of the child
+            self._log.info(
+                "Manager {} successfully stopped!".format(self.get_name()))
+
+    def _send_events(self):
+        """ Forward queued events to the child in batches. """
+        running = True
+        while running:
+            batch = [self._queue.get(block=True)]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch[-1] is None:  # Stop was requested
+                batch.pop()
+                running = False
+            try:
+                if batch:
+                    send_object(self._conn, batch)
+                if not running:
+                    send_object(self._conn, None)
+            except (IOError, OSError) as e:
+                self._log.error("Unable to send events to manager %s: "
+                                "%s: %s", self.get_name(), type(e).__name__, e)
+                running = False
+        self._conn.close()
+
+    def _receive_logs(self):
+        """ Handle the log records of the child until it exits. """
+        while True:
+            try:
+                record = recv_object(self._log_conn)
+            except (EOFError, IOError, OSError):
+                break
+            logging.getLogger(record.name).handle(record)
+        self._log_conn.close()
+
+    def _run(self, reader, log_writer):
+        """ Entry point of the child process. """
+        # Needed if the process was not forked by gevent's os.fork
+        gevent.reinit()
+        # The main process coordinates shutdown through the pipe, also when
+        # the signal was sent to the whole process group
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        # Close what this process inherited from managers started before,
+        # so their children see the pipes close when the main process exits
+        for other in ManagerProcess._started:
+            other._conn.close()
+            other._log_conn.close()
+            gevent.killall([other._sender, other._log_receiver], block=False)
+        self._conn.close()
+        self._log_conn.close()
+        # Leave the log files to the main process
+        loggers = [logging.getLogger()] + [
+            logger for logger in logging.Logger.manager.loggerDict.values()
+            if isinstance(logger, logging.Logger)]
+        for logger in loggers:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        logging.getLogger().addHandler(PipeHandler(log_writer))
+
+        self._mgr.start()
+        while True:
+            try:
+                batch = recv_object(reader)
+            except (EOFError, IOError, OSError):
+                self._log.error("Lost connection to the main process.")
+                break
+            if batch is None:  # Main process asked us to stop
+                break
+            for obj in batch:
+                self._mgr.update(obj)
+        reader.close()
+        self._mgr.stop()
+        self._mgr.join()
@@ -0,0 +1,148 @@
+# Standard Library Imports
+from collections import OrderedDict
+import heapq
+import sys
+import time
+# 3rd Party Imports
+# Local Imports
+
+
+class LRUCache(object):
+    """ Dict-like cache that holds up to `max_size` entries.
+
+    When full, the least recently used entry is dropped to make room. If a
+    `ttl` (in seconds) is given, entries also expire that long after they
+    were put in the cache. Hits and misses are counted for `get_stats`.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expiration)
+        self._hits, self._misses = 0, 0
+        self._evicted, self._expired = 0, 0
+
+    def get(self, key, default=None):
+        """ Returns the value of key, or default if missing or expired. """
+        try:
+            value, expiration = self._data.pop(key)
+        except KeyError:
+            self._misses += 1
+            return default
+        if expiration is not None and expiration < time.time():
+            self._misses += 1
+            self._expired += 1
+            return default
+        self._data[key] = (value, expiration)  # Now the most recently used
+        self._hits += 1
+        return value
+
+    def put(self, key, value):
+        """ Adds or replaces the value of key. """
+        self._data.pop(key, None)
+        expiration = None if self._ttl is None else time.time() + self._ttl
+        self._data[key] = (value, expiration)
+        self._trim()
+
+    def _trim(self):
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self._evicted += 1
+
+    def clean(self):
+        """ Removes the expired entries and returns how many there were. """
+        now = time.time()
+        old = [key for key, (_, expiration) in self._data.iteritems()
+               if expiration is not None and expiration < now]
+        for key in old:
+            del self._data[key]
+        self._expired += len(old)
+        return len(old)
+
+    def clear(self):
+        """ Removes all entries. """
+        self._data.clear()
+
+    def items(self):
+        """ Returns a list of (key, value) of the entries that have not
+        expired, from least to most recently used. """
+        now = time.time()
+        return [(key, value)
+                for key, (value, expiration) in self._data.iteritems()
+                if expiration is None or expiration >= now]
+
+    def get_stats(self):
+        """ Returns the number of (hits, misses, entries). """
+        return self._hits, self._misses, len(self._data)
+
+    def get_evictions(self):
+        """ Returns the number of entries (evicted, expired) so far. Evicted
+        entries were dropped to make room for new ones. """
+        return self._evicted, self._expired
+
+    def get_hit_rate(self):
+        """ Returns the share of lookups that were hits, from 0 to 1. """
+        total = self._hits + self._misses
+        return float(self._hits) / total if total else 0.0
+
+    def get_memory(self):
+        """ Returns an estimate of the bytes used by the cache, counting the
+        keys and values but not objects they refer to. """
+        size = sys.getsizeof(self._data)
+        for key, entry in self._data.iteritems():
+            size += (sys.getsizeof(key) + sys.getsizeof(entry)
+                     + sys.getsizeof(entry[0]))
+        return size
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ExpiryDict(object):
+    """ Maps keys to their expiration, and removes them once expired.
+
+    Expirations are also kept in a heap, so finding the expired keys only
+    touches those keys instead of every one. The heap may hold outdated
+    expirations of keys that were updated, these are skipped and the heap
+    is rebuilt when they make up most of it.
+    """
+
+    def __init__(self, data=None):
+        self._data = dict(data or {})
+        self._heap = []
+        self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(exp, key) for key, exp in self._data.iteritems()]
+        heapq.heapify(self._heap)
+
+    def get(self, key, default=None):
+        """ Returns the expiration of key, or default if missing. """
+        return self._data.get(key, default)
+
+    def set(self, key, expiration):
+        """ Sets the expiration of key. """
+        self._data[key] = expiration
+        heapq.heappush(self._heap, (expiration, key))
+        if len(self._heap) > 2 * len(self._data) + 100:
+            self._rebuild()
+
+    def remove_expired(self, now, limit=None):
+        """ Removes up to limit (or all) keys that expired before now, and
+        returns how many were removed. """
+        heap, data = self._heap, self._data
+        removed = 0
+        while heap and heap[0][0] < now and (
+                limit is None or removed < limit):
+            expiration, key = heapq.heappop(heap)
+            if data.get(key) == expiration:  # Skip outdated expirations
+                del data[key]
+                removed += 1
+        return removed
+
+    def as_dict(self):
+        """ Returns the dict of keys to expirations. Don't modify it. """
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
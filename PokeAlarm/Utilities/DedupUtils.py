@@ -0,0 +1,104 @@
+# Standard Library Imports
+from collections import defaultdict
+import time
+# 3rd Party Imports
+# Local Imports
+
+
+def get_dedup_key(data):
+    """ Returns a (kind, key, expiration) tuple for a raw webhook frame.
+
+    Frames with the same key describe the same spawn, lure or raid, and
+    can be dropped until the expiration (in epoch seconds). The keys of
+    raids and eggs include the gym details, as the managers cache those
+    from every frame. Returns None for frames that must always be
+    processed, such as gym or weather updates, or frames that are missing
+    the needed fields.
+    """
+    try:
+        kind = data['type']
+        message = data['message']
+        details = ()
+        if kind == 'pokemon':
+            ident = message['encounter_id']
+            expiration = message['disappear_time']
+        elif kind == 'pokestop':
+            ident = message['pokestop_id']
+            expiration = message.get('lure_expiration')
+        elif kind == 'raid':
+            ident = message['gym_id']
+            if message.get('pokemon_id'):
+                expiration = message.get('end') or message.get('raid_end')
+            else:  # Same rule as the event factory, RM sends None for eggs
+                kind = 'egg'
+                expiration = (message.get('start')
+                              or message.get('raid_begin'))
+            details = (message.get('name'), message.get('description'),
+                       message.get('url'))
+        else:
+            return None
+        if ident is None or expiration is None:
+            return None
+        return kind, (kind, ident, expiration) + details, float(expiration)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+class SeenFrames(object):
+    """ A TTL-bounded set of recently seen webhook frames.
+
+    Used by the webhook distributor to drop frames that scanners resend,
+    before any Event is built or handed to the managers. Frames are only
+    remembered once they are marked as seen, so a copy that could not be
+    turned into an Event does not cause later copies to be dropped.
+    """
+
+    # Keep no key longer than this, in case of bogus expiration times
+    max_ttl = 3 * 60 * 60
+    # Seconds between removal of expired keys
+    clean_interval = 60
+
+    def __init__(self):
+        self._expirations = {}
+        self._next_clean = time.time() + self.clean_interval
+        self._duplicates = defaultdict(int)
+        self._unique = defaultdict(int)
+
+    def __len__(self):
+        return len(self._expirations)
+
+    def is_duplicate(self, data):
+        """ Returns True if an identical frame was marked as seen. """
+        now = time.time()
+        if now > self._next_clean:
+            self.clean(now)
+        info = get_dedup_key(data)
+        if info is None:
+            return False
+        kind, key, _ = info
+        if self._expirations.get(key, 0) > now:
+            self._duplicates[kind] += 1
+            return True
+        return False
+
+    def mark_seen(self, data):
+        """ Remembers the frame, so identical frames are duplicates. """
+        info = get_dedup_key(data)
+        if info is None:
+            return
+        kind, key, expiration = info
+        self._expirations[key] = min(expiration, time.time() + self.max_ttl)
+        self._unique[kind] += 1
+
+    def clean(self, now=None):
+        """ Forgets all frames that have expired. """
+        now = time.time() if now is None else now
+        self._expirations = {k: exp for k, exp in self._expirations.iteritems()
+                             if exp > now}
+        self._next_clean = now + self.clean_interval
+
+    def get_stats(self):
+        """ Returns a dict of kind -> (unique, duplicate) frame counts. """
+        kinds = set(self._unique) | set(self._duplicates)
+        return {kind: (self._unique[kind], self._duplicates[kind])
+                for kind in kinds}
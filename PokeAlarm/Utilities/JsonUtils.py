@@ -0,0 +1,78 @@
+# Standard Library Imports
+from collections import OrderedDict
+import json
+import logging
+# 3rd Party Imports
+# Local Imports
+
+log = logging.getLogger('JsonUtils')
+
+
+def _find_decoders():
+    """ Returns an ordered dict of the available decoders, fastest first. """
+    decoders = OrderedDict()
+    try:
+        import orjson
+        decoders['orjson'] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+        decoders['ujson'] = ujson.loads
+    except ImportError:
+        pass
+    try:
+        import simplejson
+        # Without the C speedups simplejson is slower than the stdlib
+        if simplejson._import_c_make_scanner() is not None:
+            decoders['simplejson'] = simplejson.loads
+    except (ImportError, AttributeError):
+        pass
+    decoders['json'] = json.loads
+    return decoders
+
+
+_decoders = _find_decoders()
+_decoder_name = next(iter(_decoders))
+_decode = _decoders[_decoder_name]
+
+# Only the stdlib compatible decoders support object_pairs_hook
+_hooked_decode = _decoders.get('simplejson', json.loads)
+
+
+def available_decoders():
+    """ Returns a dict of name -> loads for all installed decoders. """
+    return _decoders.copy()
+
+
+def get_decoder_name():
+    """ Returns the name of the decoder currently in use. """
+    return _decoder_name
+
+
+def set_decoder(name):
+    """ Select the decoder to use, or 'auto' for the fastest available. """
+    global _decoder_name, _decode
+    if name == 'auto':
+        name = next(iter(_decoders))
+    if name not in _decoders:
+        raise ValueError("JSON decoder '{}' is not installed. Available "
+                         "decoders: {}".format(name, _decoders.keys()))
+    _decoder_name, _decode = name, _decoders[name]
+    log.debug("JSON decoder set to %s.", name)
+
+
+def loads(s, object_pairs_hook=None):
+    """ Decodes a JSON document using the selected decoder.
+
+    Accelerated decoders do not support `object_pairs_hook`, so decoding
+    with a hook falls back to a stdlib compatible decoder.
+    """
+    if object_pairs_hook is None:
+        return _decode(s)
+    return _hooked_decode(s, object_pairs_hook=object_pairs_hook)
+
+
+def load(fp, object_pairs_hook=None):
+    """ Decodes a JSON document from a file object. """
+    return loads(fp.read(), object_pairs_hook)
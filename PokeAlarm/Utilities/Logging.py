@@ -4,8 +4,10 @@ import logging.handlers
 import os
 import sys
 # 3rd Party Imports
+from gevent.lock import Semaphore
 # Local Imports
 from PokeAlarm.Utils import get_path
+from PokeAlarm.Utilities.PipeUtils import send_object
 
 FORMAT = '%(asctime)s [%(levelname)5.5s]' \
          '[%(parent)10.10s][%(child)10.10s] %(message)s'
@@ -71,3 +73,31 @@ def setup_file_handler(logger, path, max_size=100, backup_ct=5):
     handler.addFilter(ContextFilter())
     # Attach it to the logger
     logger.addHandler(handler)
+
+
+class PipeHandler(logging.Handler):
+    """ Handler to send records to another process through a pipe. """
+
+    def __init__(self, conn):
+        super(PipeHandler, self).__init__()
+        self._conn = conn
+        # Records are sent in chunks, which other greenlets must not split
+        self._send_lock = Semaphore()
+
+    def emit(self, record):
+        try:
+            # Arguments and tracebacks may not be picklable, so send the
+            # text instead
+            if record.exc_info:
+                record.exc_text = FORMATTER.formatException(record.exc_info)
+                record.exc_info = None
+            record.msg = record.getMessage()
+            record.args = None
+            with self._send_lock:
+                send_object(self._conn, record)
+        except (IOError, OSError):
+            # The other process has exited, so write to stderr instead
+            ContextFilter().filter(record)
+            sys.stderr.write(FORMATTER.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,35 @@
+# Standard Library Imports
+# 3rd Party Imports
+import requests
+from requests.packages.urllib3.util.retry import Retry
+# Local Imports
+
+
+def create_session(retry_count=3, pool_size=3, backoff=.25):
+    """ Create a session to use connection pooling. """
+
+    # Create a session for connection pooling and
+    session = requests.Session()
+
+    # Reattempt connection on these statuses
+    status_forcelist = [500, 502, 503, 504]
+
+    # Define a Retry object to handle failures
+    retry_policy = Retry(
+        total=retry_count,
+        backoff_factor=backoff,
+        status_forcelist=status_forcelist
+    )
+
+    # Define an Adapter, to limit pool and implement retry policy
+    adapter = requests.adapters.HTTPAdapter(
+        max_retries=retry_policy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+
+    # Apply Adapter for all HTTP and HTTPS connections
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
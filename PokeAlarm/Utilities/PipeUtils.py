@@ -0,0 +1,33 @@
+# Standard Library Imports
+import pickle
+import select
+# 3rd Party Imports
+from gevent.socket import wait_read, wait_write
+# Local Imports
+
+# Objects are written in chunks of at most PIPE_BUF bytes, including the 4
+# byte header, as these are written at once when there is room
+CHUNK_SIZE = select.PIPE_BUF - 4
+
+
+def send_object(conn, obj):
+    """ Writes an object to a multiprocessing connection without blocking
+    the other greenlets, even if it is larger than the pipe's buffer. """
+    data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    for offset in range(0, len(data), CHUNK_SIZE):
+        wait_write(conn.fileno())
+        conn.send_bytes(data, offset, min(CHUNK_SIZE, len(data) - offset))
+    wait_write(conn.fileno())
+    conn.send_bytes('')  # End of the object
+
+
+def recv_object(conn):
+    """ Reads an object written by `send_object`. Raises EOFError once the
+    other end is closed. """
+    chunks = []
+    while True:
+        wait_read(conn.fileno())
+        chunk = conn.recv_bytes()
+        if not chunk:
+            return pickle.loads(''.join(chunks))
+        chunks.append(chunk)
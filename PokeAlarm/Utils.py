@@ -7,6 +7,7 @@ import logging
 from math import radians, sin, cos, atan2, sqrt, degrees
 import os
 import sys
+import time
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import not_so_secret_url
@@ -462,11 +463,12 @@ def get_earth_dist(pt_a, pt_b=None, units='imperial'):
     return dist
 
 
-# Return the time as a string in different formats
+# Return the time (epoch seconds or UTC datetime) as strings in different
+# formats
 def get_time_as_str(t, timezone=None):
     if timezone is None:
         timezone = config.get("TIMEZONE")
-    s = (t - datetime.utcnow()).total_seconds()
+    s = get_seconds_remaining(t)
     (m, s) = divmod(s, 60)
     (h, m) = divmod(m, 60)
     d = timedelta(hours=h, minutes=m, seconds=s)
@@ -484,12 +486,11 @@ def get_time_as_str(t, timezone=None):
     return time_left, time_12, time_24
 
 
-# Return the time in seconds
+# Return the seconds remaining until a time (epoch seconds or UTC datetime)
 def get_seconds_remaining(t, timezone=None):
-    if timezone is None:
-        timezone = config.get("TIMEZONE")
-    seconds = (t - datetime.utcnow()).total_seconds()
-    return seconds
+    if isinstance(t, datetime):
+        return (t - datetime.utcnow()).total_seconds()
+    return t - time.time()
 
 
 # Return the default url for images and stuff
@@ -9,9 +9,9 @@ monkey.patch_all()
 
 # Standard Library Imports
 import logging
-import json
 import os
 import sys
+import time
 # 3rd Party Imports
 import configargparse
 from gevent import wsgi, spawn, signal, pool, queue
@@ -20,9 +20,12 @@ import pytz
 # Local Imports
 import PokeAlarm.Events as Events
 from PokeAlarm import config
+from PokeAlarm.Utilities import JsonUtils
+from PokeAlarm.Utilities.DedupUtils import SeenFrames
 from PokeAlarm.Utilities.Logging import setup_std_handler, setup_file_handler
 from PokeAlarm.Cache import cache_options
 from PokeAlarm.Manager import Manager
+from PokeAlarm.ManagerProcess import ManagerProcess
 from PokeAlarm.Utils import get_path, parse_unicode, parse_boolean
 from PokeAlarm.Load import parse_rules_file, parse_filters_file, \
     parse_alarms_file
@@ -37,6 +40,7 @@ log = logging.getLogger('pokealarm.webserver')
 # Global Variables
 app = Flask(__name__)
 data_queue = queue.Queue()
+seen_frames = SeenFrames()
 managers = {}
 server = None
 
@@ -49,15 +53,16 @@ def index():
 @app.route('/', methods=['POST'])
 def accept_webhook():
     try:
-        data = json.loads(request.data)
-        count = 1
+        start = time.time()
+        data = JsonUtils.loads(request.data)
+        parsed = time.time()
         if type(data) == dict:  # older webhook style
-            data_queue.put(data)
-        else:   # For data set in frame
-            count = len(data)
-            for frame in data:
-                data_queue.put(frame)
-        log.debug("Received %s event(s) from %s.", count, request.remote_addr)
+            data = [data]
+        # Hand the entire frame to the distributor as a single batch
+        data_queue.put(data)
+        log.debug("Received %s event(s) from %s (parsed in %.2fms, "
+                  "enqueued in %.2fms).", len(data), request.remote_addr,
+                  (parsed - start) * 1000, (time.time() - parsed) * 1000)
     except Exception as e:
         log.error("Encountered error while receiving webhook from %s: "
                   "(%s: %s)", request.remote_addr, type(e).__name__, e.message)
@@ -73,19 +78,33 @@ def manage_webhook_data(_queue):
         # Check queue length periodically
         if (datetime.utcnow() - warning_limit) > timedelta(seconds=30):
             warning_limit = datetime.utcnow()
-            size = _queue.qsize()
+            size = sum(len(batch) for batch in _queue.queue)
             if size > 2000:
                 log.warning("Queue length at %s! This may be causing a"
                             "significant delay in notifications.", size)
-        # Distribute events to the other managers
-        data = _queue.get(block=True)
-        obj = Events.event_factory(data)
-        if obj is None:  # TODO: Improve Event error checking
-            continue
-        for name, mgr in managers.iteritems():
-            mgr.update(obj)
-        log.debug("Distributed event %s to %s managers.",
-                  obj.id, len(managers))
+            log.debug("Duplicate frames dropped: %s (%s frames remembered).",
+                      ", ".join("{} {}/{}".format(kind, dup, uniq + dup)
+                                for kind, (uniq, dup)
+                                in sorted(seen_frames.get_stats().items())),
+                      len(seen_frames))
+        # Distribute a batch of events to the other managers
+        batch = _queue.get(block=True)
+        start = time.time()
+        count = 0
+        for data in batch:
+            # Drop frames that were already sent to the managers
+            if seen_frames.is_duplicate(data):
+                continue
+            obj = Events.event_factory(data)
+            if obj is None:  # TODO: Improve Event error checking
+                continue
+            seen_frames.mark_seen(data)
+            for name, mgr in managers.iteritems():
+                mgr.update(obj)
+            count += 1
+        log.debug("Distributed %s of %s event(s) to %s managers in %.2fms.",
+                  count, len(batch), len(managers),
+                  (time.time() - start) * 1000)
 
 
 # Configure and run PokeAlarm
@@ -131,6 +150,11 @@ def parse_settings(root_path):
     parser.add_argument(
         '-C', '--concurrency', type=int,
         help='Maximum concurrent connections for the webserver.', default=200)
+    parser.add_argument(
+        '-jd', '--json-decoder', type=str, default='auto',
+        choices=['auto', 'orjson', 'ujson', 'simplejson', 'json'],
+        help='JSON decoder used for webhooks. Default picks the fastest '
+             'installed decoder.')
 
     parser.add_argument(
         '-d', '--debug', action='store_true', default=False,
@@ -159,6 +183,36 @@ def parse_settings(root_path):
         '-M', '--manager_name', type=parse_unicode,
         action='append', default=[],
         help='Names of Manager processes to start.')
+    parser.add_argument(
+        '-mm', '--manager-mode', type=str, default='greenlet',
+        choices=['greenlet', 'process'],
+        help='Run Managers as greenlets in this process, or each in its '
+             'own process to use more than one CPU core.')
+    parser.add_argument(
+        '-mbs', '--mon-batch-size', type=int, default=0,
+        help='Check up to this many queued monsters at once using NumPy. '
+             'Default: 0 (disabled)')
+    parser.add_argument(
+        '-gr', '--geofence-raster', type=float, default=0,
+        help='Rasterize geofences into cells of this many meters, so that '
+             'most points are looked up instead of raycast. Smaller cells '
+             'use more memory. Default: 0 (disabled)')
+    parser.add_argument(
+        '-aw', '--alarm-workers', type=int, default=1,
+        help='Number of notifications each alarm sends at the same time. '
+             'Default: 1')
+    parser.add_argument(
+        '-aqs', '--alarm-queue-size', type=int, default=100,
+        help='Number of notifications each alarm can queue before the '
+             'Manager waits for them to be sent. Default: 100')
+    parser.add_argument(
+        '-cms', '--cache-max-size', type=int, default=100000,
+        help='Number of gyms and of weather cells each cache keeps. The '
+             'least recently updated are dropped first. Default: 100000')
+    parser.add_argument(
+        '-cttl', '--cache-ttl', type=float, default=168,
+        help='Hours that gyms and weather cells are cached after their '
+             'last update. Default: 168')
     parser.add_argument(
         '-mll', '--mgr-log-lvl', type=int, choices=[1, 2, 3, 4, 5],
         action='append', default=[3],
@@ -277,6 +331,19 @@ def parse_settings(root_path):
         logging.getLogger('pokealarm.webserver').setLevel(logging.DEBUG)
         logging.getLogger('pokealarm.setup').setLevel(logging.DEBUG)
 
+    try:
+        JsonUtils.set_decoder(args.json_decoder)
+    except ValueError as e:
+        log.critical(e)
+        sys.exit(1)
+    log.info("Using the '%s' decoder for JSON webhooks.",
+             JsonUtils.get_decoder_name())
+
+    if args.manager_mode == 'process' and sys.platform == 'win32':
+        log.critical("The 'process' manager mode is not supported on "
+                     "Windows. Process will exit.")
+        sys.exit(1)
+
     config['HOST'] = args.host
     config['PORT'] = args.port
     config['CONCURRENCY'] = args.concurrency
@@ -339,7 +406,9 @@ def parse_settings(root_path):
             location=get_from_list(args.location, m_ct, args.location[0]),
             geofence_file=get_from_list(
                 args.geofences, m_ct, args.geofences[0]),
-            debug=config['DEBUG']
+            debug=config['DEBUG'],
+            cache_max_size=args.cache_max_size,
+            cache_ttl=args.cache_ttl * 60 * 60
         )
 
         m.set_log_level(get_from_list(
@@ -371,6 +440,18 @@ def parse_settings(root_path):
                 args.gmaps_dm_transit, m_ct, args.gmaps_dm_transit[0]):
             m.enable_gmaps_distance_matrix('transit')
 
+        m.set_geofence_raster(args.geofence_raster)
+
+        try:
+            m.set_alarm_dispatch(args.alarm_workers, args.alarm_queue_size)
+            m.set_monster_batch_size(args.mon_batch_size)
+        except ValueError as e:
+            log.critical(e)
+            sys.exit(1)
+
+        if args.manager_mode == 'process':
+            m = ManagerProcess(m)
+
         if m.get_name() not in managers:
             # Add the manager to the map
             managers[m.get_name()] = m
@@ -394,7 +475,9 @@ def get_from_list(arg, i, default):
 
 def exit_gracefully():
     log.info("PokeAlarm is closing down!")
-    server.stop()
+    # Only stop accepting webhooks, since stopping the server would end the
+    # main greenlet and exit before the managers are done
+    server.stop_accepting()
     for m_name in managers:
         managers[m_name].stop()
     for m_name in managers:
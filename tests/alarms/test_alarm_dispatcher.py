@@ -0,0 +1,90 @@
+import logging
+import unittest
+import gevent
+from PokeAlarm.AlarmDispatcher import AlarmDispatcher
+from PokeAlarm.Alarms import Alarm
+
+
+class MockAlarm(Alarm):
+    """ Alarm that takes `delay` seconds to send a notification. """
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.sent = []
+        self.flushed = None
+
+    def flush(self, timeout=10):
+        self.flushed = timeout
+
+    def pokemon_alert(self, dts):
+        gevent.sleep(self.delay)
+        self.sent.append(dts['id'])
+
+    def raid_alert(self, dts):
+        raise ValueError("Unable to send")
+
+
+class TestAlarmDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self._log = logging.getLogger('test')
+
+    def test_sends_in_order(self):
+        alarm = MockAlarm()
+        dispatcher = AlarmDispatcher('mock', alarm, self._log)
+        dispatcher.start()
+        for i in range(5):
+            dispatcher.dispatch('pokemon_alert', {'id': i})
+        dispatcher.dispatch('raid_alert', {'id': 5})
+        dispatcher.stop()
+        self.assertEqual(alarm.sent, range(5))
+        stats = dispatcher.get_stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['queued']),
+                         (5, 1, 0))
+        self.assertTrue(alarm.flushed)
+
+    def test_does_not_wait_for_sending(self):
+        alarm = MockAlarm(delay=0.05)
+        dispatcher = AlarmDispatcher('mock', alarm, self._log, workers=2)
+        dispatcher.start()
+        for i in range(4):
+            dispatcher.dispatch('pokemon_alert', {'id': i})
+        self.assertEqual(alarm.sent, [])
+        dispatcher.stop()  # Drains the queue
+        self.assertEqual(sorted(alarm.sent), range(4))
+        self.assertGreater(dispatcher.get_stats()['avg_send'], 0.04)
+
+    def test_backpressure(self):
+        alarm = MockAlarm(delay=0.01)
+        dispatcher = AlarmDispatcher('mock', alarm, self._log, queue_size=2)
+        dispatcher.start()
+        for i in range(6):
+            dispatcher.dispatch('pokemon_alert', {'id': i})
+        stats = dispatcher.get_stats()
+        self.assertGreater(stats['blocked'], 0)
+        self.assertLessEqual(stats['max_queued'], 2)
+        dispatcher.stop()
+        self.assertEqual(alarm.sent, range(6))
+
+    def test_stop_shares_timeout_with_flush(self):
+        alarm = MockAlarm(delay=0.1)
+        dispatcher = AlarmDispatcher('mock', alarm, self._log)
+        dispatcher.start()
+        for i in range(3):
+            dispatcher.dispatch('pokemon_alert', {'id': i})
+        dispatcher.stop(timeout=0.5)
+        self.assertEqual(alarm.sent, range(3))
+        self.assertGreater(alarm.flushed, 0.1)
+        self.assertLess(alarm.flushed, 0.25)
+
+    def test_delayed_dispatch(self):
+        alarm = MockAlarm()
+        dispatcher = AlarmDispatcher('mock', alarm, self._log)
+        dispatcher.start()
+        alarm.call_later(0.05, 'pokemon_alert', {'id': 0})
+        alarm.call_later(0.05, 'pokemon_alert', {'id': 1}).kill()
+        alarm.call_later(10, 'pokemon_alert', {'id': 2})
+        gevent.sleep(0.1)
+        self.assertEqual(alarm.sent, [0])
+        dispatcher.stop()  # Sends the call that is still waiting
+        self.assertEqual(alarm.sent, [0, 2])
+        self.assertEqual(dispatcher.get_stats()['sent'], 2)
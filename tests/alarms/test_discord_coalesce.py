@@ -0,0 +1,74 @@
+import logging
+import time
+import unittest
+import gevent
+from PokeAlarm.AlarmDispatcher import AlarmDispatcher
+from PokeAlarm.Alarms.Discord import DiscordAlarm
+
+
+class MockManager(object):
+    def get_child_logger(self, name):
+        return logging.getLogger('test').getChild(name)
+
+
+class TestDiscordCoalesce(unittest.TestCase):
+
+    def setUp(self):
+        self.posts = []
+        self.alarm = DiscordAlarm(MockManager(), {
+            'webhook_url': 'https://example.com/<mon_name>',
+            'coalesce_window': 0.1,
+            'monsters': {'username': 'Monsters', 'title': '<mon_name>'}
+        }, 3, None)
+        self.alarm.send_webhook = lambda url, payload: self.posts.append(
+            (url, payload, time.time()))
+
+    def alert(self, name):
+        self.alarm.pokemon_alert({
+            'mon_name': name, 'mon_id_3': '001', 'form_id_3': '000',
+            'gmaps': '', '24h_time': '', 'time_left': '',
+            'lat': 0, 'lng': 0})
+
+    def titles(self, payload):
+        return [e['title'] for e in payload['embeds']]
+
+    def test_coalesce_within_window(self):
+        start = time.time()
+        for _ in range(3):
+            self.alert('Bulbasaur')
+        self.alert('Pidgey')  # Other webhook url
+        self.assertEqual(self.posts, [])
+        gevent.sleep(0.2)
+        self.assertEqual(len(self.posts), 2)
+        by_url = dict((url, p) for url, p, _ in self.posts)
+        self.assertEqual(
+            self.titles(by_url['https://example.com/Bulbasaur']),
+            ['Bulbasaur'] * 3)
+        self.assertLess(self.posts[0][2] - start, 0.2)
+        self.assertEqual(self.alarm.get_stats()['coalescing'],
+                         {'alerts': 4, 'requests': 2})
+
+    def test_full_message_sent_at_once(self):
+        for _ in range(12):
+            self.alert('Bulbasaur')
+        self.assertEqual(len(self.posts), 1)
+        self.assertEqual(len(self.posts[0][1]['embeds']), 10)
+        self.alarm.flush()
+        self.assertEqual(len(self.posts), 2)
+        self.assertEqual(len(self.posts[1][1]['embeds']), 2)
+        gevent.sleep(0.2)  # Timers were cancelled
+        self.assertEqual(len(self.posts), 2)
+
+    def test_sent_through_dispatcher(self):
+        dispatcher = AlarmDispatcher(
+            'discord', self.alarm, logging.getLogger('test'))
+        dispatcher.start()
+        for _ in range(3):
+            self.alert('Bulbasaur')
+        gevent.sleep(0.2)
+        self.assertEqual(len(self.posts), 1)
+        self.assertEqual(dispatcher.get_stats()['sent'], 1)
+        self.alert('Pidgey')
+        dispatcher.stop()  # Does not wait for the window
+        self.assertEqual(len(self.posts), 2)
+        self.assertEqual(dispatcher.get_stats()['sent'], 2)
@@ -0,0 +1,51 @@
+import time
+import unittest
+from PokeAlarm.Alarms.Discord.RateLimits import WebhookRateLimiter
+
+URL = "https://discordapp.com/api/webhooks/1234/secret"
+OTHER = "https://discordapp.com/api/webhooks/5678/secret"
+
+
+class MockResponse(object):
+    def __init__(self, status_code=204, **headers):
+        self.status_code = status_code
+        self.headers = dict((k.replace('_', '-'), v)
+                            for k, v in headers.iteritems())
+
+
+class TestWebhookRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = WebhookRateLimiter()
+
+    def timed_acquire(self, url):
+        start = time.time()
+        self.limiter.acquire(url)
+        return time.time() - start
+
+    def test_waits_for_empty_bucket(self):
+        self.assertLess(self.timed_acquire(URL), 0.05)
+        self.assertFalse(self.limiter.update(URL, MockResponse(**{
+            'X_RateLimit_Limit': '1', 'X_RateLimit_Remaining': '0',
+            'X_RateLimit_Reset_After': '0.2'})))
+        self.assertLess(self.timed_acquire(OTHER), 0.05)
+        self.assertGreater(self.timed_acquire(URL), 0.15)
+        # The bucket was reset, but its only request is used up again
+        self.assertGreater(self.timed_acquire(URL), 0.15)
+
+    def test_retry_after(self):
+        self.limiter.acquire(URL)
+        self.assertTrue(self.limiter.update(URL, MockResponse(
+            429, Retry_After='0.2')))
+        self.assertGreater(self.timed_acquire(URL), 0.15)
+        self.assertTrue(self.limiter.update(URL, MockResponse(
+            429, Retry_After='0.2', X_RateLimit_Global='true')))
+        self.assertGreater(self.timed_acquire(OTHER), 0.15)
+
+    def test_stats(self):
+        self.limiter.acquire(URL)
+        self.limiter.update(URL, MockResponse())
+        stats = self.limiter.get_stats()
+        self.assertEqual(stats.keys(),
+                         ["https://discordapp.com/api/webhooks/1234"])
+        self.assertEqual(stats.values()[0]['sent'], 1)
@@ -0,0 +1,53 @@
+import logging
+import time
+import unittest
+from PokeAlarm.Alarms.Telegram.Scheduler import ChatScheduler, TokenBucket
+
+
+class TestChatScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.scheduler = ChatScheduler(
+            logging.getLogger('test'), bot_rate=100, chat_rate=20)
+
+    def send(self, chat_id, message):
+        return lambda: self.sent.append((chat_id, message, time.time()))
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.time()
+        waited = sum(bucket.acquire() for _ in range(4))
+        self.assertGreater(time.time() - start, 0.08)
+        self.assertGreater(waited, 0.08)
+
+    def test_order_within_chat(self):
+        for alert in range(3):
+            self.scheduler.submit('bot', 'a', [
+                self.send('a', (alert, part)) for part in range(3)])
+        self.scheduler.flush()
+        self.assertEqual([m for _, m, _ in self.sent],
+                         [(a, p) for a in range(3) for p in range(3)])
+        self.assertEqual(self.scheduler.get_stats()['chat a']['sent'], 9)
+
+    def test_chats_interleave(self):
+        for chat_id in ['a', 'b']:
+            self.scheduler.submit('bot', chat_id, [
+                self.send(chat_id, part) for part in range(5)])
+        self.scheduler.flush()
+        chats = [chat_id for chat_id, _, _ in self.sent]
+        self.assertEqual(sorted(chats), ['a'] * 5 + ['b'] * 5)
+        self.assertNotEqual(chats, ['a'] * 5 + ['b'] * 5)
+        # Messages to a chat are spaced by its rate
+        times = [t for chat_id, _, t in self.sent if chat_id == 'a']
+        self.assertGreater(times[-1] - times[0], 0.15)
+
+    def test_flush_with_full_queue(self):
+        scheduler = ChatScheduler(
+            logging.getLogger('test'), chat_rate=1, queue_size=3)
+        for part in range(4):
+            scheduler.submit('bot', 'a', [self.send('a', part)])
+        start = time.time()
+        scheduler.flush(timeout=0.5)
+        self.assertLess(time.time() - start, 1.0)
+        self.assertLess(len(self.sent), 4)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from PokeAlarm.Alarms import Alarm, DtsDict, Template
+
+
+def replace_all_keys(string, dts):
+    """ Reference implementation: try every key of the DTS. """
+    s = string.encode('utf-8')
+    for key in dts:
+        s = s.replace("<{}>".format(key), str(dts[key]))
+    return s
+
+
+class TestTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.dts = {
+            'mon_name': 'Bulbasaur', 'iv': 100.0, 'cp': 1234,
+            'time_left': '29m 59s', 'gmaps': 'http://maps/?q=1,2',
+            'empty': '', 'unknown': '?', 'move_1': u'Vine Whip'
+        }
+
+    def test_matches_reference(self):
+        rand = random.Random(3)
+        pieces = ['<{}>'.format(k) for k in self.dts] + [
+            '<missing>', '<', '>', '<<mon_name>>', ' ', 'text', u'é',
+            '\n', '<iv', 'cp>', '<>']
+        for _ in range(500):
+            text = u''.join(rand.choice(pieces)
+                            for _ in range(rand.randint(0, 12)))
+            self.assertEqual(Alarm.replace(text, self.dts),
+                             replace_all_keys(text, self.dts), text)
+
+    def test_unknown_placeholders_kept(self):
+        self.assertEqual(
+            Alarm.replace(u"<mon_name> at <place> (<iv>%)", self.dts),
+            "Bulbasaur at <place> (100.0%)")
+        self.assertIsNone(Alarm.replace(None, self.dts))
+
+    def test_parsed_once(self):
+        text = u"<mon_name> <cp> <mon_name>"
+        self.assertIsNot(Template.get(text), Template.get(text))
+        template = Template.compile(text)
+        self.assertIs(Template.compile(text), template)
+        self.assertIs(Template.get(text), template)
+        self.assertEqual(template.get_keys(), set(['mon_name', 'cp']))
+        self.assertEqual(Template.get(u"ñ <cp>").render(self.dts),
+                         u"ñ 1234".encode('utf-8'))
+
+    def test_alarm_dts_keys(self):
+        class SettingsAlarm(Alarm):
+            def __init__(self):
+                self.__monster = {
+                    'title': u"<mon_name> <iv>%",
+                    'fields': [{'value': "<cp> CP"}, ("<gmaps>", None)],
+                    'webhook_url': "http://hook"}
+                self.__session = object()
+        self.assertEqual(SettingsAlarm().get_dts_keys(),
+                         set(['mon_name', 'iv', 'cp', 'gmaps', 'lat', 'lng']))
+        # The settings are compiled, other texts are not kept
+        self.assertIn(u"<cp> CP", Template._templates)
+        Template.get(u"Bulbasaur <cp> CP")
+        self.assertNotIn(u"Bulbasaur <cp> CP", Template._templates)
+
+    def test_dts_dict_renders_once(self):
+        dts = DtsDict(self.dts)
+        Template.compile(u"<mon_name> <cp>")
+        Template.compile(u"<iv>")
+        first = Alarm.replace(u"<mon_name> <cp>", dts)
+        self.assertEqual(first, "Bulbasaur 1234")
+        # Later renders of the same template reuse the text
+        self.assertIs(Alarm.replace(u"<mon_name> <cp>", dts), first)
+        self.assertEqual(len(dts.renders), 1)
+        self.assertEqual(Alarm.replace(u"<iv>", dts), "100.0")
+        self.assertEqual(len(dts.renders), 2)
+        # Texts that were not compiled are rendered without the memo
+        self.assertEqual(Alarm.replace(u"Bulbasaur <cp>", dts),
+                         "Bulbasaur 1234")
+        self.assertEqual(len(dts.renders), 2)
@@ -0,0 +1,74 @@
+from datetime import datetime
+import logging
+import time
+import unittest
+from PokeAlarm import Unknown
+from PokeAlarm.Cache import Cache
+from PokeAlarm.Cache.FileCache import _load_hist
+
+
+class MockManager(object):
+
+    def get_child_logger(self, name):
+        return logging.getLogger(name)
+
+
+class TestCache(unittest.TestCase):
+
+    def test_gym_details(self):
+        cache = Cache(MockManager())
+        self.assertEqual(cache.gym_team('g1'), Unknown.TINY)
+        self.assertEqual(cache.gym_name('g1', 'Gym'), 'Gym')
+        self.assertEqual(cache.gym_team('g1', 2), 2)
+        # Unknown values don't replace known ones
+        self.assertEqual(cache.gym_name('g1', Unknown.REGULAR), 'Gym')
+        self.assertEqual(cache.gym_team('g1'), 2)
+        self.assertEqual(cache.gym_desc('g1'), Unknown.REGULAR)
+        self.assertEqual(cache.gym_image('g2'), cache.gym_image('g1'))
+        self.assertEqual(cache.get_stats()['gyms']['entries'], 1)
+
+    def test_bounded(self):
+        cache = Cache(MockManager(), max_size=3)
+        for cell in range(5):
+            cache.cell_weather_id(cell, cell + 1)
+            cache.severity_id(cell, 0)
+        self.assertEqual(cache.cell_weather_id(0), Unknown.REGULAR)
+        self.assertEqual(cache.cell_weather_id(4), 5)
+        stats = cache.get_stats()['cells']
+        self.assertEqual((stats['entries'], stats['evicted']), (3, 2))
+
+    def test_old_format(self):
+        data = {
+            'gym_name': {'g1': 'Gym', 'g2': 'Other'},
+            'gym_team': {'g1': 1},
+            'cell_weather_id': {5: 3},
+            'day_or_night_id': {5: 2, 6: 1}
+        }
+        cache = Cache(MockManager())
+        cache._import_entries(cache._gyms, cache._gym_fields, data)
+        cache._import_entries(cache._cells, cache._cell_fields, data)
+        self.assertEqual(cache.gym_team('g1'), 1)
+        self.assertEqual(cache.gym_team('g2'), Unknown.TINY)
+        self.assertEqual(cache.day_or_night_id(6), 1)
+        exported = cache._export_entries(cache._gyms, cache._gym_fields)
+        exported.update(
+            cache._export_entries(cache._cells, cache._cell_fields))
+        for field in Cache._gym_fields + Cache._cell_fields:
+            self.assertEqual(exported[field], data.get(field, {}), field)
+
+    def test_clean_expired(self):
+        cache = Cache(MockManager())
+        past = int(time.time()) - 60
+        for i in range(150):
+            cache.monster_expiration(i, past)
+            cache.raid_expiration(i, past + 3600)
+        cache.egg_expiration('e', past)
+        self.assertEqual(cache.clean_expired(), 100)
+        self.assertEqual(cache.clean_expired(), 51)
+        self.assertEqual(cache.clean_expired(), 0)
+        self.assertIsNotNone(cache.raid_expiration(0))
+
+    def test_old_history(self):
+        hist = _load_hist({'a': datetime(2020, 1, 1, 0, 1), 'b': 1577836800})
+        self.assertEqual(hist.as_dict(), {'a': 1577836860, 'b': 1577836800})
+        self.assertEqual(_load_hist(None).as_dict(), {})
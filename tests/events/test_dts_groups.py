@@ -0,0 +1,73 @@
+import sys
+import unittest
+import PokeAlarm.Events as Events
+from PokeAlarm.Locale import Locale
+
+# Locale names are unicode
+reload(sys)
+sys.setdefaultencoding('UTF8')
+
+
+class TestDtsGroups(unittest.TestCase):
+
+    def gen_events(self):
+        """ Generate one event of each kind. """
+        location = {"latitude": 37.7876146, "longitude": -122.390624}
+        gym = dict(location, gym_id="0", name="Gym", level=5,
+                   start=1499244052, end=1499246052, team_id=1)
+        mon = dict(location, encounter_id="0", spawnpoint_id="0",
+                   pokemon_id=129, disappear_time=1506897031, verified=True,
+                   pokemon_level=30, cp=250, individual_attack=15,
+                   individual_defense=10, individual_stamina=5, move_1=231,
+                   move_2=133, height=0.9, weight=14.5, gender=1, weather=3,
+                   form=None, costume=None, base_catch=0.5)
+        return [
+            Events.MonEvent(mon),
+            Events.RaidEvent(dict(gym, pokemon_id=150, cp=12345, move_1=123,
+                                  move_2=123)),
+            Events.EggEvent(gym),
+            Events.GymEvent(gym),
+            Events.StopEvent(dict(location, pokestop_id="0",
+                                  lure_expiration=1572241600)),
+            Events.WeatherEvent(dict(location, s2_cell_id=0, condition=2,
+                                     alert_severity=1, day=1))
+        ]
+
+    def test_groups_match_declared_keys(self):
+        locale = Locale('en')
+        for event in self.gen_events():
+            seen = set()
+            for name in event.get_dts_groups():
+                declared = getattr(event, name).dts_keys
+                dts = getattr(event, name)(locale, None, 'metric')
+                self.assertEqual(set(dts), declared, name)
+                # Every key is provided by a single group
+                self.assertTrue(seen.isdisjoint(declared), name)
+                seen.update(declared)
+
+    def test_only_requested_groups(self):
+        locale = Locale('en')
+        keys = frozenset(['lat', 'mon_name', 'gym_name', 'weather'])
+        for event in self.gen_events():
+            event.custom_dts = {'custom': 'value'}
+            full = event.generate_dts(locale, None, 'metric')
+            dts = event.generate_dts(locale, None, 'metric', keys)
+            self.assertLess(len(dts), len(full))
+            self.assertEqual(dts['custom'], 'value')
+            for key, value in dts.iteritems():
+                self.assertEqual(value, full[key])
+            for key in keys.intersection(full):
+                self.assertIn(key, dts)
+
+    def test_overlay_keys(self):
+        event = self.gen_events()[0]
+        overlay = Events.EventOverlay(event)
+        overlay.geofence = 'overlay'
+        dts = overlay.generate_dts(
+            Locale('en'), None, 'metric', frozenset(['geofence']))
+        self.assertEqual(dts['geofence'], 'overlay')
+        self.assertNotIn('mon_name', dts)
+
+
+if __name__ == '__main__':
+    unittest.main()
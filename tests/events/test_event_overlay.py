@@ -0,0 +1,63 @@
+import pickle
+import unittest
+import PokeAlarm.Events as Events
+import PokeAlarm.Filters as Filters
+from PokeAlarm.Locale import Locale
+from tests.filters import MockManager
+
+
+class TestEventOverlay(unittest.TestCase):
+
+    def gen_event(self):
+        """ Generate a generic stop. """
+        return Events.StopEvent({
+            "pokestop_id": 0,
+            "enabled": "True",
+            "latitude": 37.7876146,
+            "longitude": -122.390624,
+            "last_modified_time": 1572241600,
+            "lure_expiration": 1572241600,
+            "active_fort_modifier": 0
+        })
+
+    def test_writes_stay_in_overlay(self):
+        stop = self.gen_event()
+        first = Events.EventOverlay(stop)
+        second = Events.EventOverlay(stop)
+        first.distance = 100
+        first.geofence = 'first'
+        # Values set on one overlay are not seen by the event or others
+        self.assertEqual(first.distance, 100)
+        self.assertNotEqual(stop.distance, 100)
+        self.assertNotEqual(second.distance, 100)
+        self.assertEqual(second.geofence, stop.geofence)
+        # Everything else is read from the event
+        self.assertEqual(first.stop_id, stop.stop_id)
+        self.assertIs(first.get_event(), stop)
+
+    def test_methods_use_overlay(self):
+        stop = self.gen_event()
+        overlay = Events.EventOverlay(stop)
+        overlay.geofence = 'overlay'
+        dts = overlay.generate_dts(Locale('en'), None, 'metric')
+        self.assertEqual(dts['geofence'], 'overlay')
+        self.assertNotEqual(
+            stop.generate_dts(Locale('en'), None, 'metric')['geofence'],
+            'overlay')
+
+    def test_filters_check_overlay(self):
+        filt = Filters.StopFilter(
+            MockManager(), "testfilter", {"max_dist": 2000, "min_dist": 400})
+        stop = self.gen_event()
+        overlay = Events.EventOverlay(stop)
+        overlay.distance = 1000
+        self.assertTrue(filt.check_event(overlay))
+        overlay.distance = 3000
+        self.assertFalse(filt.check_event(overlay))
+
+    def test_pickle_event(self):
+        stop = self.gen_event()
+        copy = pickle.loads(pickle.dumps(stop, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(copy.stop_id, stop.stop_id)
+        self.assertEqual(copy.expiration, stop.expiration)
+        self.assertEqual(copy._log.name, stop._log.name)
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+import random
+import unittest
+import PokeAlarm.Filters as Filters
+from tests.filters import MockManager
+import tests.filters.test_compiled_filter as compiled
+
+
+@unittest.skipUnless(Filters.BatchFilter.is_available(), "requires NumPy")
+class TestBatchFilter(unittest.TestCase):
+
+    def setUp(self):
+        self._mgr = MockManager()
+        # Reuse the random monsters of the compiled filter tests
+        self._events = compiled.TestCompiledFilter('test_matches_check_list')
+        self._events.setUp()
+
+    def gen_filters(self, count):
+        rand = random.Random(7)
+        filters = OrderedDict()
+        for i in range(count):
+            settings = {"monsters": rand.sample(range(1, 11), 5)}
+            for key, low, high in [('iv', 0, 100), ('cp', 10, 3000),
+                                   ('lvl', 1, 35), ('dist', 0, 6000)]:
+                if rand.random() < 0.5:
+                    settings['min_' + key] = rand.randint(low, high)
+                if rand.random() < 0.5:
+                    settings['max_' + key] = rand.randint(low, high)
+            if rand.random() < 0.3:
+                settings['is_missing_info'] = rand.random() < 0.5
+            name = "filter_{}".format(i)
+            filters[name] = Filters.MonFilter(self._mgr, name, settings)
+        return filters
+
+    def test_never_rules_out_passing_filters(self):
+        filters = self.gen_filters(50)
+        batch = Filters.BatchFilter(filters)
+        events = [self._events.gen_event() for _ in range(200)]
+        ruled_out = 0
+        for event, allowed in zip(events, batch.check(events)):
+            for name, filt in filters.iteritems():
+                if name not in allowed:
+                    ruled_out += 1
+                    self.assertFalse(filt.check_event(event))
+        self.assertGreater(ruled_out, 0)
+
+    def test_unknown_values_pass(self):
+        filt = Filters.MonFilter(
+            self._mgr, "ranges", {"min_iv": 90, "max_dist": 10})
+        batch = Filters.BatchFilter(OrderedDict([("ranges", filt)]))
+        event = self._events.gen_event()
+        event.iv, event.distance = '???', '???'
+        self.assertEqual(batch.check([event]), [frozenset(['ranges'])])
+        event.iv = 50
+        self.assertEqual(batch.check([event]), [frozenset()])
@@ -0,0 +1,118 @@
+import random
+import unittest
+import PokeAlarm.Filters as Filters
+import PokeAlarm.Events as Events
+from PokeAlarm import Unknown
+from tests.filters import MockManager
+
+
+def interpret(filt, event):
+    """ Reference implementation: run the check list one by one. """
+    missing = False
+    for check in filt._check_list:
+        result = check(filt, event)
+        if result is False:
+            return False
+        elif Unknown.is_(result):
+            missing = True
+    if filt.is_missing_info is not None \
+            and missing != filt.is_missing_info:
+        return False
+    return True
+
+
+class TestCompiledFilter(unittest.TestCase):
+
+    def setUp(self):
+        self._mgr = MockManager()
+        self._rand = random.Random(42)
+
+    def gen_filter(self, settings):
+        return Filters.MonFilter(self._mgr, "testfilter", settings)
+
+    def gen_event(self):
+        """ Generate a random monster, encountered or not. """
+        rand = self._rand
+        settings = {
+            "encounter_id": "0",
+            "pokemon_id": rand.randint(1, 10),
+            "latitude": 37.7876146,
+            "longitude": -122.390624,
+            "disappear_time": 1506897031,
+            "gender": rand.randint(1, 3)
+        }
+        if rand.random() < 0.5:
+            settings.update({
+                "pokemon_level": rand.randint(1, 35),
+                "cp": rand.randint(10, 3000),
+                "individual_attack": rand.randint(0, 15),
+                "individual_defense": rand.randint(0, 15),
+                "individual_stamina": rand.randint(0, 15),
+                "move_1": rand.choice([216, 221]),
+                "move_2": rand.choice([90, 118])
+            })
+        mon = Events.MonEvent(settings)
+        mon.distance = rand.choice([Unknown.SMALL, 100, 1000, 5000])
+        return mon
+
+    def test_matches_check_list(self):
+        settings = {
+            "monsters": [1, 2, 3, 4, 5, 6],
+            "monsters_exclude": [4],
+            "min_dist": 50, "max_dist": 2000,
+            "min_iv": 20, "max_cp": 2500, "min_lvl": 5,
+            "quick_moves": [216], "genders": ["male", "female"]
+        }
+        for missing in [None, True, False]:
+            conf = dict(settings)
+            if missing is not None:
+                conf['is_missing_info'] = missing
+            filt = self.gen_filter(conf)
+            for _ in range(500):
+                mon = self.gen_event()
+                self.assertEqual(
+                    filt.check_event(mon), interpret(filt, mon),
+                    "Mismatch for {} with:\n{}".format(
+                        vars(mon), filt._compiled_source))
+
+    def test_inlined_checks(self):
+        filt = self.gen_filter({
+            "monsters": [1], "monsters_exclude": [2], "min_iv": 10,
+            "max_iv": 90})
+        filt.compile()
+        source = filt._compiled_source
+        self.assertIn("value in limit_0", source)
+        self.assertIn("value not in limit_1", source)
+        self.assertIn("limit_2 <= value", source)
+        self.assertIn("limit_3 >= value", source)
+        self.assertEqual(source.count("value = event.iv"), 1)
+        self.assertNotIn("func_", source)
+
+    def test_recompile_on_new_check(self):
+        filt = self.gen_filter({"min_iv": 10})
+        mon = self.gen_event()
+        mon.iv = 50
+        self.assertTrue(filt.check_event(mon))
+        # Checks with other functions are called instead of inlined
+        filt.evaluate_attribute(
+            limit=60, eval_func=lambda lim, v: lim <= v, event_attribute='iv')
+        self.assertFalse(filt.check_event(mon))
+        self.assertIn("func_1", filt._compiled_source)
+
+    def test_reorder_checks(self):
+        filt = self.gen_filter({
+            "monsters": range(1, 11), "genders": ["male"]})
+        self.assertEqual(filt.get_check_order(), ['monster_id', 'gender'])
+        events = [self.gen_event() for _ in range(300)]
+        for mon in events:
+            filt.check_event(mon)
+        # Only the gender check rejects, so it should run first
+        self.assertTrue(filt.reorder_checks())
+        self.assertEqual(filt.get_check_order(), ['gender', 'monster_id'])
+        attr, limit, evaluated, rejected = filt.get_check_stats()[0]
+        self.assertEqual((attr, evaluated), ('gender', 300))
+        self.assertGreater(rejected, 100)
+        for mon in events:
+            self.assertEqual(filt.check_event(mon), interpret(filt, mon))
+        # Nothing changes without enough new events
+        self.assertFalse(filt.reorder_checks())
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import unittest
+import PokeAlarm.Filters as Filters
+from tests.filters import MockManager
+
+
+class MockEvent(object):
+    """ Mock event with only the indexed attributes. """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TestFilterIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._mgr = MockManager()
+
+    def gen_filters(self, cls, settings):
+        return OrderedDict(
+            (name, cls(self._mgr, name, dict(conf)))
+            for name, conf in settings)
+
+    def test_monster_index(self):
+        filters = self.gen_filters(Filters.MonFilter, [
+            ('bulba', {"monsters": [1]}),
+            ('any', {"min_iv": 90}),
+            ('starters', {"monsters": [1, 4, 7]}),
+            ('not_bulba', {"monsters_exclude": [1]})
+        ])
+        index = Filters.FilterIndex(filters, filters.keys())
+        self.assertEqual(index.get_candidates(MockEvent(monster_id=1)),
+                         ['bulba', 'any', 'starters'])
+        self.assertEqual(index.get_candidates(MockEvent(monster_id=4)),
+                         ['any', 'starters', 'not_bulba'])
+        self.assertEqual(index.get_candidates(MockEvent(monster_id=10)),
+                         ['any', 'not_bulba'])
+
+    def test_rule_order_and_missing(self):
+        filters = self.gen_filters(Filters.MonFilter, [
+            ('bulba', {"monsters": [1]}),
+            ('ivysaur', {"monsters": [2]})
+        ])
+        index = Filters.FilterIndex(filters, ['missing', 'ivysaur', 'bulba'])
+        self.assertEqual(index.get_candidates(MockEvent(monster_id=1)),
+                         ['missing', 'bulba'])
+
+    def test_unknown_values(self):
+        filters = self.gen_filters(Filters.RaidFilter, [
+            ('mewtwo', {"monsters": [150]})
+        ])
+        index = Filters.FilterIndex(filters, filters.keys())
+        self.assertEqual(index.get_candidates(MockEvent(mon_id='?')),
+                         ['mewtwo'])
+        self.assertEqual(index.get_candidates(MockEvent(mon_id=1)), [])
+
+    def test_egg_levels(self):
+        filters = self.gen_filters(Filters.EggFilter, [
+            ('legendary', {"min_egg_lvl": 5}),
+            ('small', {"max_egg_lvl": 2}),
+            ('middle', {"min_egg_lvl": 3, "max_egg_lvl": 4}),
+            ('all', {})
+        ])
+        index = Filters.FilterIndex(filters, filters.keys())
+        self.assertEqual(index.get_candidates(MockEvent(egg_lvl=5)),
+                         ['legendary', 'all'])
+        self.assertEqual(index.get_candidates(MockEvent(egg_lvl=3)),
+                         ['middle', 'all'])
+        self.assertEqual(index.get_candidates(MockEvent(egg_lvl=1)),
+                         ['small', 'all'])
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+import math
+import random
+import unittest
+from PokeAlarm.Geofence import Geofence, GeofenceIndex
+
+
+class TestGeofenceIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._rand = random.Random(11)
+
+    def gen_polygon(self, lat, lng, radius, vertices=40):
+        """ Generate a random star shaped polygon around a center. """
+        rand = self._rand
+        points = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            dist = radius * rand.uniform(0.3, 1.0)
+            points.append([lat + dist * math.cos(angle),
+                           lng + dist * math.sin(angle)])
+        return points
+
+    def gen_geofences(self, count):
+        rand = self._rand
+        geofences = OrderedDict()
+        for i in range(count):
+            name = "fence_{}".format(i)
+            geofences[name] = Geofence(name, self.gen_polygon(
+                rand.uniform(37.6, 37.9), rand.uniform(-122.5, -122.2),
+                rand.uniform(0.005, 0.05)))
+        return geofences
+
+    def test_matches_all_geofences(self):
+        geofences = self.gen_geofences(100)
+        # A big geofence that is not put in the grid
+        geofences["city"] = Geofence("city", self.gen_polygon(
+            37.75, -122.35, 0.3))
+        index = GeofenceIndex(geofences, cell_size=0.002)
+        self.assertEqual(index.get_stats()[2], 1)
+        for _ in range(2000):
+            lat = self._rand.uniform(37.5, 38.0)
+            lng = self._rand.uniform(-122.6, -122.1)
+            expected = [name for name, gf in geofences.iteritems()
+                        if gf.contains(lat, lng)]
+            candidates = index.get_candidates(lat, lng)
+            found = [name for name in candidates
+                     if geofences[name].contains(lat, lng)]
+            self.assertEqual(found, expected)
+            self.assertLessEqual(len(candidates), len(geofences))
+
+    def test_configured_order(self):
+        square = [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+        geofences = OrderedDict()
+        for name in ["b", "c", "a"]:
+            geofences[name] = Geofence(name, square)
+        index = GeofenceIndex(geofences)
+        self.assertEqual(index.get_candidates(0.5, 0.5), ("b", "c", "a"))
+        self.assertEqual(index.get_candidates(1.0, 1.0), ("b", "c", "a"))
+        self.assertEqual(index.get_candidates(2.0, 0.5), ())
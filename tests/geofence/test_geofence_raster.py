@@ -0,0 +1,47 @@
+import math
+import random
+import unittest
+from PokeAlarm.Geofence import Geofence
+
+
+class TestGeofenceRaster(unittest.TestCase):
+
+    def setUp(self):
+        self._rand = random.Random(5)
+
+    def gen_points(self, vertices=200):
+        """ Generate a random, very concave polygon around San Francisco. """
+        points = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            dist = 0.05 * self._rand.uniform(0.2, 1.0)
+            points.append([37.75 + dist * math.cos(angle),
+                           -122.4 + dist * math.sin(angle)])
+        return points
+
+    def test_matches_raycast(self):
+        points = self.gen_points()
+        raycast, raster = Geofence("a", points), Geofence("b", points)
+        raster.rasterize(50)
+        outside, inside, boundary = raster.get_raster_stats()
+        self.assertGreater(inside, boundary)
+        self.assertGreater(outside, 0)
+        for _ in range(5000):
+            lat = self._rand.uniform(37.69, 37.81)
+            lng = -122.4 + self._rand.uniform(-0.07, 0.07)
+            self.assertEqual(raster.contains(lat, lng),
+                             raycast.contains(lat, lng))
+
+    def test_corners_and_vertices(self):
+        gf = Geofence("square", [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0],
+                                 [1.0, 0.0]])
+        points = [(x, y) for x in [0.0, 0.5, 1.0] for y in [0.0, 0.5, 1.0]]
+        expected = [gf.contains(x, y) for x, y in points]
+        gf.rasterize(10000)
+        self.assertEqual([gf.contains(x, y) for x, y in points], expected)
+
+    def test_memory_limit(self):
+        gf = Geofence("fence", self.gen_points())
+        gf.max_raster_cells = 1000
+        gf.rasterize(1)
+        self.assertLessEqual(sum(gf.get_raster_stats()), 1100)
@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import unittest
+from Queue import Empty
+import gevent
+from PokeAlarm.ManagerProcess import ManagerProcess
+
+
+class MockManager(object):
+    """ Manager that reports what happens in its process to a queue. """
+
+    def __init__(self, name, results):
+        self._name = name
+        self._results = results
+        self._log = logging.getLogger('pokealarm.{}'.format(name))
+
+    def get_name(self):
+        return self._name
+
+    def get_child_logger(self, name):
+        return self._log.getChild(name)
+
+    def start(self):
+        self._log.info("Started in %s", os.getpid())
+
+    def update(self, obj):
+        if obj == 'log':  # Larger than the pipe's buffer
+            self._log.info('x' * 100000)
+        self._results.put(obj)
+
+    def stop(self):
+        self._results.put('stopped')
+
+    def join(self):
+        pass
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestManagerProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.results = multiprocessing.Queue()
+        self.handler = RecordingHandler()
+        self.logger = logging.getLogger('pokealarm')
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        for mgr in ManagerProcess._started:
+            if mgr._process.is_alive():
+                os.kill(mgr._process.pid, signal.SIGKILL)
+        del ManagerProcess._started[:]
+
+    def get_results(self, count):
+        """ Waits for results, while letting the greenlets run. """
+        results = []
+        deadline = time.time() + 5
+        while len(results) < count and time.time() < deadline:
+            try:
+                results.append(self.results.get_nowait())
+            except Empty:
+                gevent.sleep(0.01)
+        return results
+
+    def test_events_and_logs(self):
+        mgr = ManagerProcess(MockManager('one', self.results))
+        mgr.start()
+        events = range(1200)  # More than a single batch
+        for obj in events:
+            mgr.update(obj)
+        mgr.stop()
+        mgr.join()
+        self.assertFalse(mgr._process.is_alive())
+        self.assertEqual(self.get_results(1201), events + ['stopped'])
+        # The child's records were handled in this process
+        started = [r for r in self.handler.records
+                   if r.name == 'pokealarm.one']
+        self.assertEqual(len(started), 1)
+        self.assertNotEqual(started[0].process, os.getpid())
+        self.assertEqual(started[0].getMessage(),
+                         "Started in {}".format(mgr._process.pid))
+
+    def test_child_sees_main_process_exit(self):
+        first = ManagerProcess(MockManager('first', self.results))
+        second = ManagerProcess(MockManager('second', self.results))
+        first.start()
+        second.start()
+        # Losing the pipe must stop the first child, even though the
+        # second was forked while the pipe was open
+        first._sender.kill()
+        first._conn.close()
+        first._process.join(timeout=5)
+        self.assertFalse(first._process.is_alive())
+        self.assertEqual(self.get_results(1), ['stopped'])
+        second.update('event')
+        second.stop()
+        second.join()
+        self.assertEqual(self.get_results(2), ['event', 'stopped'])
+
+    def test_child_ignores_sigterm(self):
+        mgr = ManagerProcess(MockManager('term', self.results))
+        mgr.start()
+        mgr.update('first')
+        self.assertEqual(self.get_results(1), ['first'])
+        # Shutdown is left to the main process
+        os.kill(mgr._process.pid, signal.SIGTERM)
+        mgr.update('log')
+        mgr.stop()
+        mgr.join()
+        self.assertEqual(self.get_results(2), ['log', 'stopped'])
+        logged = [r.getMessage() for r in self.handler.records
+                  if r.name == 'pokealarm.term']
+        self.assertIn('x' * 100000, logged)
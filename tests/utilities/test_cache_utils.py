@@ -0,0 +1,66 @@
+import time
+import unittest
+from PokeAlarm.Utilities.CacheUtils import ExpiryDict, LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_least_recently_used_dropped(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'b' is now the oldest
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.get_stats(), (3, 1, 2))
+        self.assertEqual(cache.get_hit_rate(), 0.75)
+
+    def test_expired_entries(self):
+        cache = LRUCache(max_size=10, ttl=60)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        cache._data['a'] = (1, time.time() - 1)  # Pretend time passed
+        self.assertEqual(cache.get('a', 'missing'), 'missing')
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_and_memory(self):
+        cache = LRUCache(max_size=10)
+        empty = cache.get_memory()
+        cache.put((37.5, -122.5), {'Box': True})
+        self.assertGreater(cache.get_memory(), empty)
+        cache.clear()
+        self.assertIsNone(cache.get((37.5, -122.5)))
+
+    def test_limits_and_evictions(self):
+        cache = LRUCache(max_size=5, ttl=60)
+        for i in range(10):
+            cache.put(i, str(i))
+        self.assertEqual([k for k, _ in cache.items()], [5, 6, 7, 8, 9])
+        cache._data[5] = ('5', time.time() - 1)  # Pretend time passed
+        self.assertEqual(cache.clean(), 1)
+        self.assertEqual(cache.items()[0], (6, '6'))
+        self.assertEqual(cache.get_evictions(), (5, 1))
+
+
+class TestExpiryDict(unittest.TestCase):
+
+    def test_removes_expired(self):
+        hist = ExpiryDict({'a': 5, 'b': 1})
+        hist.set('c', 3)
+        hist.set('d', 10)
+        self.assertEqual(hist.remove_expired(4, limit=1), 1)
+        self.assertIsNone(hist.get('b'))
+        self.assertEqual(hist.remove_expired(4), 1)
+        self.assertEqual(sorted(hist.as_dict()), ['a', 'd'])
+        self.assertEqual(hist.remove_expired(4), 0)
+
+    def test_updated_expiration(self):
+        hist = ExpiryDict()
+        hist.set('a', 1)
+        hist.set('a', 8)  # Outdated expiration stays in the heap
+        hist.set('b', 2)
+        hist.set('b', 2)
+        self.assertEqual(hist.remove_expired(5), 1)
+        self.assertEqual(hist.get('a'), 8)
+        self.assertEqual(len(hist), 1)
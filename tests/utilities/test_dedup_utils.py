@@ -0,0 +1,86 @@
+import time
+import unittest
+from PokeAlarm.Utilities.DedupUtils import SeenFrames
+
+
+class TestSeenFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.seen = SeenFrames()
+        self.expire = int(time.time()) + 600
+
+    def mon(self, enc_id, expire=None):
+        return {"type": "pokemon", "message": {
+            "encounter_id": enc_id, "pokemon_id": 1,
+            "disappear_time": expire or self.expire}}
+
+    def raid(self, gym_id, mon_id, start, end):
+        return {"type": "raid", "message": {
+            "gym_id": gym_id, "pokemon_id": mon_id, "level": 5,
+            "start": start, "end": end}}
+
+    def check(self, frame):
+        """ Checks a frame like the webhook distributor does. """
+        if self.seen.is_duplicate(frame):
+            return True
+        self.seen.mark_seen(frame)
+        return False
+
+    def test_duplicate_monsters(self):
+        self.assertFalse(self.check(self.mon('a')))
+        self.assertTrue(self.check(self.mon('a')))
+        self.assertFalse(self.check(self.mon('b')))
+        self.assertEqual(self.seen.get_stats(), {'pokemon': (2, 1)})
+
+    def test_expired_frames(self):
+        expired = int(time.time()) - 10
+        self.assertFalse(self.check(self.mon('a', expired)))
+        self.assertFalse(self.check(self.mon('a', expired)))
+        self.seen.clean()
+        self.assertEqual(len(self.seen), 0)
+
+    def test_eggs_and_raids(self):
+        start, end = self.expire - 300, self.expire
+        egg = self.raid('gym', None, start, end)
+        raid = self.raid('gym', 150, start, end)
+        self.assertFalse(self.check(egg))
+        # A hatched egg is not a duplicate of the egg
+        self.assertFalse(self.check(raid))
+        self.assertTrue(self.check(egg))
+        self.assertTrue(self.check(raid))
+        self.assertEqual(
+            self.seen.get_stats(), {'egg': (1, 1), 'raid': (1, 1)})
+
+    def test_raids_with_gym_details(self):
+        raid = self.raid('gym', 150, self.expire - 300, self.expire)
+        self.assertFalse(self.check(raid))
+        # A frame with new gym details is not dropped, so they get cached
+        named = self.raid('gym', 150, self.expire - 300, self.expire)
+        named['message']['name'] = 'Gym Name'
+        self.assertFalse(self.check(named))
+        self.assertTrue(self.check(named))
+
+    def test_stops(self):
+        lured = {"type": "pokestop", "message": {
+            "pokestop_id": "s", "lure_expiration": self.expire}}
+        relured = {"type": "pokestop", "message": {
+            "pokestop_id": "s", "lure_expiration": self.expire + 1800}}
+        unlured = {"type": "pokestop", "message": {
+            "pokestop_id": "s", "lure_expiration": None}}
+        self.assertFalse(self.check(lured))
+        self.assertTrue(self.check(lured))
+        self.assertFalse(self.check(relured))
+        self.assertFalse(self.check(unlured))
+        self.assertFalse(self.check(unlured))
+
+    def test_never_dropped(self):
+        gym = {"type": "gym", "message": {"gym_id": "g", "team_id": 1}}
+        for frame in [gym, gym, {"type": "weather"}, "garbage", {}]:
+            self.assertFalse(self.check(frame))
+
+    def test_only_marked_frames(self):
+        # A frame that could not be turned into an Event is not marked
+        self.assertFalse(self.seen.is_duplicate(self.mon('a')))
+        self.assertFalse(self.seen.is_duplicate(self.mon('a')))
+        self.seen.mark_seen(self.mon('a'))
+        self.assertTrue(self.seen.is_duplicate(self.mon('a')))
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" Micro-benchmarks for the hot paths of PokeAlarm.
+
+Usage: python tools/benchmark.py <benchmark> [options]
+
+Benchmarks that consume webhooks accept a recorded corpus with `--corpus`.
+A corpus is a text file with one raw webhook POST body per line. When no
+corpus is given, a synthetic one with a realistic spawn mix is generated.
+Likewise, the geofence benchmark accepts a real geofence file with
+`--geofences` and otherwise generates a city of neighborhoods.
+"""
+# Standard Library Imports
+import argparse
+from collections import OrderedDict
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+# 3rd Party Imports
+# Local Imports
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import PokeAlarm.Events as Events
+import PokeAlarm.Filters as Filters
+from PokeAlarm.Geofence import Geofence, GeofenceIndex, load_geofence_file
+from PokeAlarm.Utilities import JsonUtils
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ CORPUS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def generate_frame(rand, now):
+    """ Returns a random webhook frame, weighted like a real scanner. """
+    lat = 37.7876146 + rand.uniform(-0.05, 0.05)
+    lng = -122.390624 + rand.uniform(-0.05, 0.05)
+    roll = rand.random()
+    if roll < 0.90:
+        encountered = rand.random() < 0.4
+        message = {
+            "encounter_id": str(rand.getrandbits(64)),
+            "spawnpoint_id": "{:x}".format(rand.getrandbits(40)),
+            "pokemon_id": rand.randint(1, 386),
+            "latitude": lat,
+            "longitude": lng,
+            "disappear_time": now + rand.randint(60, 1800),
+            "verified": rand.random() < 0.5,
+            "weather": rand.randint(0, 7),
+            "form": None,
+            "costume": None,
+            "pokemon_level": None,
+            "cp": None,
+            "individual_attack": None,
+            "individual_defense": None,
+            "individual_stamina": None,
+            "move_1": None,
+            "move_2": None,
+            "height": None,
+            "weight": None,
+            "gender": rand.randint(1, 3)
+        }
+        if encountered:
+            message.update({
+                "pokemon_level": rand.randint(1, 35),
+                "cp": rand.randint(10, 3000),
+                "individual_attack": rand.randint(0, 15),
+                "individual_defense": rand.randint(0, 15),
+                "individual_stamina": rand.randint(0, 15),
+                "move_1": rand.randint(200, 280),
+                "move_2": rand.randint(13, 140),
+                "height": rand.uniform(0.2, 2.0),
+                "weight": rand.uniform(1.0, 100.0)
+            })
+        return {"type": "pokemon", "message": message}
+    gym = {
+        "gym_id": "{:x}".format(rand.getrandbits(64)),
+        "latitude": lat,
+        "longitude": lng,
+        "team_id": rand.randint(0, 3),
+        "level": rand.randint(1, 5),
+        "start": now + rand.randint(-2700, 3600),
+        "end": now + rand.randint(3600, 6300),
+        "name": "Gym {}".format(rand.randint(1, 500))
+    }
+    if roll < 0.94:
+        gym.update({"pokemon_id": rand.choice([150, 249, 250, 382, 383]),
+                    "cp": rand.randint(20000, 50000),
+                    "move_1": rand.randint(200, 280),
+                    "move_2": rand.randint(13, 140)})
+        return {"type": "raid", "message": gym}
+    if roll < 0.98:
+        gym["pokemon_id"] = None
+        return {"type": "raid", "message": gym}
+    return {"type": "pokestop", "message": {
+        "pokestop_id": "{:x}".format(rand.getrandbits(64)),
+        "latitude": lat,
+        "longitude": lng,
+        "lure_expiration": now + rand.randint(60, 1800)
+    }}
+
+
+def generate_corpus(posts, frames_per_post, seed=0):
+    """ Returns a list of raw POST bodies filled with random frames. """
+    rand = random.Random(seed)
+    now = int(time.time())
+    return [json.dumps([generate_frame(rand, now)
+                        for _ in range(frames_per_post)])
+            for _ in range(posts)]
+
+
+def load_corpus(args):
+    """ Returns the raw POST bodies requested by the command line. """
+    if args.corpus is None:
+        return generate_corpus(args.posts, args.frames, args.seed)
+    with open(args.corpus, 'r') as f:
+        return [line for line in f.read().splitlines() if line.strip()]
+
+
+def load_frames(args):
+    """ Returns every webhook frame contained in the corpus. """
+    frames = []
+    for body in load_corpus(args):
+        data = json.loads(body)
+        frames.extend([data] if isinstance(data, dict) else data)
+    return frames
+
+
+def generate_mon_filters(rand, count):
+    """ Returns an ordered dict of random monster filters. """
+    mgr = BenchManager()
+    filters = OrderedDict()
+    for i in range(count):
+        settings = {}
+        if rand.random() < 0.7:
+            settings['monsters'] = rand.sample(range(1, 387), 10)
+        for key, low, high in [('iv', 0, 100), ('cp', 10, 3000),
+                               ('lvl', 1, 35), ('atk', 0, 15)]:
+            if rand.random() < 0.3:
+                settings['min_' + key] = rand.randint(low, (low + high) / 2)
+        settings['max_dist'] = rand.choice([500, 1000, 2000, 5000])
+        name = "filter_{}".format(i)
+        filters[name] = Filters.MonFilter(mgr, name, settings)
+    return filters
+
+
+def generate_geofences(rand, count=324, vertices=1000):
+    """ Returns an ordered dict of neighborhoods around the corpus area,
+    as wobbly polygons with many vertices tiling a square grid. """
+    geofences = OrderedDict()
+    side = int(math.ceil(math.sqrt(count)))
+    size = 0.1 / side
+    for i in range(count):
+        lat = 37.7876146 - 0.05 + size * (i // side + 0.5)
+        lng = -122.390624 - 0.05 + size * (i % side + 0.5)
+        points, wobble = [], rand.randint(3, 9)
+        for k in range(vertices):
+            angle = 2 * math.pi * k / vertices
+            dist = size * (0.6 + 0.1 * math.sin(angle * wobble)
+                           + rand.uniform(-0.002, 0.002))
+            points.append([lat + dist * math.cos(angle),
+                           lng + dist * math.sin(angle)])
+        name = "neighborhood_{}".format(i)
+        geofences[name] = Geofence(name, points)
+    return geofences
+
+
+def load_geofences(args, raster_size=0):
+    """ Returns the geofences requested by the command line. """
+    if args.geofences is not None:
+        geofences = load_geofence_file(args.geofences)
+    else:
+        geofences = generate_geofences(random.Random(args.seed))
+    if raster_size > 0:
+        for gf in geofences.itervalues():
+            gf.rasterize(raster_size)
+    return geofences
+
+
+class BenchManager(object):
+    """ Stands in for a Manager when creating filters. """
+    def get_child_logger(self, name):
+        logger = logging.getLogger('benchmark').getChild(name)
+        logger.setLevel(logging.WARNING)
+        return logger
+
+
+def timed(func, rounds):
+    """ Returns the best time, in seconds, of `rounds` calls to `func`. """
+    best = None
+    for _ in range(rounds):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ BENCHMARKS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def bench_decoders(args):
+    """ Compare the installed JSON decoders on the webhook corpus. """
+    corpus = load_corpus(args)
+    size_mb = sum(len(body) for body in corpus) / float(10 ** 6)
+    print("Decoding {} POST bodies ({:.2f} MB)".format(len(corpus), size_mb))
+    for name, loads in JsonUtils.available_decoders().iteritems():
+        best = timed(lambda: [loads(body) for body in corpus], args.rounds)
+        print("  {:<12} {:>9.2f}ms {:>9.2f} MB/s".format(
+            name, best * 1000, size_mb / best))
+
+
+def lazy_attributes(cls):
+    """ Returns the names of the lazy attributes of an event class. """
+    return [name for name in dir(cls)
+            if isinstance(getattr(cls, name), Events.lazy_attribute)]
+
+
+def bench_events(args):
+    """ Measure the cost of creating events from webhook frames. """
+    frames = load_frames(args)
+    kinds = {}
+    for frame in frames:
+        cls = type(Events.event_factory(frame))
+        kinds.setdefault(cls, []).append(frame)
+    print("Creating events from {} frames, lazy attributes left alone and "
+          "all computed".format(len(frames)))
+    for cls, group in sorted(kinds.items(), key=lambda kv: -len(kv[1])):
+        names = lazy_attributes(cls)
+
+        def create():
+            return [Events.event_factory(f) for f in group]
+
+        def create_all():
+            for event in create():
+                for name in names:
+                    getattr(event, name)
+
+        lazy = timed(create, args.rounds)
+        eager = timed(create_all, args.rounds)
+        print("  {:<14} {:>6} frames {:>9.2f}us {:>9.2f}us".format(
+            cls.__name__, len(group), lazy * 10 ** 6 / len(group),
+            eager * 10 ** 6 / len(group)))
+
+
+def bench_batch(args):
+    """ Compare monster filtering one by one against the NumPy batch
+    pre-check followed by check_event on the remaining filters. """
+    if not Filters.BatchFilter.is_available():
+        print("NumPy is not installed.")
+        return
+    rand = random.Random(args.seed)
+    mons = [Events.event_factory(f) for f in load_frames(args)
+            if f['type'] == 'pokemon']
+    for mon in mons:
+        mon.distance = rand.uniform(0, 6000)
+    filters = generate_mon_filters(rand, args.filter_count)
+    batch = Filters.BatchFilter(filters)
+
+    def one_by_one():
+        return sum(f.check_event(mon)
+                   for mon in mons for f in filters.itervalues())
+
+    def batched():
+        return sum(filters[name].check_event(mon)
+                   for mon, allowed in zip(mons, batch.check(mons))
+                   for name in allowed)
+
+    assert one_by_one() == batched()
+    print("Checking {} monsters against {} filters".format(
+        len(mons), len(filters)))
+    for name, func in [('one by one', one_by_one), ('batched', batched)]:
+        best = timed(func, args.rounds)
+        print("  {:<12} {:>9.2f}ms {:>9.0f} monsters/s".format(
+            name, best * 1000, len(mons) / best))
+
+
+def bench_geofences(args):
+    """ Compare finding the first geofence around each event with plain
+    raycasts, the grid index, and the grid index on rasterized geofences
+    of several resolutions. """
+    points = [(f['message']['latitude'], f['message']['longitude'])
+              for f in load_frames(args)]
+
+    def first_match(geofences, index):
+        def run():
+            found = []
+            for lat, lng in points:
+                names = geofences.iterkeys() if index is None \
+                    else index.get_candidates(lat, lng)
+                found.append(next((name for name in names
+                                   if geofences[name].contains(lat, lng)),
+                                  None))
+            return found
+        return run
+
+    geofences = load_geofences(args)
+    expected = first_match(geofences, None)()
+    print("Finding the geofence of {} points in {} geofences ({} matched)"
+          .format(len(points), len(geofences),
+                  len(points) - expected.count(None)))
+    print("  {:<14} {:>9} {:>9} {:>11}".format(
+        '', 'build', 'memory', 'lookups/s'))
+    variants = [('raycast', None, 0), ('grid', True, 0)] + [
+        ('grid + {}m'.format(size), True, size) for size in args.raster]
+    for name, indexed, size in variants:
+        start = time.time()
+        geofences = load_geofences(args, size)
+        index = GeofenceIndex(geofences) if indexed else None
+        build = time.time() - start
+        cells = sum(sum(gf.get_raster_stats())
+                    for gf in geofences.itervalues())
+        run = first_match(geofences, index)
+        assert run() == expected
+        best = timed(run, args.rounds)
+        print("  {:<14} {:>8.2f}s {:>7.1f}MB {:>11.0f}".format(
+            name, build, cells / float(10 ** 6), len(points) / best))
+
+
+BENCHMARKS = {
+    'batch': bench_batch,
+    'decoders': bench_decoders,
+    'events': bench_events,
+    'geofences': bench_geofences,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('-c', '--corpus', default=None,
+                        help='File with one recorded POST body per line.')
+    parser.add_argument('-p', '--posts', type=int, default=20,
+                        help='Synthetic corpus: number of POST bodies.')
+    parser.add_argument('-f', '--frames', type=int, default=1000,
+                        help='Synthetic corpus: frames per POST body.')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='Synthetic corpus: random seed.')
+    parser.add_argument('-r', '--rounds', type=int, default=5,
+                        help='Number of rounds, the best one is reported.')
+    parser.add_argument('-n', '--filter-count', type=int, default=400,
+                        help='Number of random filters to check against.')
+    parser.add_argument('-g', '--geofences', default=None,
+                        help='Geofence file to look points up in.')
+    parser.add_argument('--raster', type=float, nargs='*',
+                        default=[100, 25, 10],
+                        help='Geofence cell sizes to compare, in meters.')
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()